@@ -130,6 +130,27 @@ def tests(session: nox.Session) -> None:
     session.log("✅ Tests completed.\n")
 
 
+@nox.session(python=DEFAULT_PYTHON_VERSION)
+def benchmark(session: nox.Session) -> None:
+    """
+    ⏱️ Run the end-to-end benchmark suite.
+
+    Runs the pipeline against local stand-in Credly and GitHub servers with synthetic
+    profiles (1 to 1,000 badges) and READMEs (1 KB to 10 MB), then prints the latency,
+    profiles per second, peak memory and API calls of each benchmark.
+    Set BENCHMARK_REPORT to also write the results as JSON.
+
+    Examples:
+        nox -s benchmark
+        BENCHMARK_REPORT=benchmark.json nox -s benchmark
+        nox -s benchmark -- -k batch
+    """
+    session.log("⏱️ Running benchmarks...\n")
+    session.install("-e", ".", *TESTS_DEPS)
+    session.run("pytest", "tests/benchmarks", "-m", "benchmark", "--no-cov", *session.posargs, external=True)
+    session.log("✅ Benchmarks completed.\n")
+
+
 @nox.session
 def lint(session: nox.Session) -> None:
     """
@@ -1,6 +1,9 @@
 """Adapter Package"""
 
+from readme_credly_badges.adapter.base import ReadmeRepository
 from readme_credly_badges.adapter.credly import Credly
 from readme_credly_badges.adapter.github_repo import GithubRepo
+from readme_credly_badges.adapter.graphql_repo import GraphQLClient, GraphQLRepo
+from readme_credly_badges.adapter.local_repo import LocalRepo
 
-__all__ = ["Credly", "GithubRepo"]
+__all__ = ["Credly", "GithubRepo", "GraphQLClient", "GraphQLRepo", "LocalRepo", "ReadmeRepository"]
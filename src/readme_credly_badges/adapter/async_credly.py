@@ -0,0 +1,66 @@
+"Asynchronous Credly Module"
+
+import asyncio
+import logging
+from typing import Any
+
+import httpx
+
+from readme_credly_badges.adapter.credly import PAGE_CONCURRENCY, parse_badges, total_pages
+from readme_credly_badges.models import Badge
+from readme_credly_badges.settings import BADGE_SORT_BY, CREDLY_API_URL
+from readme_credly_badges.utils import sort_badges
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCredly:
+    """Asyncio variant of ``Credly`` that fetches badges through a shared ``httpx.AsyncClient``."""
+
+    def __init__(
+        self,
+        username: str,
+        client: httpx.AsyncClient,
+        timeout: int = 60,
+        api_url: str = CREDLY_API_URL,
+    ) -> None:
+        self.username = username
+        self.client = client
+        self.timeout = timeout
+        self.url = f"{api_url.rstrip('/')}/users/{self.username}/badges.json"
+
+    async def fetch_badges(self) -> list[Badge]:
+        """Fetch badges for the user from the Credly .json endpoint, ensuring all required fields are present."""
+        logger.info(f"Fetching badges for {self.username} from {self.url}")
+        payload = await self._fetch_page(1)
+        records: list[dict[str, Any]] = payload.get("data", [])
+
+        pages = total_pages(payload.get("metadata"))
+        if pages > 1:
+            logger.info(f"Fetching {pages - 1} more pages of badges for {self.username}.")
+            # At most as many pages in flight as the synchronous adapter fetches at once
+            semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+            async def fetch(page: int) -> dict[str, Any]:
+                async with semaphore:
+                    return await self._fetch_page(page)
+
+            remaining = await asyncio.gather(*(fetch(page) for page in range(2, pages + 1)))
+            records += [record for page_payload in remaining for record in page_payload.get("data", [])]
+
+        return sort_badges(parse_badges(records), BADGE_SORT_BY)
+
+    async def _fetch_page(self, page: int) -> dict[str, Any]:
+        """Fetch and decode one page of the badge list."""
+        try:
+            params = {"page": page} if page > 1 else None
+            response = await self.client.get(self.url, params=params, timeout=self.timeout)
+            logger.info(f"HTTP response status code: {response.status_code}")
+            response.raise_for_status()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch badges for {self.username}: {e}")
+            raise ConnectionError(f"Failed to fetch badges for {self.username}") from e
+
+        payload: dict[str, Any] = response.json()
+        return payload
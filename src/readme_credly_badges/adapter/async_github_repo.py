@@ -0,0 +1,171 @@
+"Asynchronous GitHub management module"
+
+import base64
+import logging
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+
+from readme_credly_badges.adapter.base import WriteConflictError, blob_sha, commit_message
+from readme_credly_badges.adapter.github_repo import SHA_CONFLICT_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGithubRepo:
+    """Asyncio variant of ``GithubRepo`` talking to the REST API through a shared ``httpx.AsyncClient``."""
+
+    def __init__(
+        self,
+        commit_message: str,
+        *,
+        gh_api_url: str,
+        gh_token: str,
+        repository: str,
+        branch: str,
+        readme_filename: str,
+        client: httpx.AsyncClient,
+    ):
+        """
+        Initialize the GitHub repository object.
+        Credentials are sent per request, so the client can safely be shared with other hosts.
+        """
+        self.commit_message = commit_message
+        self.repository = repository
+        self.branch = branch
+        self.readme_filename = readme_filename
+        self.client = client
+        self.url = f"{gh_api_url.rstrip('/')}/repos/{repository}"
+        self.headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {gh_token}",
+        }
+        self.shas: dict[str, str] = {}
+        self.missing: set[str] = set()
+
+    def _raise_for_status(self, response: httpx.Response, path: str) -> None:
+        """Translate GitHub error responses into the exceptions raised by ``GithubRepo``."""
+        if response.status_code == httpx.codes.NOT_FOUND:
+            logger.error(f"Failed to find {path} in repository {self.repository}: {response.text}")
+            raise FileNotFoundError(f"{path} not found in the repository.")
+        if response.is_error:
+            logger.error(f"Failed to access repository {self.repository}: {response.status_code} {response.text}")
+            raise RuntimeError(f"GitHub request failed with status {response.status_code}.")
+
+    async def _git(self, method: str, endpoint: str, path: str, **kwargs: Any) -> Any:
+        """Call a git data API endpoint of the repository and decode its JSON response."""
+        response = await self.client.request(method, f"{self.url}/git/{endpoint}", headers=self.headers, **kwargs)
+        self._raise_for_status(response, path)
+        return response.json()
+
+    async def _get_file(self, path: str) -> dict[str, Any]:
+        """Fetch a file's metadata and content, remembering its blob SHA for the next write."""
+        response = await self.client.get(
+            f"{self.url}/contents/{quote(path)}", params={"ref": self.branch}, headers=self.headers
+        )
+        self._raise_for_status(response, path)
+
+        file_content = response.json()
+        if isinstance(file_content, list):
+            raise ValueError(f"{path} is a directory, expected a file.")
+
+        self.shas[path] = file_content["sha"]
+        return file_content  # type: ignore[no-any-return]
+
+    async def get_file(self, path: str) -> str:
+        """Fetch the content of a file of the repository."""
+        logger.info(f"Fetching {path} from branch {self.branch} of repository {self.repository}")
+        try:
+            file_content = await self._get_file(path)
+        except FileNotFoundError:
+            self.missing.add(path)
+            raise
+        return base64.b64decode(file_content["content"]).decode("utf-8")
+
+    async def _save_file(self, path: str, new_content: str, message: str) -> None:
+        """
+        Update one file through the contents API, or create it if the last read found it missing.
+        If GitHub reports that the file changed since it was read, ``WriteConflictError`` is raised rather than
+        overwriting the other change.
+        """
+        payload = {
+            "message": message,
+            "content": base64.b64encode(new_content.encode("utf-8")).decode("ascii"),
+            "branch": self.branch,
+        }
+        if path not in self.missing:
+            payload["sha"] = self.shas.get(path) or (await self._get_file(path))["sha"]
+        response = await self.client.put(f"{self.url}/contents/{quote(path)}", json=payload, headers=self.headers)
+        if response.status_code in SHA_CONFLICT_STATUSES:
+            self.shas.pop(path, None)
+            self.missing.discard(path)
+            raise WriteConflictError(f"{path} changed in repository {self.repository} since it was read.")
+        self._raise_for_status(response, path)
+
+        self.shas[path] = response.json()["content"]["sha"]
+        self.missing.discard(path)
+
+    async def _check_unchanged(self, tree_sha: str, paths: list[str]) -> None:
+        """
+        Raise ``WriteConflictError`` if a file read before differs in the tree of the branch head the commit
+        is built on, so that a commit never reverts a change made since the read.
+        """
+        expected = {path: self.shas.get(path) for path in paths if path in self.shas or path in self.missing}
+        if not expected:
+            return
+        tree = await self._git("GET", f"trees/{tree_sha}", self.branch, params={"recursive": "1"})
+        current = {element["path"]: element["sha"] for element in tree["tree"] if element["type"] == "blob"}
+        changed = ", ".join(path for path, sha in expected.items() if current.get(path) != sha)
+        if changed:
+            raise WriteConflictError(f"{changed} changed in repository {self.repository} since they were read.")
+
+    async def _commit_files(self, files: dict[str, str], message: str) -> None:
+        """
+        Write several files in a single commit through the git data API.
+        The branch is only moved forward: if it moved while the commit was being built, ``WriteConflictError``
+        is raised so that the files are read and rendered again.
+        """
+        branch = quote(self.branch)
+        ref = await self._git("GET", f"ref/heads/{branch}", self.branch)
+        parent = await self._git("GET", f"commits/{ref['object']['sha']}", self.branch)
+        await self._check_unchanged(parent["tree"]["sha"], list(files))
+        elements = [
+            {"path": path, "mode": "100644", "type": "blob", "content": content} for path, content in files.items()
+        ]
+        tree = await self._git("POST", "trees", self.branch, json={"base_tree": parent["tree"]["sha"], "tree": elements})
+        commit = await self._git(
+            "POST", "commits", self.branch, json={"message": message, "tree": tree["sha"], "parents": [parent["sha"]]}
+        )
+        response = await self.client.patch(
+            f"{self.url}/git/refs/heads/{branch}", json={"sha": commit["sha"]}, headers=self.headers
+        )
+        if response.status_code in SHA_CONFLICT_STATUSES:
+            raise WriteConflictError(f"Branch {self.branch} of repository {self.repository} moved while committing.")
+        self._raise_for_status(response, self.branch)
+
+        self.shas.update({path: blob_sha(content) for path, content in files.items()})
+        self.missing.difference_update(files)
+
+    async def save_files(self, files: dict[str, str], message_body: str = "") -> None:
+        """
+        Write files to the branch in a single commit, with ``message_body`` under the commit message.
+        A single file goes through the contents API, several files through the git data API.
+        """
+        paths = ", ".join(files)
+        logger.info(f"Updating {paths} in branch {self.branch} of repository {self.repository}")
+        message = commit_message(self.commit_message, message_body)
+        if len(files) == 1:
+            [(path, content)] = files.items()
+            await self._save_file(path, content, message)
+        else:
+            await self._commit_files(files, message)
+        logger.info(f"{paths} updated successfully in repository {self.repository}.")
+
+    async def get_readme(self) -> str:
+        """Fetch the specified README file's content."""
+        return await self.get_file(self.readme_filename)
+
+    async def save_readme(self, new_content: str) -> None:
+        """Update the specified README file with new content."""
+        await self.save_files({self.readme_filename: new_content})
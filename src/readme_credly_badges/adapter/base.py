@@ -0,0 +1,55 @@
+"Common interface of the README storage backends"
+
+import hashlib
+from collections.abc import Sequence
+from typing import Protocol, Union
+
+# Markdown and generated files are text, committed badge images are bytes
+FileContent = Union[str, bytes]
+
+
+def blob_sha(content: FileContent) -> str:
+    """Git blob SHA of a file, as git and GitHub compute it; text is encoded as UTF-8."""
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()  # noqa: S324
+
+
+class WriteConflictError(RuntimeError):
+    """Files changed on the branch since they were read; their new content has to be rendered again from the latest."""
+
+
+def commit_message(subject: str, body: str = "") -> str:
+    """A commit message made of a subject line and an optional body."""
+    return f"{subject}\n\n{body}" if body else subject
+
+
+class ReadmeRepository(Protocol):
+    """Markdown files that can be read and rewritten together, wherever they are stored."""
+
+    readme_filename: str
+
+    @property
+    def target(self) -> str:
+        """Identifier of the README file this object reads and writes."""
+
+    def target_for(self, path: str) -> str:
+        """Identifier of a file of the repository."""
+
+    def get_file(self, path: str) -> str:
+        """Fetch a file's content."""
+
+    def file_shas(self, directory: str) -> dict[str, str]:
+        """Git blob SHA of each file directly in a directory, by path; empty if the directory does not exist."""
+
+    def save_files(self, files: dict[str, FileContent], message_body: str = "", deletions: Sequence[str] = ()) -> None:
+        """
+        Replace the content of several files and delete the files in ``deletions`` in a single commit, with
+        ``message_body`` under its message.
+        Raises ``WriteConflictError`` instead of overwriting files that changed since they were read.
+        """
+
+    def get_readme(self) -> str:
+        """Fetch the README file's content."""
+
+    def save_readme(self, new_content: str) -> None:
+        """Replace the README file's content."""
@@ -1,28 +1,107 @@
 "Credly Module"
 
 import logging
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
 
 import requests
 
-from readme_credly_badges.settings import BADGE_SORT_BY
-from readme_credly_badges.utils import sort_by_field
+from readme_credly_badges.cache import CacheEntry, HttpCache
+from readme_credly_badges.http_session import create_session
+from readme_credly_badges.metrics import metrics
+from readme_credly_badges.models import Badge
+from readme_credly_badges.settings import BADGE_SORT_BY, CREDLY_API_URL, CREDLY_OFFLINE, CREDLY_STREAM
+from readme_credly_badges.streaming import BadgeStream
+from readme_credly_badges.utils import sort_badges
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 64 * 1024
+# Upper bound on the pages of one profile fetched at the same time
+PAGE_CONCURRENCY = 8
+
+
+def total_pages(metadata: Any) -> int:
+    """Number of pages announced by the ``metadata`` of a Credly response (1 if absent or invalid)."""
+    pages = metadata.get("total_pages") if isinstance(metadata, dict) else None
+    return pages if isinstance(pages, int) and pages > 1 else 1
+
+
+def _count_chunk(chunk: bytes) -> bytes:
+    """Pass a chunk of a response body through, counting its bytes."""
+    metrics.increment("credly_http_bytes", len(chunk))
+    return chunk
+
+
+def parse_badges(data: list[dict[str, Any]]) -> list[Badge]:
+    """Build a badge from each record, skipping incomplete ones and repeated badge IDs."""
+    badges = []
+    seen = set()
+    for record in data:
+        badge = Badge.from_record(record)
+        if badge is None:
+            continue
+        if badge.id in seen:
+            logger.warning(f"Skipping duplicate badge: id={badge.id}")
+            continue
+
+        logger.info(f"Found badge: id={badge.id}, name={badge.name}, image_url={badge.image_url}")
+        seen.add(badge.id)
+        badges.append(badge)
+
+    return badges
+
 
 class Credly:
     """Class to handle Credly badge extraction for a user profile."""
 
-    def __init__(self, username: str, timeout: int = 60) -> None:
+    def __init__(
+        self,
+        username: str,
+        timeout: int = 60,
+        api_url: str = CREDLY_API_URL,
+        cache: Optional[HttpCache] = None,
+        *,
+        stream: bool = CREDLY_STREAM,
+        session: Optional[requests.Session] = None,
+        offline: bool = CREDLY_OFFLINE,
+    ) -> None:
+        """
+        Initialize the Credly client.
+        A ``session`` from ``create_session`` can be passed to share its connection pool between profiles.
+        In ``offline`` mode badges are only read from the cache, whatever their age or order.
+        """
         self.username = username
         self.timeout = timeout
-        self.url = f"https://www.credly.com/users/{self.username}/badges.json"
+        self.stream = stream
+        self.session = session if session is not None else create_session()
+        self.url = f"{api_url.rstrip('/')}/users/{self.username}/badges.json"
+        self.cache = cache
+        self.offline = offline
+
+    def fetch_badges(self) -> list[Badge]:
+        """
+        Fetch badges for the user from the Credly .json endpoint, ensuring all required fields are present.
+        With a cache, unchanged profiles are answered from disk.
+        """
+        with metrics.span("credly_fetch", username=self.username):
+            return self._fetch_badges()
+
+    def _fetch_badges(self) -> list[Badge]:
+        if self.offline:
+            return self._fetch_offline()
+
+        entry = self.cache.get(self.url, BADGE_SORT_BY) if self.cache else None
+        if self.cache and entry and entry.is_fresh(self.cache.ttl):
+            logger.info(f"Using cached badges for {self.username} (fresh for {self.cache.ttl}s).")
+            return self._cache_hit(self.cache, entry, refresh=False)
 
-    def fetch_badges(self) -> list[dict[str, str]]:
-        """Fetch badges for the user from the Credly .json endpoint, ensuring all required fields are present."""
         try:
             logger.info(f"Fetching badges for {self.username} from {self.url}")
-            response = requests.get(self.url, timeout=self.timeout)
+            headers = entry.conditional_headers() if entry else {}
+            response = self.session.get(self.url, timeout=self.timeout, headers=headers, stream=self.stream)
             logger.info(f"HTTP response status code: {response.status_code}")
             response.raise_for_status()
 
@@ -30,27 +109,88 @@ class Credly:
             logger.error(f"Failed to fetch badges for {self.username}: {e}")
             raise ConnectionError(f"Failed to fetch badges for {self.username}") from e
 
-        badges = []
-        data = sort_by_field(response.json().get("data", []), BADGE_SORT_BY)
-
-        for badge in data:
-            badge_id = badge.get("id")
-            badge_template = badge.get("badge_template", {})
-            name = badge_template.get("name")
-            image_url = badge_template.get("image_url")
-
-            # Ensure none of the fields are empty or missing
-            if not (badge_id and name and image_url):
-                logger.warning(f"Skipping incomplete badge: id={badge_id}, name={name}, image_url={image_url}")
-                continue
-
-            logger.info(f"Found badge: id={badge_id}, name={name}, image_url={image_url}")
-            badges.append(
-                {
-                    "name": name.strip(),
-                    "url": f"https://www.credly.com/badges/{badge_id.strip()}",
-                    "image_url": image_url.strip(),
-                }
+        if self.cache and entry and response.status_code == requests.codes.not_modified:
+            logger.info(f"Badges for {self.username} not modified since the last fetch.")
+            return self._cache_hit(self.cache, entry, refresh=True)
+
+        try:
+            records, metadata = self._read_records(response)
+        finally:
+            response.close()
+
+        pages = total_pages(metadata)
+        if pages > 1:
+            records += self._fetch_pages(range(2, pages + 1))
+        badges = parse_badges(records)
+        with metrics.span("sort"):
+            badges = sort_badges(badges, BADGE_SORT_BY)
+
+        if self.cache:
+            self.cache.record(hit=False)
+            self.cache.put(
+                CacheEntry(
+                    url=self.url,
+                    sort_by=BADGE_SORT_BY,
+                    badges=badges,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    stored_at=time.time(),
+                )
             )
 
         return badges
+
+    def _fetch_offline(self) -> list[Badge]:
+        """Serve badges from the cache without any request, sorted as currently configured."""
+        entry = self.cache.get(self.url, None) if self.cache else None
+        if not (self.cache and entry):
+            logger.error(f"No cached badges for {self.username} in offline mode.")
+            raise ConnectionError(f"No cached badges for {self.username} in offline mode.")
+
+        logger.info(f"Using cached badges for {self.username} (offline).")
+        self.cache.record(hit=True)
+        return sort_badges(entry.badges, BADGE_SORT_BY)
+
+    def _read_records(self, response: requests.Response) -> tuple[list[dict[str, Any]], Any]:
+        """
+        Badge records and pagination metadata of a response, decoded incrementally in streaming mode.
+        In streaming mode the body is downloaded while it is parsed, so the download is timed as parsing too.
+        """
+        with metrics.span("json_parse"):
+            if self.stream:
+                stream = BadgeStream(map(_count_chunk, response.iter_content(chunk_size=STREAM_CHUNK_SIZE)))
+                records = list(stream)
+                return records, stream.fields.get("metadata")
+            metrics.increment("credly_http_bytes", len(response.content))
+            payload = response.json()
+            return payload.get("data", []), payload.get("metadata")
+
+    def _fetch_page(self, page: int) -> list[dict[str, Any]]:
+        """Fetch the badge records of one page after the first."""
+        response = self.session.get(self.url, params={"page": page}, timeout=self.timeout, stream=self.stream)
+        try:
+            response.raise_for_status()
+            return self._read_records(response)[0]
+        finally:
+            response.close()
+
+    def _fetch_pages(self, pages: Sequence[int]) -> list[dict[str, Any]]:
+        """Fetch the remaining pages concurrently over the pooled session, returning their records in page order."""
+        workers = min(len(pages), PAGE_CONCURRENCY)
+        logger.info(f"Fetching {len(pages)} more pages of badges for {self.username} with {workers} workers.")
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._fetch_page, pages))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch badges for {self.username}: {e}")
+            raise ConnectionError(f"Failed to fetch badges for {self.username}") from e
+
+        return [record for records in results for record in records]
+
+    def _cache_hit(self, cache: HttpCache, entry: CacheEntry, refresh: bool) -> list[Badge]:
+        """Serve badges from a cache entry, optionally restarting its freshness period."""
+        cache.record(hit=True)
+        if refresh:
+            entry.stored_at = time.time()
+            cache.put(entry)
+        return entry.badges
@@ -2,11 +2,49 @@
 
 import base64
 import logging
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Optional, Union
+from urllib.parse import quote
 
-from github import Github, GithubException, UnknownObjectException
+# PyGithub is imported on first use, so runs that never reach GitHub do not pay for importing it
+if TYPE_CHECKING:
+    from github import Github, InputGitTreeElement
+    from github.ContentFile import ContentFile
+    from github.GitCommit import GitCommit
+    from github.GitRef import GitRef
+    from github.Repository import Repository
+
+    from readme_credly_badges.rate_limit import RateLimitScheduler
+
+from readme_credly_badges.adapter.base import FileContent, WriteConflictError, blob_sha, commit_message
+from readme_credly_badges.cache import ReadmeCache, ReadmeEntry
+from readme_credly_badges.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# Statuses GitHub answers with when a write is based on an outdated blob SHA or branch head
+SHA_CONFLICT_STATUSES = (409, 422)
+
+
+def count_requests(gh: "Github") -> "Github":
+    """
+    Count the REST requests of a PyGithub client and the bytes of their responses in the process metrics,
+    as ``github_http_requests`` and ``github_http_bytes``.
+    PyGithub's requester calls its ``DEBUG_ON_RESPONSE`` hook once for each response, whatever the request.
+    """
+    requester = gh.requester
+    on_response = requester.DEBUG_ON_RESPONSE
+
+    def count(status: int, headers: dict[str, Union[str, int]], data: str) -> None:
+        metrics.increment("github_http_requests")
+        length = headers.get("content-length")
+        metrics.increment("github_http_bytes", int(length) if length else len(data))
+        on_response(status, headers, data)
+
+    requester.DEBUG_ON_RESPONSE = count  # type: ignore[method-assign, assignment]
+    return gh
+
 
 class GithubRepo:
     def __init__(
@@ -17,59 +55,271 @@ class GithubRepo:
         repository: str,
         branch: str,
         readme_filename: str,
+        *,
+        gh: Optional["Github"] = None,
+        scheduler: Optional["RateLimitScheduler"] = None,
+        readme_cache: Optional[ReadmeCache] = None,
     ):
-        """Initialize the GitHub repository object."""
+        """
+        Initialize the GitHub repository object.
+        An existing ``Github`` client can be passed as ``gh`` to share its connection pool between repositories,
+        together with the ``scheduler`` pacing the writes of all repositories using it.
+        With a ``readme_cache``, files are read with conditional requests and served from it when unchanged.
+        The client and the repository are only created and looked up on first use, so creating this object
+        neither imports PyGithub nor makes an API call.
+        """
         self.commit_message = commit_message
         self.repository = repository
         self.branch = branch
         self.readme_filename = readme_filename
+        self.gh_api_url = gh_api_url
+        self.gh_token = gh_token
+        self.scheduler = scheduler
+        self.readme_cache = readme_cache
+        self._gh = gh
+        self._repo: Optional[Repository] = None
+        self.shas: dict[str, str] = {}
+        self.etags: dict[str, Optional[str]] = {}
+        self.missing: set[str] = set()
 
-        try:
-            logger.info(f"Connecting to GitHub repository {repository} on branch {branch} using API URL {gh_api_url}")
-            gh = Github(
-                base_url=gh_api_url,
-                login_or_token=gh_token,
+    @property
+    def gh(self) -> "Github":
+        """The PyGithub client, created on first access unless one was given."""
+        if self._gh is None:
+            from github import Github  # noqa: PLC0415
+
+            self._gh = count_requests(
+                Github(
+                    base_url=self.gh_api_url,
+                    login_or_token=self.gh_token,
+                )
             )
-            logger.info("Authentication successful.")
+        return self._gh
+
+    @property
+    def repo(self) -> "Repository":
+        """The PyGithub repository, fetched on first access."""
+        if self._repo is None:
+            from github import GithubException  # noqa: PLC0415
+
+            try:
+                logger.info(
+                    f"Connecting to GitHub repository {self.repository} on branch {self.branch} "
+                    f"using API URL {self.gh_api_url}"
+                )
+                self._repo = self.gh.get_repo(self.repository)
+                logger.info(f"Repository {self.repository} accessed successfully.")
+            except GithubException as e:
+                logger.error(f"Failed to access repository {self.repository}: {e}")
+                raise RuntimeError("Authentication failed.") from e
+        return self._repo
+
+    @property
+    def target(self) -> str:
+        """Identifier of the README file this object reads and writes."""
+        return self.target_for(self.readme_filename)
 
-            self.repo = gh.get_repo(repository)
-            logger.info(f"Repository {repository} accessed successfully.")
+    def target_for(self, path: str) -> str:
+        """Identifier of a file of the repository."""
+        return f"{self.repository}@{self.branch}:{path}"
+
+    def _fetch_file(self, path: str) -> "ContentFile":
+        """Fetch a file, remembering its blob SHA and ETag for the next write."""
+        file_content = self.repo.get_contents(path, ref=self.branch)
+
+        if isinstance(file_content, list):
+            raise ValueError(f"{path} is a directory, expected a file.")
+
+        self.shas[path] = file_content.sha
+        self.etags[path] = file_content.etag
+        return file_content
+
+    def _read_cached(self, path: str, cache: ReadmeCache) -> str:
+        """
+        Fetch a file's text with a request conditional on the ETag of its cached copy.
+        If GitHub answers 304, which does not count against the primary rate limit, the cached text is reused
+        without downloading or decoding the file again; otherwise the new content is cached.
+        """
+        target = self.target_for(path)
+        entry = cache.get(target)
+        headers, data = self.gh.requester.requestJsonAndCheck(
+            "GET",
+            f"/repos/{self.repository}/contents/{quote(path)}",
+            parameters={"ref": self.branch},
+            headers={"If-None-Match": entry.etag} if entry else None,
+        )
+        if data is None:
+            # Only a 304 to the conditional request has no body; without a cached copy nothing can be served
+            if not entry:
+                raise RuntimeError(f"GitHub returned no content for {path} in repository {self.repository}.")
+            logger.info(f"{path} did not change since it was cached.")
+            cache.record(hit=True)
+            self.shas[path], self.etags[path] = entry.sha, entry.etag
+            return entry.content
+
+        if isinstance(data, list):
+            raise ValueError(f"{path} is a directory, expected a file.")
+        cache.record(hit=False)
+        content = base64.b64decode(data["content"]).decode("utf-8")
+        self.shas[path], self.etags[path] = data["sha"], headers.get("etag")
+        if headers.get("etag"):
+            cache.put(ReadmeEntry(target, headers["etag"], data["sha"], content, stored_at=time.time()))
+        return content
+
+    def _update_file(self, path: str, new_content: FileContent, sha: str, message: str) -> None:
+        """Write a file on top of the given blob SHA."""
+        result = self.repo.update_file(
+            path=path,
+            message=message,
+            content=new_content,
+            sha=sha,
+            branch=self.branch,
+        )
+        self.shas[path] = result["content"].sha
+
+    def _save_file(self, path: str, new_content: FileContent, message: str) -> None:
+        """
+        Update one file through the contents API, or create it if the last read found it missing.
+        The blob SHA from the last read is reused, so the file is only fetched if it was not read before.
+        If GitHub reports that the file changed in the meantime, ``WriteConflictError`` is raised rather than
+        overwriting the other change.
+        """
+        from github import GithubException  # noqa: PLC0415
+
+        try:
+            if path in self.missing:
+                logger.info(f"{path} does not exist yet; creating it.")
+                result = self.repo.create_file(path=path, message=message, content=new_content, branch=self.branch)
+                self.shas[path] = result["content"].sha
+                self.missing.discard(path)
+                return
+            sha = self.shas.get(path) or self._fetch_file(path).sha
+            self._update_file(path, new_content, sha, message)
         except GithubException as e:
-            logger.error(f"Failed to access repository {repository}: {e}")
-            raise RuntimeError("Authentication failed.") from e
+            if e.status not in SHA_CONFLICT_STATUSES:
+                raise
+            self.shas.pop(path, None)
+            self.missing.discard(path)
+            raise WriteConflictError(f"{path} changed in repository {self.repository} since it was read.") from e
 
-    def get_readme(self) -> str:
-        """Fetch the specified README file's content."""
+    def _check_unchanged(self, parent: "GitCommit", paths: list[str]) -> None:
+        """
+        Raise ``WriteConflictError`` if a file read before differs in the tree of ``parent``, the branch head
+        the commit is built on, so that a commit never reverts a change made since the read.
+        The whole tree is listed in one request, and only when one of the files was read.
+        """
+        expected = {path: self.shas.get(path) for path in paths if path in self.shas or path in self.missing}
+        if not expected:
+            return
+        tree = self.repo.get_git_tree(parent.tree.sha, recursive=True)
+        current = {element.path: element.sha for element in tree.tree if element.type == "blob"}
+        changed = ", ".join(path for path, sha in expected.items() if current.get(path) != sha)
+        if changed:
+            raise WriteConflictError(f"{changed} changed in repository {self.repository} since they were read.")
+
+    def _create_commit(
+        self, files: dict[str, FileContent], message: str, deletions: Sequence[str] = ()
+    ) -> tuple["GitRef", "GitCommit"]:
+        """
+        Create a commit changing the given files and deleting ``deletions`` on top of the branch head, if the files
+        did not change since read.
+        """
+        from github import InputGitTreeElement  # noqa: PLC0415
+
+        ref = self.repo.get_git_ref(f"heads/{self.branch}")
+        parent = self.repo.get_git_commit(ref.object.sha)
+        self._check_unchanged(parent, list(files))
+        elements = [self._tree_element(path, content) for path, content in files.items()]
+        # A tree entry without a blob SHA deletes the file
+        elements += [InputGitTreeElement(path, "100644", "blob", sha=None) for path in deletions]
+        tree = self.repo.create_git_tree(elements, base_tree=parent.tree)
+        return ref, self.repo.create_git_commit(message, tree, [parent])
+
+    def _tree_element(self, path: str, content: FileContent) -> "InputGitTreeElement":
+        """Tree element of a file: text is inlined in the tree, binary content is uploaded as a blob first."""
+        from github import InputGitTreeElement  # noqa: PLC0415
+
+        if isinstance(content, str):
+            return InputGitTreeElement(path, "100644", "blob", content=content)
+        blob = self.repo.create_git_blob(base64.b64encode(content).decode("ascii"), "base64")
+        return InputGitTreeElement(path, "100644", "blob", sha=blob.sha)
+
+    def _commit_files(self, files: dict[str, FileContent], message: str, deletions: Sequence[str] = ()) -> None:
+        """
+        Write several files and delete ``deletions`` in a single commit through the git data API.
+        The branch is only moved forward: if it moved while the commit was being built, ``WriteConflictError``
+        is raised so that the files are read and rendered again.
+        """
+        from github import GithubException  # noqa: PLC0415
+
+        ref, commit = self._create_commit(files, message, deletions)
         try:
-            logger.info(f"Fetching {self.readme_filename} from branch {self.branch} of repository {self.repository}")
-            file_content = self.repo.get_contents(self.readme_filename, ref=self.branch)
+            ref.edit(commit.sha)
+        except GithubException as e:
+            if e.status not in SHA_CONFLICT_STATUSES:
+                raise
+            raise WriteConflictError(
+                f"Branch {self.branch} of repository {self.repository} moved while committing."
+            ) from e
+
+        self.shas.update({path: blob_sha(content) for path, content in files.items()})
+        self.missing.difference_update(files)
+        for path in deletions:
+            self.shas.pop(path, None)
 
-            if isinstance(file_content, list):
-                raise ValueError(f"{self.readme_filename} is a directory, expected a file.")
+    def get_file(self, path: str) -> str:
+        """Fetch the content of a file of the repository."""
+        from github import UnknownObjectException  # noqa: PLC0415
 
-            return base64.b64decode(file_content.content).decode("utf-8")
+        try:
+            logger.info(f"Fetching {path} from branch {self.branch} of repository {self.repository}")
+            if self.readme_cache:
+                return self._read_cached(path, self.readme_cache)
+            return base64.b64decode(self._fetch_file(path).content).decode("utf-8")
 
         except UnknownObjectException as e:
-            logger.error(f"Failed to find {self.readme_filename} in repository {self.repository}: {e}")
-            raise FileNotFoundError(f"{self.readme_filename} not found in the repository.") from e
+            logger.error(f"Failed to find {path} in repository {self.repository}: {e}")
+            self.missing.add(path)
+            raise FileNotFoundError(f"{path} not found in the repository.") from e
+
+    def file_shas(self, directory: str) -> dict[str, str]:
+        """Git blob SHA of each file directly in a directory of the branch, listed in one request."""
+        from github import UnknownObjectException  # noqa: PLC0415
 
-    def save_readme(self, new_content: str) -> None:
-        """Update the specified README file with new content."""
         try:
-            logger.info(f"Updating {self.readme_filename} in branch {self.branch} of repository {self.repository}")
-            file_content = self.repo.get_contents(self.readme_filename, ref=self.branch)
-
-            # Defensive check in case a list is returned
-            if isinstance(file_content, list):
-                raise ValueError(f"{self.readme_filename} is a directory, expected a single file.")
-
-            self.repo.update_file(
-                path=self.readme_filename,
-                message=self.commit_message,
-                content=new_content,
-                sha=file_content.sha,
-            )
-            logger.info(f"{self.readme_filename} updated successfully in repository {self.repository}.")
+            contents = self.repo.get_contents(directory, ref=self.branch)
+        except UnknownObjectException:
+            return {}
+        if not isinstance(contents, list):
+            raise ValueError(f"{directory} is a file, expected a directory.")
+        return {content.path: content.sha for content in contents if content.type == "file"}
+
+    def save_files(self, files: dict[str, FileContent], message_body: str = "", deletions: Sequence[str] = ()) -> None:
+        """
+        Write files and delete ``deletions`` on the branch in a single commit, with ``message_body`` under the
+        commit message. A single file goes through the contents API, anything else through the git data API.
+        """
+        from github import UnknownObjectException  # noqa: PLC0415
+
+        paths = ", ".join([*files, *deletions])
+        try:
+            logger.info(f"Updating {paths} in branch {self.branch} of repository {self.repository}")
+            if self.scheduler:
+                self.scheduler.before_write()
+            if len(files) == 1 and not deletions:
+                [(path, content)] = files.items()
+                self._save_file(path, content, commit_message(self.commit_message, message_body))
+            else:
+                self._commit_files(files, commit_message(self.commit_message, message_body), deletions)
+            logger.info(f"{paths} updated successfully in repository {self.repository}.")
         except UnknownObjectException as e:
-            logger.error(f"Failed to find {self.readme_filename} in repository {self.repository}: {e}")
-            raise FileNotFoundError(f"{self.readme_filename} not found in the repository.") from e
+            logger.error(f"Failed to find {paths} in repository {self.repository}: {e}")
+            raise FileNotFoundError(f"{paths} not found in the repository.") from e
+
+    def get_readme(self) -> str:
+        """Fetch the specified README file's content."""
+        return self.get_file(self.readme_filename)
+
+    def save_readme(self, new_content: str) -> None:
+        """Update the specified README file with new content."""
+        self.save_files({self.readme_filename: new_content})
@@ -0,0 +1,348 @@
+"GitHub GraphQL management module"
+
+import base64
+import logging
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from readme_credly_badges.adapter.base import FileContent, WriteConflictError, blob_sha, commit_message
+from readme_credly_badges.metrics import metrics
+from readme_credly_badges.settings import GITHUB_GRAPHQL_BATCH_SIZE
+
+if TYPE_CHECKING:
+    from readme_credly_badges.rate_limit import RateLimitScheduler
+
+logger = logging.getLogger(__name__)
+
+# Selected by every query, so the cost of each one is known
+RATE_LIMIT_FIELDS = "rateLimit { cost limit remaining resetAt }"
+
+READ_FIELDS = (
+    "repository(owner: $owner{i}, name: $name{i}) {{ ref(qualifiedName: $ref{i}) {{ target {{ oid }} }} "
+    "object(expression: $expression{i}) {{ ... on Blob {{ oid text isBinary isTruncated }} }} }}"
+)
+
+LIST_DIRECTORY = f"""query ListDirectory($owner: String!, $name: String!, $expression: String!) {{
+  {RATE_LIMIT_FIELDS}
+  repository(owner: $owner, name: $name) {{
+    object(expression: $expression) {{ __typename ... on Tree {{ entries {{ name type oid }} }} }}
+  }}
+}}"""
+
+CREATE_COMMIT = """mutation CreateCommit($input: CreateCommitOnBranchInput!) {
+  createCommitOnBranch(input: $input) { commit { oid } }
+}"""
+
+
+def graphql_url(gh_api_url: str) -> str:
+    """GraphQL endpoint of a REST API URL: ``/graphql`` next to ``/v3`` on GitHub Enterprise Server."""
+    base = gh_api_url.rstrip("/")
+    return f"{base.removesuffix('/v3')}/graphql"
+
+
+class GraphQLError(RuntimeError):
+    """Errors the GitHub GraphQL API answered a query with."""
+
+    def __init__(self, errors: list[dict[str, Any]]) -> None:
+        self.errors = errors
+        super().__init__("; ".join(str(error.get("message")) for error in errors))
+
+    @property
+    def types(self) -> set[str]:
+        return {error["type"] for error in self.errors if "type" in error}
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """A file of a branch as read in a query; ``head`` is None if the repository or branch does not exist."""
+
+    head: Optional[str]
+    # None if the file does not exist
+    sha: Optional[str] = None
+    # None if the file is binary or too large for the API to return its text
+    text: Optional[str] = None
+
+
+class GraphQLClient:
+    """
+    Client of the GitHub GraphQL API shared by the repositories of a run.
+    The quota left is read from the response headers of every query and mutation, and exposed like
+    PyGithub's ``rate_limiting`` so that a ``RateLimitScheduler`` can pace the run with it.
+    The points spent by queries are summed in ``cost``; mutations are counted separately.
+    """
+
+    def __init__(
+        self,
+        gh_api_url: str,
+        gh_token: str,
+        *,
+        pool_size: int = 10,
+        batch_size: int = GITHUB_GRAPHQL_BATCH_SIZE,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1, got {batch_size}.")
+        self.url = graphql_url(gh_api_url)
+        self.batch_size = batch_size
+        self.headers = {"Authorization": f"Bearer {gh_token}"}
+        if session is None:
+            session = requests.Session()
+            session.mount(self.url, HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session = session
+        self.queries = 0
+        self.mutations = 0
+        self.cost = 0
+        # Unknown until the first response
+        self.rate_limiting = (-1, -1)
+        self.rate_limiting_resettime = 0
+        self._lock = threading.Lock()
+
+    def _record(self, response: requests.Response, data: dict[str, Any], mutation: bool) -> None:
+        """Count a request, its cost and the quota left after it."""
+        headers = response.headers
+        cost = (data.get("rateLimit") or {}).get("cost", 0)
+        with self._lock:
+            if "x-ratelimit-remaining" in headers:
+                self.rate_limiting = (int(headers["x-ratelimit-remaining"]), int(headers["x-ratelimit-limit"]))
+                self.rate_limiting_resettime = int(headers.get("x-ratelimit-reset", 0))
+            if mutation:
+                self.mutations += 1
+            else:
+                self.queries += 1
+                self.cost += cost
+        metrics.increment("github_graphql_mutations" if mutation else "github_graphql_queries")
+        metrics.increment("github_graphql_cost", cost)
+
+    def _raise_rate_limited(self, response: requests.Response, errors: list[dict[str, Any]]) -> None:
+        """Raise PyGithub's rate limit error, which the scheduler knows how to wait for, if the request was limited."""
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        limited = any(error.get("type") == "RATE_LIMITED" for error in errors)
+        if limited or "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0":
+            from github import RateLimitExceededException  # noqa: PLC0415
+
+            raise RateLimitExceededException(response.status_code, {"errors": errors}, headers)
+
+    def execute(self, query: str, variables: dict[str, Any], *, partial: bool = False) -> dict[str, Any]:
+        """
+        Run a query or mutation and return its data.
+        Raises ``GraphQLError`` if the API reports errors, unless ``partial`` is set, in which case they are
+        logged and the data that could be resolved (with null for the rest) is returned.
+        """
+        response = self.session.post(
+            self.url, json={"query": query, "variables": variables}, headers=self.headers, timeout=60
+        )
+        body = response.json() if response.headers.get("Content-Type", "").startswith("application/json") else {}
+        errors = body.get("errors") or ([{"message": response.text}] if not response.ok else [])
+        if response.status_code in {403, 429} or errors:
+            self._raise_rate_limited(response, errors)
+        if not response.ok:
+            raise GraphQLError(errors)
+
+        data: dict[str, Any] = body.get("data") or {}
+        self._record(response, data, mutation=query.lstrip().startswith("mutation"))
+        if errors and not (partial and data):
+            raise GraphQLError(errors)
+        for error in errors:
+            logger.warning(f"GitHub GraphQL API error at {'.'.join(map(str, error.get('path', [])))}: {error}")
+        return data
+
+    def read_files(self, files: Sequence[tuple[str, str, str]]) -> list[RemoteFile]:
+        """
+        Read ``(repository, branch, path)`` files with one aliased query per ``batch_size`` files.
+        A repository, branch or file that does not exist is reported in its ``RemoteFile``, not raised.
+        """
+        remote: list[RemoteFile] = []
+        for start in range(0, len(files), self.batch_size):
+            remote.extend(self._read_batch(files[start : start + self.batch_size]))
+        return remote
+
+    def _read_batch(self, files: Sequence[tuple[str, str, str]]) -> list[RemoteFile]:
+        variables: dict[str, Any] = {}
+        for i, (repository, branch, path) in enumerate(files):
+            owner, _, name = repository.partition("/")
+            variables.update(
+                {
+                    f"owner{i}": owner,
+                    f"name{i}": name,
+                    f"ref{i}": f"refs/heads/{branch}",
+                    f"expression{i}": f"{branch}:{path}",
+                }
+            )
+        params = ", ".join(f"${name}: String!" for name in variables)
+        fields = "\n".join(f"  r{i}: {READ_FIELDS.format(i=i)}" for i in range(len(files)))
+        data = self.execute(
+            f"query ReadFiles({params}) {{\n  {RATE_LIMIT_FIELDS}\n{fields}\n}}", variables, partial=True
+        )
+        return [self._remote_file(data.get(f"r{i}")) for i in range(len(files))]
+
+    @staticmethod
+    def _remote_file(repository: Optional[dict[str, Any]]) -> RemoteFile:
+        ref = (repository or {}).get("ref")
+        if not ref:
+            return RemoteFile(head=None)
+        blob = repository["object"] if repository else None
+        if not blob:
+            return RemoteFile(head=ref["target"]["oid"])
+        text = None if blob["isBinary"] or blob["isTruncated"] else blob["text"]
+        return RemoteFile(head=ref["target"]["oid"], sha=blob["oid"], text=text)
+
+    def prefetch(self, repos: Sequence["GraphQLRepo"], paths: Optional[Sequence[str]] = None) -> None:
+        """
+        Read the README (or the given ``paths``) of many repositories in as few queries as possible,
+        so that their next ``get_file`` call does not send a query of its own.
+        """
+        files = [(repo, path) for repo in repos for path in (paths or [repo.readme_filename])]
+        remote = self.read_files([(repo.repository, repo.branch, path) for repo, path in files])
+        for (repo, path), remote_file in zip(files, remote):
+            repo.remember(path, remote_file)
+        logger.info(f"Prefetched {len(files)} files of {len(repos)} repositories: {self.usage()}.")
+
+    def usage(self) -> str:
+        """The queries and mutations sent so far, with their cost and the quota left."""
+        remaining, limit = self.rate_limiting
+        quota = f"{remaining}/{limit} points left" if limit >= 0 else "quota unknown"
+        return f"{self.queries} queries costing {self.cost} points, {self.mutations} mutations, {quota}"
+
+    def log_usage(self) -> None:
+        """Log the queries and mutations sent so far, with their cost and the quota left."""
+        logger.info(f"GitHub GraphQL API usage: {self.usage()}.")
+
+
+class GraphQLRepo:
+    """
+    Variant of ``GithubRepo`` talking to the GraphQL API: a file is read with a single query, or with no query
+    at all once prefetched together with the files of other repositories, and changes are committed with
+    a single ``createCommitOnBranch`` mutation on top of the branch head read with them.
+    """
+
+    def __init__(
+        self,
+        commit_message: str,
+        client: GraphQLClient,
+        repository: str,
+        branch: str,
+        readme_filename: str,
+        *,
+        scheduler: Optional["RateLimitScheduler"] = None,
+    ):
+        """
+        Initialize the GitHub repository object.
+        The ``client`` can be shared between repositories, together with the ``scheduler`` pacing their writes.
+        """
+        self.commit_message = commit_message
+        self.client = client
+        self.repository = repository
+        self.branch = branch
+        self.readme_filename = readme_filename
+        self.scheduler = scheduler
+        self.head: Optional[str] = None
+        self.shas: dict[str, str] = {}
+        self._prefetched: dict[str, RemoteFile] = {}
+
+    @property
+    def target(self) -> str:
+        """Identifier of the README file this object reads and writes."""
+        return self.target_for(self.readme_filename)
+
+    def target_for(self, path: str) -> str:
+        """Identifier of a file of the repository."""
+        return f"{self.repository}@{self.branch}:{path}"
+
+    def remember(self, path: str, remote: RemoteFile) -> None:
+        """Keep a file read by a batched query for the next ``get_file`` call."""
+        self._prefetched[path] = remote
+
+    def _read(self, path: str) -> RemoteFile:
+        """A file and the branch head, as prefetched or from a query of its own; fails if the branch is missing."""
+        remote = self._prefetched.pop(path, None)
+        if remote is None:
+            [remote] = self.client.read_files([(self.repository, self.branch, path)])
+        if remote.head is None:
+            logger.error(f"Failed to access branch {self.branch} of repository {self.repository}.")
+            raise RuntimeError(f"Branch {self.branch} of repository {self.repository} not found.")
+        self.head = remote.head
+        return remote
+
+    def get_file(self, path: str) -> str:
+        """Fetch the content of a file of the repository."""
+        logger.info(f"Fetching {path} from branch {self.branch} of repository {self.repository}")
+        remote = self._read(path)
+        if remote.sha is None:
+            logger.error(f"Failed to find {path} in repository {self.repository}.")
+            raise FileNotFoundError(f"{path} not found in the repository.")
+        self.shas[path] = remote.sha
+        if remote.text is None:
+            raise ValueError(f"{path} is binary or too large to be read through the GraphQL API.")
+        return remote.text
+
+    def file_shas(self, directory: str) -> dict[str, str]:
+        """Git blob SHA of each file directly in a directory of the branch, listed in one query."""
+        owner, _, name = self.repository.partition("/")
+        directory = directory.strip("/")
+        variables = {"owner": owner, "name": name, "expression": f"{self.branch}:{directory}"}
+        tree = (self.client.execute(LIST_DIRECTORY, variables).get("repository") or {}).get("object")
+        if not tree:
+            return {}
+        if tree["__typename"] != "Tree":
+            raise ValueError(f"{directory} is a file, expected a directory.")
+        return {f"{directory}/{entry['name']}": entry["oid"] for entry in tree["entries"] if entry["type"] == "blob"}
+
+    def _commit(self, files: dict[str, FileContent], message: str, deletions: Sequence[str] = ()) -> str:
+        """Commit the files and the deletions on top of the last head read, returning the new head."""
+        if self.head is None:
+            # The head comes with every file read; a write without a read has to read one
+            self._read(self.readme_filename)
+        headline, _, body = message.partition("\n")
+        additions = [
+            {
+                "path": path,
+                "contents": base64.b64encode(content.encode("utf-8") if isinstance(content, str) else content).decode(),
+            }
+            for path, content in files.items()
+        ]
+        commit_input = {
+            "branch": {"repositoryNameWithOwner": self.repository, "branchName": self.branch},
+            "message": {"headline": headline, "body": body.strip("\n")},
+            "fileChanges": {"additions": additions, "deletions": [{"path": path} for path in deletions]},
+            "expectedHeadOid": self.head,
+        }
+        data = self.client.execute(CREATE_COMMIT, {"input": commit_input})
+        oid: str = data["createCommitOnBranch"]["commit"]["oid"]
+        return oid
+
+    def save_files(self, files: dict[str, FileContent], message_body: str = "", deletions: Sequence[str] = ()) -> None:
+        """
+        Write files and delete ``deletions`` on the branch in a single commit, with ``message_body`` under the
+        commit message. If the branch moved since it was read, ``WriteConflictError`` is raised rather than
+        committing content rendered from outdated files; the next read fetches the new head.
+        """
+        paths = ", ".join([*files, *deletions])
+        logger.info(f"Updating {paths} in branch {self.branch} of repository {self.repository}")
+        if self.scheduler:
+            self.scheduler.before_write()
+        try:
+            self.head = self._commit(files, commit_message(self.commit_message, message_body), deletions)
+        except GraphQLError as e:
+            if "STALE_DATA" not in e.types:
+                raise
+            self.head = None
+            raise WriteConflictError(
+                f"Branch {self.branch} of repository {self.repository} moved since it was read."
+            ) from e
+        self.shas.update({path: blob_sha(content) for path, content in files.items()})
+        for path in deletions:
+            self.shas.pop(path, None)
+        logger.info(f"{paths} updated successfully in repository {self.repository}.")
+
+    def get_readme(self) -> str:
+        """Fetch the specified README file's content."""
+        return self.get_file(self.readme_filename)
+
+    def save_readme(self, new_content: str) -> None:
+        """Update the specified README file with new content."""
+        self.save_files({self.readme_filename: new_content})
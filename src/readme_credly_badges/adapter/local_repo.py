@@ -0,0 +1,128 @@
+"Local working tree module"
+
+import logging
+import shutil
+import subprocess
+from collections.abc import Sequence
+from pathlib import Path
+
+from readme_credly_badges.adapter.base import FileContent, blob_sha, commit_message
+
+logger = logging.getLogger(__name__)
+
+GIT_USER_NAME = "github-actions[bot]"
+GIT_USER_EMAIL = "41898282+github-actions[bot]@users.noreply.github.com"
+
+
+class LocalRepo:
+    """README file in a checked-out working tree, optionally committed and pushed with plain git."""
+
+    def __init__(
+        self,
+        commit_message: str,
+        path: str,
+        branch: str,
+        readme_filename: str,
+        push: bool = False,
+    ) -> None:
+        """Initialize the local repository object. No git command is run until the README is saved."""
+        self.commit_message = commit_message
+        self.path = Path(path)
+        self.branch = branch
+        self.readme_filename = readme_filename
+        self.push = push
+        self.file_path = self.path / readme_filename
+
+    @property
+    def target(self) -> str:
+        """Identifier of the README file this object reads and writes."""
+        return self.target_for(self.readme_filename)
+
+    def target_for(self, path: str) -> str:
+        """Identifier of a file of the working tree."""
+        return f"{self.path.resolve()}@{self.branch}:{path}"
+
+    def _git(self, *args: str) -> str:
+        """Run a git command in the working tree and return its output."""
+        git = shutil.which("git")
+        if git is None:
+            raise RuntimeError("git executable not found.")
+
+        try:
+            result = subprocess.run(  # noqa: S603
+                [git, "-c", f"user.name={GIT_USER_NAME}", "-c", f"user.email={GIT_USER_EMAIL}", *args],
+                cwd=self.path,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            logger.error(f"git {args[0]} failed in {self.path}: {e.stderr.strip()}")
+            raise RuntimeError(f"git {args[0]} failed: {e.stderr.strip()}") from e
+        return result.stdout
+
+    def get_file(self, path: str) -> str:
+        """Read a file from the working tree."""
+        logger.info(f"Reading {path} from {self.path}")
+        file_path = self.path / path
+        if file_path.is_dir():
+            raise ValueError(f"{path} is a directory, expected a file.")
+
+        try:
+            return file_path.read_text(encoding="utf-8")
+        except FileNotFoundError as e:
+            logger.error(f"Failed to find {path} in {self.path}: {e}")
+            raise FileNotFoundError(f"{path} not found in the working tree.") from e
+
+    def file_shas(self, directory: str) -> dict[str, str]:
+        """Git blob SHA of each file directly in a directory of the working tree."""
+        directory_path = self.path / directory
+        if not directory_path.is_dir():
+            return {}
+        return {
+            f"{directory.strip('/')}/{file_path.name}": blob_sha(file_path.read_bytes())
+            for file_path in sorted(directory_path.iterdir())
+            if file_path.is_file()
+        }
+
+    def save_files(self, files: dict[str, FileContent], message_body: str = "", deletions: Sequence[str] = ()) -> None:
+        """
+        Write files and delete ``deletions``, then commit the changes together and push the commit to the branch
+        if ``push`` is enabled. ``message_body`` is added under the commit message.
+        """
+        # Only deleted files git knows about can be staged; untracked ones are just removed
+        tracked = self._git("ls-files", "--", *deletions).split() if self.push and deletions else []
+        for path in deletions:
+            logger.info(f"Deleting {path} in {self.path}")
+            (self.path / path).unlink(missing_ok=True)
+        for path, content in files.items():
+            logger.info(f"Writing {path} in {self.path}")
+            file_path = self.path / path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, str):
+                file_path.write_text(content, encoding="utf-8")
+            else:
+                file_path.write_bytes(content)
+
+        if not self.push:
+            return
+
+        paths = [*files, *tracked]
+        if not paths:
+            return
+        self._git("add", "--", *paths)
+        if not self._git("status", "--porcelain", "--", *paths).strip():
+            logger.info(f"{', '.join(paths)} has no changes to commit.")
+            return
+
+        self._git("commit", "-m", commit_message(self.commit_message, message_body), "--", *paths)
+        self._git("push", "origin", f"HEAD:refs/heads/{self.branch}")
+        logger.info(f"{', '.join(paths)} committed and pushed to branch {self.branch}.")
+
+    def get_readme(self) -> str:
+        """Read the specified README file from the working tree."""
+        return self.get_file(self.readme_filename)
+
+    def save_readme(self, new_content: str) -> None:
+        """Write the README file, then commit and push it to the branch if ``push`` is enabled."""
+        self.save_files({self.readme_filename: new_content})
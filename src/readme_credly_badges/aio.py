@@ -0,0 +1,173 @@
+"""Asyncio engine: run many profile fetches and README updates concurrently over one shared HTTP client."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+import httpx
+
+from readme_credly_badges.adapter.async_credly import AsyncCredly
+from readme_credly_badges.adapter.async_github_repo import AsyncGithubRepo
+from readme_credly_badges.adapter.base import WriteConflictError
+from readme_credly_badges.entrypoint import badge_names, generate_file_changes
+from readme_credly_badges.jobs import STATUS_FAILED, STATUS_UNCHANGED, STATUS_UPDATED, BatchJob, JobResult
+from readme_credly_badges.markers import BadgeDiff
+from readme_credly_badges.metrics import metrics
+from readme_credly_badges.models import Badge
+from readme_credly_badges.renderers import file_format
+from readme_credly_badges.settings import (
+    BATCH_CONCURRENCY,
+    COMMIT_MESSAGE,
+    CREDLY_API_URL,
+    CREDLY_USERNAME,
+    GITHUB_API_URL,
+    GITHUB_BRANCH,
+    GITHUB_REPO,
+    GITHUB_TOKEN,
+    README_FILES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def create_client(concurrency: int = BATCH_CONCURRENCY) -> httpx.AsyncClient:
+    """Create the async HTTP client shared by every Credly and GitHub request of a run."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.AsyncClient(limits=limits, follow_redirects=True)
+
+
+async def update_readme(
+    credly: AsyncCredly, github_repo: AsyncGithubRepo, paths: Optional[Sequence[str]] = None
+) -> bool:
+    """
+    Run the fetch, render and save pipeline for a single profile.
+    The badges are fetched once, concurrently with the reads of every file in ``paths`` (the repository's
+    README by default), and all changed files are saved in a single commit.
+    If the files changed on the branch since they were read, they are read and rendered once more so that
+    the other change is kept.
+    Returns True if any file was updated, False if all were already up to date.
+    """
+    paths = list(paths or [github_repo.readme_filename])
+    badges, contents = await asyncio.gather(credly.fetch_badges(), _read_files(github_repo, paths))
+    try:
+        return await _save_changes(github_repo, badges, dict(zip(paths, contents)))
+    except WriteConflictError as e:
+        logger.warning(f"{e} Reading the files again to render the badges on top of the other change.")
+        metrics.increment("write_conflicts")
+        contents = await _read_files(github_repo, paths)
+        return await _save_changes(github_repo, badges, dict(zip(paths, contents)))
+
+
+async def _read_files(github_repo: AsyncGithubRepo, paths: Sequence[str]) -> list[str]:
+    """Fetch files concurrently; generated JSON and SVG files that do not exist yet read as empty."""
+
+    async def read(path: str) -> str:
+        try:
+            return await github_repo.get_file(path)
+        except FileNotFoundError:
+            if file_format(path) is None:
+                raise
+            return ""
+
+    return list(await asyncio.gather(*(read(path) for path in paths)))
+
+
+async def _save_changes(github_repo: AsyncGithubRepo, badges: list[Badge], old: dict[str, str]) -> bool:
+    """Render every file from its old content and save the changed ones in one commit."""
+    changes = {}
+    diff = BadgeDiff()
+    for path, old_content in old.items():
+        new_content, file_diff = generate_file_changes(path, badges, old_content)
+        if new_content != old_content:
+            changes[path] = new_content
+            diff |= file_diff
+
+    if changes:
+        await github_repo.save_files(changes, message_body=diff.describe(badge_names(badges)))
+        logger.info(f"{github_repo.repository}: README updated with new Credly badges.")
+        return True
+
+    logger.info(f"{github_repo.repository}: README is already up to date.")
+    return False
+
+
+async def run_job(
+    job: BatchJob,
+    client: httpx.AsyncClient,
+    gh_api_url: str,
+    gh_token: str,
+    credly_api_url: str = CREDLY_API_URL,
+) -> JobResult:
+    """Run the README update pipeline for a single job, capturing any failure in the result."""
+    started = time.perf_counter()
+    try:
+        credly = AsyncCredly(username=job.credly_username, client=client, api_url=credly_api_url)
+        github_repo = AsyncGithubRepo(
+            commit_message=job.commit_message,
+            gh_api_url=gh_api_url,
+            gh_token=gh_token,
+            repository=job.github_repo,
+            branch=job.github_branch,
+            readme_filename=job.readme_files[0],
+            client=client,
+        )
+        updated = await update_readme(credly=credly, github_repo=github_repo, paths=job.readme_files)
+    except Exception as e:
+        logger.error(f"Job {job.credly_username} -> {job.github_repo} failed: {e}")
+        return JobResult(job=job, status=STATUS_FAILED, duration=time.perf_counter() - started, error=str(e))
+
+    status = STATUS_UPDATED if updated else STATUS_UNCHANGED
+    return JobResult(job=job, status=status, duration=time.perf_counter() - started)
+
+
+async def run_batch(
+    jobs: Sequence[BatchJob],
+    gh_token: str,
+    gh_api_url: str = GITHUB_API_URL,
+    concurrency: int = BATCH_CONCURRENCY,
+    credly_api_url: str = CREDLY_API_URL,
+) -> list[JobResult]:
+    """
+    Run all jobs concurrently, with at most ``concurrency`` jobs in flight at once.
+    Results are returned in manifest order.
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}.")
+
+    logger.info(f"Running {len(jobs)} jobs asynchronously with concurrency {concurrency}.")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with create_client(concurrency) as client:
+
+        async def bounded(job: BatchJob) -> JobResult:
+            async with semaphore:
+                return await run_job(job, client, gh_api_url, gh_token, credly_api_url)
+
+        return list(await asyncio.gather(*(bounded(job) for job in jobs)))
+
+
+async def main() -> None:
+    "Async counterpart of ``entrypoint.main`` for a single profile configured through the environment."
+    logger.info("Starting the README update process with Credly badges.")
+    if not (CREDLY_USERNAME and GITHUB_TOKEN and GITHUB_REPO):
+        logger.error("Environment variables CREDLY_USERNAME, GITHUB_TOKEN, and GITHUB_REPO must be set.")
+        raise ValueError("Environment variables CREDLY_USERNAME, GITHUB_TOKEN, and GITHUB_REPO must be set.")
+
+    async with create_client() as client:
+        credly = AsyncCredly(username=CREDLY_USERNAME, client=client, api_url=CREDLY_API_URL)
+        github_repo = AsyncGithubRepo(
+            commit_message=COMMIT_MESSAGE,
+            gh_api_url=GITHUB_API_URL,
+            gh_token=GITHUB_TOKEN,
+            repository=GITHUB_REPO,
+            branch=GITHUB_BRANCH,
+            readme_filename=README_FILES[0],
+            client=client,
+        )
+        await update_readme(credly=credly, github_repo=github_repo, paths=README_FILES)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
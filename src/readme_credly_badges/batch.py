@@ -0,0 +1,485 @@
+"""Batch mode: update many Credly profiles across many repositories from a single process."""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import requests
+from github import Github
+
+from readme_credly_badges.adapter import Credly, GithubRepo, GraphQLClient, GraphQLRepo
+from readme_credly_badges.adapter.github_repo import count_requests
+from readme_credly_badges.cache import HttpCache, ReadmeCache
+from readme_credly_badges.dry_run import PreviewRepository
+from readme_credly_badges.entrypoint import update_readme
+from readme_credly_badges.fingerprint import FingerprintStore
+from readme_credly_badges.http_session import create_session
+from readme_credly_badges.jobs import (
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_UNCHANGED,
+    STATUS_UPDATED,
+    BatchJob,
+    JobResult,
+)
+from readme_credly_badges.journal import Journal
+from readme_credly_badges.metrics import export_metrics
+from readme_credly_badges.rate_limit import RateLimitScheduler
+from readme_credly_badges.settings import (
+    BATCH_CONCURRENCY,
+    CREDLY_API_URL,
+    CREDLY_CACHE_DIR,
+    CREDLY_CACHE_TTL,
+    CREDLY_POOL_SIZE,
+    FINGERPRINT_FILE,
+    GITHUB_API_URL,
+    GITHUB_TOKEN,
+    GITHUB_WRITE_INTERVAL,
+    README_CACHE_DIR,
+    REPO_BACKEND,
+    REPO_BACKENDS,
+)
+from readme_credly_badges.shards import select_shard
+from readme_credly_badges.utils import split_paths
+
+logger = logging.getLogger(__name__)
+
+# The Credly profile and repository of a job
+JobClients = tuple[Credly, Union[GithubRepo, GraphQLRepo]]
+
+# Backends batch jobs can read and write repositories through; a local clone holds a single repository
+BACKENDS = tuple(backend for backend in REPO_BACKENDS if backend != "local")
+
+
+def _job_from_entry(entry: dict[str, Any], index: int) -> BatchJob:
+    """Build a job from one manifest entry, keeping only the known, non-empty keys."""
+    if not isinstance(entry, dict):
+        raise ValueError(f"Manifest entry {index} must be a mapping, got {type(entry).__name__}.")
+
+    values = {key: str(value).strip() for key, value in entry.items() if value not in (None, "")}
+    if not (values.get("credly_username") and values.get("github_repo")):
+        raise ValueError(f"Manifest entry {index} must define 'credly_username' and 'github_repo'.")
+
+    # Like the action input, ``readme_file`` is a comma-separated list of files
+    fields = {*BatchJob.__dataclass_fields__, "readme_file"} - {"readme_files"}
+    unknown = sorted(set(values) - fields)
+    if unknown:
+        raise ValueError(f"Manifest entry {index} has unknown keys: {', '.join(unknown)}.")
+
+    arguments: dict[str, Any] = dict(values)
+    if "readme_file" in arguments:
+        arguments["readme_files"] = split_paths(arguments.pop("readme_file"))
+    return BatchJob(**arguments)
+
+
+def load_manifest(path: Path) -> list[BatchJob]:
+    """
+    Load batch jobs from a JSON, YAML or CSV manifest.
+    JSON and YAML manifests hold a list of entries (optionally under a top-level ``jobs`` key);
+    CSV manifests use a header row. Entry keys mirror the action inputs.
+    """
+    suffix = path.suffix.lower()
+    text = path.read_text(encoding="utf-8")
+
+    entries: Any
+    if suffix == ".json":
+        entries = json.loads(text)
+    elif suffix in {".yaml", ".yml"}:
+        try:
+            import yaml  # noqa: PLC0415
+        except ImportError as e:
+            raise ImportError("PyYAML is required to read YAML manifests: pip install pyyaml") from e
+        entries = yaml.safe_load(text)
+    elif suffix == ".csv":
+        entries = list(csv.DictReader(text.splitlines()))
+    else:
+        raise ValueError(f"Unsupported manifest format: {path.name}. Use .json, .yaml, .yml or .csv.")
+
+    if isinstance(entries, dict):
+        entries = entries.get("jobs", [])
+    if not isinstance(entries, list):
+        raise ValueError(f"Manifest {path.name} must contain a list of jobs.")
+
+    return [_job_from_entry(entry, index) for index, entry in enumerate(entries)]
+
+
+def job_clients(
+    job: BatchJob,
+    gh: Github,
+    gh_api_url: str,
+    gh_token: str,
+    *,
+    credly_api_url: str = CREDLY_API_URL,
+    cache: Optional[HttpCache] = None,
+    session: Optional[requests.Session] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
+    graphql: Optional[GraphQLClient] = None,
+    readme_cache: Optional[ReadmeCache] = None,
+) -> JobClients:
+    """
+    The Credly profile and GitHub repository of a job, sharing the given client, caches and session.
+    With a ``graphql`` client, the repository is read and written through the GraphQL API instead of ``gh``;
+    otherwise README reads are revalidated against the ``readme_cache``, if any.
+    """
+    credly = Credly(username=job.credly_username, api_url=credly_api_url, cache=cache, session=session)
+    if graphql:
+        return credly, GraphQLRepo(
+            commit_message=job.commit_message,
+            client=graphql,
+            repository=job.github_repo,
+            branch=job.github_branch,
+            readme_filename=job.readme_files[0],
+            scheduler=scheduler,
+        )
+    github_repo = GithubRepo(
+        commit_message=job.commit_message,
+        gh_api_url=gh_api_url,
+        gh_token=gh_token,
+        repository=job.github_repo,
+        branch=job.github_branch,
+        readme_filename=job.readme_files[0],
+        gh=gh,
+        scheduler=scheduler,
+        readme_cache=readme_cache,
+    )
+    return credly, github_repo
+
+
+def run_job(
+    job: BatchJob,
+    gh: Github,
+    gh_api_url: str,
+    gh_token: str,
+    *,
+    credly_api_url: str = CREDLY_API_URL,
+    cache: Optional[HttpCache] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+    session: Optional[requests.Session] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
+    dry_run: bool = False,
+    clients: Optional[JobClients] = None,
+    journal: Optional[Journal] = None,
+    readme_cache: Optional[ReadmeCache] = None,
+) -> JobResult:
+    """
+    Run the README update pipeline for a single job, capturing any failure in the result.
+    With a ``scheduler``, the job waits for GitHub quota and is retried once if it hit a rate limit.
+    In ``dry_run`` mode nothing is written or recorded; the changes the job would make are returned instead.
+    The Credly and GitHub objects of the job are created for the run unless long-lived ones are given as
+    ``clients``, which keeps the repository lookup and the blob SHAs read by previous runs.
+    With a ``journal``, the outcome of the job is recorded in it, and a job it already finished is skipped.
+    """
+    preview: Optional[PreviewRepository] = None
+    started = time.perf_counter()
+    credly, github_repo = clients or job_clients(
+        job,
+        gh,
+        gh_api_url,
+        gh_token,
+        credly_api_url=credly_api_url,
+        cache=cache,
+        session=session,
+        scheduler=scheduler,
+        readme_cache=readme_cache,
+    )
+    if journal and journal.finished(github_repo.target):
+        logger.info(f"Job {job.credly_username} -> {job.github_repo} already finished in run {journal.run_id}.")
+        return JobResult(job=job, status=STATUS_SKIPPED, duration=0.0)
+
+    retried = False
+    while True:
+        try:
+            if scheduler:
+                scheduler.wait()
+            if dry_run:
+                preview = PreviewRepository(github_repo)
+                updated = update_readme(credly=credly, github_repo=preview, paths=job.readme_files)
+            else:
+                updated = update_readme(
+                    credly=credly, github_repo=github_repo, fingerprints=fingerprints, paths=job.readme_files
+                )
+        except Exception as e:
+            if scheduler and not retried and scheduler.handle_error(e):
+                logger.warning(f"Job {job.credly_username} -> {job.github_repo} hit a GitHub rate limit; retrying.")
+                retried = True
+                continue
+            logger.error(f"Job {job.credly_username} -> {job.github_repo} failed: {e}")
+            if journal:
+                journal.record(github_repo.target, STATUS_FAILED, error=str(e))
+            return JobResult(job=job, status=STATUS_FAILED, duration=time.perf_counter() - started, error=str(e))
+        break
+
+    status = STATUS_UPDATED if updated else STATUS_UNCHANGED
+    if journal:
+        journal.record(github_repo.target, status, sha=github_repo.shas.get(job.readme_files[0]))
+    changes = preview.changes if preview else None
+    return JobResult(job=job, status=status, duration=time.perf_counter() - started, changes=changes)
+
+
+def make_clients(
+    gh_token: str,
+    gh_api_url: str,
+    concurrency: int,
+    *,
+    graphql: Optional[GraphQLClient] = None,
+    write_interval: float = GITHUB_WRITE_INTERVAL,
+) -> tuple[Github, RateLimitScheduler, requests.Session]:
+    """
+    The GitHub client, rate limit scheduler and Credly HTTP session shared by the ``concurrency`` workers of
+    a run. Writes are paced by the scheduler across all workers instead of by each request, following the
+    quota of the ``graphql`` client if one is given and the REST quota otherwise.
+    """
+    gh = count_requests(
+        Github(base_url=gh_api_url, login_or_token=gh_token, pool_size=concurrency, seconds_between_writes=None)
+    )
+    scheduler = RateLimitScheduler(graphql or gh, write_interval=write_interval)
+    session = create_session(pool_size=max(concurrency, CREDLY_POOL_SIZE))
+    return gh, scheduler, session
+
+
+def run_batch(
+    jobs: Sequence[BatchJob],
+    gh_token: str,
+    gh_api_url: str = GITHUB_API_URL,
+    concurrency: int = BATCH_CONCURRENCY,
+    *,
+    credly_api_url: str = CREDLY_API_URL,
+    cache: Optional[HttpCache] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+    dry_run: bool = False,
+    journal: Optional[Journal] = None,
+    backend: str = REPO_BACKEND,
+    readme_cache: Optional[ReadmeCache] = None,
+    write_interval: float = GITHUB_WRITE_INTERVAL,
+) -> list[JobResult]:
+    """
+    Run all jobs on a bounded thread pool sharing a single GitHub client, Credly HTTP session, Credly and
+    README caches and fingerprint store. Commits are spaced at least ``write_interval`` seconds apart.
+    With a ``journal``, it is used as the fingerprint store and records the outcome of every job.
+    With the ``graphql`` backend, the README files of all jobs are read upfront in batched queries,
+    and each update is committed with a single mutation.
+    Results are returned in manifest order.
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}.")
+    if backend not in BACKENDS:
+        raise ValueError(f"Invalid backend: {backend}. Use {' or '.join(map(repr, BACKENDS))}.")
+
+    logger.info(f"Running {len(jobs)} jobs with concurrency {concurrency}.")
+    graphql = GraphQLClient(gh_api_url, gh_token, pool_size=concurrency) if backend == "graphql" else None
+    gh, scheduler, session = make_clients(
+        gh_token, gh_api_url, concurrency, graphql=graphql, write_interval=write_interval
+    )
+    clients: Sequence[Optional[JobClients]] = [None] * len(jobs)
+    if graphql:
+        graphql_clients = [
+            job_clients(
+                job,
+                gh,
+                gh_api_url,
+                gh_token,
+                credly_api_url=credly_api_url,
+                cache=cache,
+                session=session,
+                scheduler=scheduler,
+                graphql=graphql,
+            )
+            for job in jobs
+        ]
+        prefetch_readmes(graphql, graphql_clients, journal)
+        clients = graphql_clients
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="credly-batch") as executor:
+        results = list(
+            executor.map(
+                lambda job, job_clients: run_job(
+                    job,
+                    gh,
+                    gh_api_url,
+                    gh_token,
+                    credly_api_url=credly_api_url,
+                    cache=cache,
+                    fingerprints=journal or fingerprints,
+                    session=session,
+                    scheduler=scheduler,
+                    dry_run=dry_run,
+                    clients=job_clients,
+                    journal=journal,
+                    readme_cache=readme_cache,
+                ),
+                jobs,
+                clients,
+            )
+        )
+    if graphql:
+        graphql.log_usage()
+    else:
+        scheduler.log_budget()
+    return results
+
+
+def prefetch_readmes(graphql: GraphQLClient, clients: Sequence[JobClients], journal: Optional[Journal] = None) -> None:
+    """
+    Read the README files of the jobs left to run in batched GraphQL queries.
+    If that fails, each job reads its README with a query of its own, and reports the error itself.
+    """
+    pending = [
+        repo
+        for _credly, repo in clients
+        if isinstance(repo, GraphQLRepo) and not (journal and journal.finished(repo.target))
+    ]
+    try:
+        graphql.prefetch(pending)
+    except Exception as e:
+        logger.warning(f"Failed to prefetch README files; reading them one at a time: {e}")
+
+
+def summarize(results: Sequence[JobResult]) -> dict[str, Any]:
+    """Build a JSON-serializable summary of batch results."""
+    counts = dict.fromkeys((STATUS_UPDATED, STATUS_UNCHANGED, STATUS_FAILED, STATUS_SKIPPED), 0)
+    for result in results:
+        counts[result.status] += 1
+
+    jobs = []
+    for result in results:
+        entry = {
+            **asdict(result.job),
+            "status": result.status,
+            "duration": round(result.duration, 3),
+            "error": result.error,
+        }
+        if result.changes is not None:
+            entry["changes"] = [change.summary() for change in result.changes]
+        jobs.append(entry)
+
+    return {"total": len(results), **counts, "jobs": jobs}
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse and check the command line arguments of batch mode, exiting with a usage error if they are invalid."""
+    parser = argparse.ArgumentParser(description="Update README files with Credly badges for many profiles.")
+    parser.add_argument("manifest", type=Path, help="Path to a .json, .yaml, .yml or .csv manifest.")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Number of worker threads.")
+    parser.add_argument("--report", type=Path, help="Write the JSON result summary to this path.")
+    parser.add_argument(
+        "--engine",
+        choices=("threads", "async"),
+        default="threads",
+        help="Run jobs on a thread pool or on the asyncio engine (requires httpx).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=REPO_BACKEND,
+        help="Read and write repositories through the REST API or through batched GraphQL queries "
+        "(default: REPO_BACKEND).",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Compute the changes of every job without committing anything."
+    )
+    parser.add_argument("--diff", type=Path, help="With --dry-run, write the unified diff of all jobs to this path.")
+    parser.add_argument(
+        "--journal", type=Path, help="Record the outcome of every job in this append-only journal (JSON lines)."
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="With --journal, only run the jobs the last recorded run did not finish."
+    )
+    parser.add_argument(
+        "--shard-index", type=int, default=0, help="Only run the jobs of this shard (0 to --shard-count - 1)."
+    )
+    parser.add_argument(
+        "--shard-count", type=int, default=1, help="Split the jobs into this many shards, by repository name."
+    )
+    args = parser.parse_args(argv)
+    # The default comes from REPO_BACKEND, which argparse does not check against the choices
+    if args.backend not in BACKENDS:
+        parser.error(f"REPO_BACKEND={args.backend} is not supported by batch mode; pass --backend api or graphql.")
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be between 0 and --shard-count - 1.")
+    if args.backend == "graphql" and args.engine == "async":
+        parser.error("--backend graphql is only supported by the threads engine.")
+    if args.dry_run and args.engine == "async":
+        parser.error("--dry-run is only supported by the threads engine.")
+    if args.diff and not args.dry_run:
+        parser.error("--diff requires --dry-run.")
+    if args.journal and (args.dry_run or args.engine == "async"):
+        parser.error("--journal is only supported by the threads engine, without --dry-run.")
+    if args.resume and not args.journal:
+        parser.error("--resume requires --journal.")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point for batch mode. Returns the process exit code."""
+    args = parse_args(argv)
+    if not GITHUB_TOKEN:
+        logger.error("Environment variable GITHUB_TOKEN must be set.")
+        raise ValueError("Environment variable GITHUB_TOKEN must be set.")
+
+    jobs = load_manifest(args.manifest)
+    if args.shard_count > 1:
+        jobs = select_shard(jobs, args.shard_index, args.shard_count)
+    started = time.perf_counter()
+    if args.engine == "async":
+        from readme_credly_badges import aio  # noqa: PLC0415
+
+        results = asyncio.run(aio.run_batch(jobs, gh_token=GITHUB_TOKEN, concurrency=args.concurrency))
+    else:
+        cache = HttpCache(CREDLY_CACHE_DIR, ttl=CREDLY_CACHE_TTL) if CREDLY_CACHE_DIR else None
+        fingerprints = FingerprintStore(os.path.join(CREDLY_CACHE_DIR, FINGERPRINT_FILE)) if CREDLY_CACHE_DIR else None
+        readme_cache = ReadmeCache(os.path.join(CREDLY_CACHE_DIR, README_CACHE_DIR)) if CREDLY_CACHE_DIR else None
+        results = run_batch(
+            jobs,
+            gh_token=GITHUB_TOKEN,
+            concurrency=args.concurrency,
+            cache=cache,
+            fingerprints=fingerprints,
+            dry_run=args.dry_run,
+            journal=Journal(str(args.journal), resume=args.resume) if args.journal else None,
+            backend=args.backend,
+            readme_cache=readme_cache,
+        )
+        if cache:
+            cache.log_stats()
+        if readme_cache and args.backend == "api":
+            readme_cache.log_stats()
+        if fingerprints:
+            fingerprints.save()
+    elapsed = time.perf_counter() - started
+    export_metrics()
+
+    for result in results:
+        job = result.job
+        files = ",".join(job.readme_files)
+        logger.info(f"{result.status:<9} {job.credly_username} -> {job.github_repo}:{files} ({result.duration:.2f}s)")
+
+    summary = summarize(results)
+    if args.shard_count > 1:
+        summary["shard"] = {"index": args.shard_index, "count": args.shard_count}
+    logger.info(
+        f"Batch finished: {summary['updated']} updated, {summary['unchanged']} unchanged, "
+        f"{summary['failed']} failed, {summary['skipped']} skipped out of {summary['total']} jobs in {elapsed:.2f}s."
+    )
+
+    if args.diff:
+        args.diff.write_text("".join(change.diff for result in results for change in result.changes or []), "utf-8")
+        logger.info(f"Dry-run diff written to {args.diff}.")
+
+    if args.report:
+        args.report.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        logger.info(f"Batch report written to {args.report}.")
+
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
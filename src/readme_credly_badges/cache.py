@@ -0,0 +1,156 @@
+"""On-disk HTTP caches for Credly badge responses and README files, revalidated with ETag / Last-Modified."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from readme_credly_badges.metrics import metrics
+from readme_credly_badges.models import Badge
+from readme_credly_badges.utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """Validators and parsed badges stored for one URL."""
+
+    url: str
+    sort_by: str
+    badges: list[Badge]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+
+    def is_fresh(self, ttl: int) -> bool:
+        """Whether the entry can be used without revalidating it with the server."""
+        return ttl > 0 and time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers asking the server to answer 304 if the resource did not change."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class JsonFileCache:
+    """
+    Persistent cache of JSON entries, one file per key, counting its hits and misses.
+    The counts are mirrored in the process metrics as ``<metric>_hits`` and ``<metric>_misses``.
+    The cache is safe to share between the threads of a batch run.
+    """
+
+    metric = ""
+    label = ""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _write(self, key: str, data: dict[str, Any]) -> None:
+        """Atomically write the entry stored for ``key`` to disk."""
+        write_atomic(self._path(key), json.dumps(data))
+
+    def record(self, hit: bool) -> None:
+        """Count a cache hit or miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.increment(f"{self.metric}_hits" if hit else f"{self.metric}_misses")
+
+    def log_stats(self) -> None:
+        """Log the hit and miss counts accumulated so far."""
+        logger.info(f"{self.label}: {self.hits} hits, {self.misses} misses.")
+
+
+class HttpCache(JsonFileCache):
+    """
+    Persistent cache of parsed Credly responses, one JSON file per URL.
+    Entries younger than ``ttl`` seconds are served without a request; older ones are revalidated.
+    """
+
+    metric = "credly_cache"
+    label = "Credly cache"
+
+    def __init__(self, directory: str, ttl: int = 0) -> None:
+        super().__init__(directory)
+        self.ttl = ttl
+
+    def get(self, url: str, sort_by: Optional[str]) -> Optional[CacheEntry]:
+        """Return the entry stored for ``url`` if it was sorted by ``sort_by`` (whatever its order if None)."""
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            data["badges"] = [Badge.from_dict(badge) for badge in data["badges"]]
+            entry = CacheEntry(**data)
+        except FileNotFoundError:
+            return None
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        return entry if entry.url == url and sort_by in (None, entry.sort_by) else None
+
+    def put(self, entry: CacheEntry) -> None:
+        """Atomically write an entry to disk."""
+        self._write(entry.url, self._serialize(entry))
+
+    @staticmethod
+    def _serialize(entry: CacheEntry) -> dict[str, Any]:
+        data = asdict(entry)
+        data["badges"] = [badge.to_dict() for badge in entry.badges]
+        return data
+
+
+@dataclass
+class ReadmeEntry:
+    """Decoded content, blob SHA and ETag stored for one file of a branch."""
+
+    target: str
+    etag: str
+    sha: str
+    content: str
+    stored_at: float = 0.0
+
+
+class ReadmeCache(JsonFileCache):
+    """
+    Persistent cache of the README files read from GitHub, one JSON file per ``repository@branch:path`` target.
+    Every read is revalidated with the stored ETag; a 304 answer is served from the cache without decoding
+    the file again, and does not count against the primary rate limit.
+    """
+
+    metric = "readme_cache"
+    label = "README cache"
+
+    def get(self, target: str) -> Optional[ReadmeEntry]:
+        """Return the entry stored for ``target``, if any."""
+        path = self._path(target)
+        try:
+            entry = ReadmeEntry(**json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable README cache entry {path}: {e}")
+            return None
+
+        return entry if entry.target == target else None
+
+    def put(self, entry: ReadmeEntry) -> None:
+        """Atomically write an entry to disk."""
+        self._write(entry.target, asdict(entry))
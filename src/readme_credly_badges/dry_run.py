@@ -0,0 +1,140 @@
+"""Dry-run mode: compute what an update would change without writing anything."""
+
+import difflib
+import json
+import logging
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+from readme_credly_badges.adapter.base import FileContent, ReadmeRepository
+from readme_credly_badges.markers import BadgeDiff, badge_ids
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """The change an update would make to one file."""
+
+    target: str
+    path: str
+    diff: str
+    added: list[str]
+    removed: list[str]
+    bytes_changed: int
+
+    @classmethod
+    def between(cls, target: str, path: str, old: str, new: str) -> "FileChange":
+        """Describe the change from ``old`` to ``new``, with badges identified by their Credly IDs."""
+        diff = "".join(
+            difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True), f"a/{path}", f"b/{path}")
+        )
+        badge_diff = BadgeDiff.between(badge_ids(old), badge_ids(new))
+        return cls(
+            target=target,
+            path=path,
+            diff=diff,
+            added=list(badge_diff.added),
+            removed=list(badge_diff.removed),
+            bytes_changed=len(new.encode("utf-8")) - len(old.encode("utf-8")),
+        )
+
+    @classmethod
+    def binary(cls, target: str, path: str, new: bytes) -> "FileChange":
+        """Describe the change of a binary file, such as a badge image, which has no line diff."""
+        return cls(
+            target=target,
+            path=path,
+            diff=f"Binary files a/{path} and b/{path} differ\n",
+            added=[],
+            removed=[],
+            bytes_changed=len(new),
+        )
+
+    @classmethod
+    def deleted(cls, target: str, path: str) -> "FileChange":
+        """Describe the deletion of a binary file, such as the image of a badge that is no longer shown."""
+        return cls(
+            target=target,
+            path=path,
+            diff=f"Binary files a/{path} and /dev/null differ\n",
+            added=[],
+            removed=[],
+            bytes_changed=0,
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """JSON-serializable summary of the change, without the diff itself."""
+        return {
+            "target": self.target,
+            "added": self.added,
+            "removed": self.removed,
+            "bytes_changed": self.bytes_changed,
+        }
+
+
+class PreviewRepository:
+    """
+    Wrap a README backend so that reads go through to it and writes are only recorded as ``changes``.
+    Files that could not be read (such as generated files that do not exist yet) are diffed against
+    an empty file.
+    """
+
+    def __init__(self, repository: ReadmeRepository) -> None:
+        self.repository = repository
+        self.readme_filename = repository.readme_filename
+        self.changes: list[FileChange] = []
+        self._read: dict[str, str] = {}
+
+    @property
+    def target(self) -> str:
+        return self.repository.target
+
+    def target_for(self, path: str) -> str:
+        return self.repository.target_for(path)
+
+    def get_file(self, path: str) -> str:
+        content = self.repository.get_file(path)
+        self._read[path] = content
+        return content
+
+    def file_shas(self, directory: str) -> dict[str, str]:
+        return self.repository.file_shas(directory)
+
+    def save_files(self, files: dict[str, FileContent], message_body: str = "", deletions: Sequence[str] = ()) -> None:
+        if message_body:
+            logger.info(f"Dry run: the commit message would list:\n{message_body}")
+        for path, content in files.items():
+            if isinstance(content, bytes):
+                self.changes.append(FileChange.binary(self.target_for(path), path, content))
+                logger.info(f"Dry run: {self.target_for(path)} would be written ({len(content)} bytes).")
+                continue
+            change = FileChange.between(self.target_for(path), path, self._read.get(path, ""), content)
+            logger.info(
+                f"Dry run: {change.target} would change by {change.bytes_changed:+d} bytes "
+                f"({len(change.added)} badges added, {len(change.removed)} removed)."
+            )
+            self.changes.append(change)
+        for path in deletions:
+            self.changes.append(FileChange.deleted(self.target_for(path), path))
+            logger.info(f"Dry run: {self.target_for(path)} would be deleted.")
+
+    def get_readme(self) -> str:
+        return self.get_file(self.readme_filename)
+
+    def save_readme(self, new_content: str) -> None:
+        self.save_files({self.readme_filename: new_content})
+
+
+def write_report(changes: Sequence[FileChange], report_path: str = "", out: Optional[TextIO] = None) -> None:
+    """Print the unified diff of the changes, and write their JSON summary to ``report_path`` (or log it)."""
+    (out or sys.stdout).write("".join(change.diff for change in changes))
+    summary = json.dumps([change.summary() for change in changes], indent=2)
+    if report_path:
+        Path(report_path).write_text(summary, encoding="utf-8")
+        logger.info(f"Dry-run report written to {report_path}.")
+    else:
+        logger.info(f"Dry-run report: {summary}")
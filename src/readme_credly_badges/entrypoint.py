@@ -1,73 +1,273 @@
 """Entry Point for the application."""
 
 import logging
+import os
+import tempfile
+from collections.abc import Sequence
+from typing import Optional
 
-from readme_credly_badges.adapter import Credly, GithubRepo
+from readme_credly_badges.adapter import Credly, GithubRepo, GraphQLClient, GraphQLRepo, LocalRepo, ReadmeRepository
+from readme_credly_badges.adapter.base import FileContent, WriteConflictError
+from readme_credly_badges.cache import HttpCache, ReadmeCache
+from readme_credly_badges.dry_run import PreviewRepository, write_report
+from readme_credly_badges.fingerprint import FingerprintStore, badge_fingerprint
+from readme_credly_badges.http_session import create_session
+from readme_credly_badges.images import ImageStore
+from readme_credly_badges.markers import BadgeDiff, badge_ids, linked_ids, replace_blocks, update_blocks
+from readme_credly_badges.metrics import export_metrics, metrics
+from readme_credly_badges.models import Badge
+from readme_credly_badges.renderers import BlockOptions, ImageLoader, file_format, render
 from readme_credly_badges.settings import (
+    BADGE_COLUMNS,
+    BADGE_FORMAT,
+    BADGE_IMAGE_DIR,
     BADGE_SIZE,
+    BADGE_SORT_BY,
     COMMIT_MESSAGE,
+    CREDLY_CACHE_DIR,
+    CREDLY_CACHE_TTL,
     CREDLY_USERNAME,
+    DRY_RUN,
+    DRY_RUN_REPORT,
+    FINGERPRINT_FILE,
     GITHUB_API_URL,
     GITHUB_BRANCH,
     GITHUB_REPO,
     GITHUB_TOKEN,
-    README_FILE,
+    LOCAL_GIT_PUSH,
+    LOCAL_REPO_PATH,
+    README_CACHE_DIR,
+    README_FILES,
+    REPO_BACKEND,
+    REPO_BACKENDS,
 )
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
-def generate_new_readme_content(badges: list[dict[str, str]], old_readme_content: str) -> str:
+def generate_new_readme_content(badges: list[Badge], old_readme_content: str) -> str:
     """
-    Replace the Credly badges section in the old README content.
+    Replace every Credly badges section in the old README content.
     Raises ValueError if the badge comment markers are not found.
     """
-    start_comment = "<!-- START CREDLY BADGES -->"
-    end_comment = "<!-- END CREDLY BADGES -->"
-
-    if start_comment not in old_readme_content or end_comment not in old_readme_content:
-        logger.error("Credly badge section markers not found in README.")
-        raise ValueError("Credly badge section markers not found in README.")
-
-    markdown_badges = "\n".join(
-        f"[![{badge['name']}]({badge['image_url']})]({badge['url']})" for badge in badges
-    ).replace(
-        "https://images.credly.com/images/",
-        f"https://images.credly.com/size/{BADGE_SIZE}/images/",
-    )
+    try:
+        return replace_blocks(old_readme_content, badges)
+    except ValueError as e:
+        logger.error(str(e))
+        raise
 
-    before = old_readme_content.split(start_comment)[0]
-    after = old_readme_content.split(end_comment)[1]
 
-    return f"{before}{start_comment}\n{markdown_badges}\n{end_comment}{after}"
+def generate_file_changes(
+    path: str, badges: list[Badge], old_content: str, images: Optional[ImageLoader] = None
+) -> tuple[str, BadgeDiff]:
+    """
+    Render the new content of a file, and diff the badges it shows against those of the old content:
+    JSON and SVG files are generated as a whole from the badges, markdown files get their badge sections
+    replaced. An unchanged markdown file is returned as the same string, so comparing it costs nothing.
+    The images embedded in SVG files are fetched with ``images``, or downloaded if it is not given.
+    """
+    badge_format = file_format(path)
+    if badge_format is None:
+        try:
+            return update_blocks(old_content, badges)
+        except ValueError as e:
+            logger.error(str(e))
+            raise
+    diff = BadgeDiff.between(badge_ids(old_content), linked_ids(badges))
+    return render(badges, BlockOptions(format=badge_format), images), diff
 
 
-def main() -> None:
-    "Main function to update the README with Credly badges."
-    logger.info("Starting the README update process with Credly badges.")
-    if not (CREDLY_USERNAME and GITHUB_TOKEN and GITHUB_REPO):
-        logger.error("Environment variables CREDLY_USERNAME, GITHUB_TOKEN, and GITHUB_REPO must be set.")
-        raise ValueError("Environment variables CREDLY_USERNAME, GITHUB_TOKEN, and GITHUB_REPO must be set.")
+def generate_file_content(path: str, badges: list[Badge], old_content: str) -> str:
+    """Render the new content of a file; see ``generate_file_changes``."""
+    return generate_file_changes(path, badges, old_content)[0]
+
+
+def badge_names(badges: list[Badge]) -> dict[str, str]:
+    """Names of the badges by the ID linked from their block."""
+    return {ids[0]: badge.name for badge in badges if (ids := badge_ids(badge.url))}
+
+
+def update_fingerprint(badges: list[Badge], images: Optional[ImageStore] = None) -> str:
+    """
+    Fingerprint recorded for the files of an update: the badges together with every setting that changes how
+    they are rendered, so that changing the format, columns, sort order, size or image directory rewrites them.
+    """
+    options = [BADGE_FORMAT, str(BADGE_COLUMNS), BADGE_SORT_BY, *([images.directory] if images else [])]
+    return badge_fingerprint(badges, BADGE_SIZE, *options)
+
+
+def update_readme(
+    credly: Credly,
+    github_repo: ReadmeRepository,
+    fingerprints: Optional[FingerprintStore] = None,
+    paths: Optional[Sequence[str]] = None,
+    images: Optional[ImageStore] = None,
+) -> bool:
+    """
+    Run the fetch, render and save pipeline for a single profile.
+    Every file in ``paths`` (the backend's README by default) is regenerated and all changed files are
+    saved in a single commit; generated JSON and SVG files are created if they do not exist yet.
+    Files whose badge fingerprint matches the one recorded locally are not even read.
+    With ``images``, markdown files reference badge images committed in the same repository, and the
+    images that are new or changed are committed together with them.
+    The commit message lists the badges added and removed by the update.
+    If the files changed on the branch since they were read, they are read and rendered once more so that
+    the other change is kept.
+    Returns True if any file was updated, False if all were already up to date.
+    """
+    badges = credly.fetch_badges()
+    try:
+        return _update_files(github_repo, badges, fingerprints, paths, images)
+    except WriteConflictError as e:
+        logger.warning(f"{e} Reading the files again to render the badges on top of the other change.")
+        metrics.increment("write_conflicts")
+        return _update_files(github_repo, badges, fingerprints, paths, images)
 
-    credly = Credly(username=CREDLY_USERNAME)
-    github_repo = GithubRepo(
+
+def _update_files(
+    github_repo: ReadmeRepository,
+    badges: list[Badge],
+    fingerprints: Optional[FingerprintStore] = None,
+    paths: Optional[Sequence[str]] = None,
+    images: Optional[ImageStore] = None,
+) -> bool:
+    """Read, render and save the files of ``update_readme`` once; raises ``WriteConflictError`` on a conflict."""
+    fingerprint = update_fingerprint(badges, images)
+    checked = []
+    changes: dict[str, FileContent] = {}
+    diff = BadgeDiff()
+    deletions: list[str] = []
+    localized = False
+    for path in paths or [github_repo.readme_filename]:
+        target = github_repo.target_for(path)
+        if fingerprints and fingerprints.get(target) == fingerprint:
+            logger.info(f"Credly badges unchanged since the last update; skipping {path}.")
+            metrics.increment("fingerprint_skips")
+            continue
+
+        try:
+            with metrics.span("readme_fetch", target=target):
+                old_content = github_repo.get_file(path)
+        except FileNotFoundError:
+            if file_format(path) is None:
+                raise
+            old_content = ""
+        file_badges = badges
+        if images and file_format(path) is None:
+            file_badges = images.localize(badges, path)
+            localized = True
+        with metrics.span("render", target=target):
+            new_content, file_diff = generate_file_changes(
+                path, file_badges, old_content, images.load if images else None
+            )
+        if new_content != old_content:
+            changes[path] = new_content
+            diff |= file_diff
+        checked.append(target)
+
+    if images and localized:
+        with metrics.span("images", target=github_repo.target):
+            existing = github_repo.file_shas(images.directory)
+            changes.update(images.files(badges, existing))
+            deletions = images.stale(badges, existing)
+
+    if changes or deletions:
+        with metrics.span("write", target=github_repo.target, files=", ".join([*changes, *deletions])):
+            github_repo.save_files(changes, message_body=diff.describe(badge_names(badges)), deletions=deletions)
+        logger.info("README updated with new Credly badges.")
+    elif checked:
+        logger.info("README is already up to date.")
+
+    if fingerprints:
+        for target in checked:
+            fingerprints.set(target, fingerprint)
+    return bool(changes or deletions)
+
+
+def open_repository() -> ReadmeRepository:
+    """Create the README backend selected by ``REPO_BACKEND``: ``api`` (REST), ``graphql`` or ``local``."""
+    if REPO_BACKEND not in REPO_BACKENDS:
+        message = f"Invalid REPO_BACKEND: {REPO_BACKEND}. Use {', '.join(map(repr, REPO_BACKENDS))}."
+        logger.error(message)
+        raise ValueError(message)
+
+    if REPO_BACKEND == "local":
+        return LocalRepo(
+            commit_message=COMMIT_MESSAGE,
+            path=LOCAL_REPO_PATH,
+            branch=GITHUB_BRANCH,
+            readme_filename=README_FILES[0],
+            push=LOCAL_GIT_PUSH,
+        )
+
+    if not (GITHUB_TOKEN and GITHUB_REPO):
+        logger.error("Environment variables GITHUB_TOKEN and GITHUB_REPO must be set.")
+        raise ValueError("Environment variables GITHUB_TOKEN and GITHUB_REPO must be set.")
+
+    if REPO_BACKEND == "graphql":
+        return GraphQLRepo(
+            commit_message=COMMIT_MESSAGE,
+            client=GraphQLClient(GITHUB_API_URL, GITHUB_TOKEN),
+            repository=GITHUB_REPO,
+            branch=GITHUB_BRANCH,
+            readme_filename=README_FILES[0],
+        )
+
+    return GithubRepo(
         commit_message=COMMIT_MESSAGE,
         gh_api_url=GITHUB_API_URL,
         gh_token=GITHUB_TOKEN,
         repository=GITHUB_REPO,
         branch=GITHUB_BRANCH,
-        readme_filename=README_FILE,
+        readme_filename=README_FILES[0],
+        readme_cache=ReadmeCache(os.path.join(CREDLY_CACHE_DIR, README_CACHE_DIR)) if CREDLY_CACHE_DIR else None,
     )
-    badges = credly.fetch_badges()
-    old_readme_content = github_repo.get_readme()
-    new_readme_content = generate_new_readme_content(badges=badges, old_readme_content=old_readme_content)
 
-    if new_readme_content.strip() != old_readme_content.strip():
-        github_repo.save_readme(new_content=new_readme_content)
-        logger.info("README updated with new Credly badges.")
+
+def open_image_store() -> ImageStore:
+    """
+    Create the store of the badge images committed under ``BADGE_IMAGE_DIR``.
+    Images are cached under ``CREDLY_CACHE_DIR`` so that later runs do not download them again; without it they
+    go to a temporary directory and every run downloads them all.
+    """
+    if CREDLY_CACHE_DIR:
+        cache_dir = os.path.join(CREDLY_CACHE_DIR, "images")
     else:
-        logger.info("README is already up to date.")
+        cache_dir = tempfile.mkdtemp(prefix="credly-")
+        logger.info("CREDLY_CACHE_DIR is not set: badge images are downloaded again on every run.")
+    return ImageStore(cache_dir, BADGE_IMAGE_DIR, size=BADGE_SIZE, session=create_session())
+
+
+def main() -> None:
+    "Main function to update the README with Credly badges."
+    logger.info("Starting the README update process with Credly badges.")
+    if not CREDLY_USERNAME:
+        logger.error("Environment variable CREDLY_USERNAME must be set.")
+        raise ValueError("Environment variable CREDLY_USERNAME must be set.")
+
+    cache = HttpCache(CREDLY_CACHE_DIR, ttl=CREDLY_CACHE_TTL) if CREDLY_CACHE_DIR else None
+    fingerprints = FingerprintStore(os.path.join(CREDLY_CACHE_DIR, FINGERPRINT_FILE)) if CREDLY_CACHE_DIR else None
+    credly = Credly(username=CREDLY_USERNAME, cache=cache)
+    github_repo = open_repository()
+    images = open_image_store() if BADGE_IMAGE_DIR else None
+    try:
+        if DRY_RUN:
+            preview = PreviewRepository(github_repo)
+            update_readme(credly=credly, github_repo=preview, paths=README_FILES, images=images)
+            write_report(preview.changes, DRY_RUN_REPORT)
+        else:
+            update_readme(
+                credly=credly, github_repo=github_repo, fingerprints=fingerprints, paths=README_FILES, images=images
+            )
+    finally:
+        # Timings matter most for the runs that fail or time out
+        export_metrics()
+
+    if cache:
+        cache.log_stats()
+    if fingerprints:
+        fingerprints.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+"""Stable fingerprints of rendered badge sets, used to skip runs where nothing changed."""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+from readme_credly_badges.models import Badge
+from readme_credly_badges.settings import BADGE_SIZE
+from readme_credly_badges.utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_PATTERN = re.compile(r"<!-- CREDLY BADGES FINGERPRINT: ([0-9a-f]+) -->\n?")
+
+
+def badge_fingerprint(badges: Sequence[Badge], badge_size: str = BADGE_SIZE, *options: str) -> str:
+    """Hash the ordered badge list together with the options that affect how it is rendered."""
+    normalized = [[badge.name, badge.url, badge.image_url] for badge in badges]
+    fields: dict[str, object] = {"badges": normalized, "size": badge_size}
+    if options:
+        fields["options"] = options
+    payload = json.dumps(fields, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint_comment(fingerprint: str) -> str:
+    """HTML comment embedding a fingerprint in the generated badge block."""
+    return f"<!-- CREDLY BADGES FINGERPRINT: {fingerprint} -->"
+
+
+def read_fingerprint(content: str) -> Optional[str]:
+    """Return the fingerprint embedded in a README, if any."""
+    match = FINGERPRINT_PATTERN.search(content)
+    return match.group(1) if match else None
+
+
+def strip_fingerprint(content: str) -> str:
+    """Remove embedded fingerprints so READMEs can be compared on their visible content."""
+    return FINGERPRINT_PATTERN.sub("", content)
+
+
+class FingerprintStore:
+    """
+    Local record of the badge fingerprint last written to each README target, kept in a JSON file.
+    Changes are held in memory until ``save`` is called; the store is safe to share between threads.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._fingerprints = self._load()
+
+    def _load(self) -> dict[str, str]:
+        """Read the fingerprints recorded in the store's file, starting empty if it is missing or unreadable."""
+        try:
+            fingerprints: dict[str, str] = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable fingerprint store {self.path}: {e}")
+            return {}
+        return fingerprints
+
+    def get(self, target: str) -> Optional[str]:
+        """Return the fingerprint last recorded for ``target``."""
+        with self._lock:
+            return self._fingerprints.get(target)
+
+    def set(self, target: str, fingerprint: str) -> None:
+        """Record the fingerprint now shown by ``target``."""
+        with self._lock:
+            if self._fingerprints.get(target) != fingerprint:
+                self._fingerprints[target] = fingerprint
+                self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the store to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            write_atomic(self.path, json.dumps(self._fingerprints, indent=2, sort_keys=True))
+            self._dirty = False
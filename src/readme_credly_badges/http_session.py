@@ -0,0 +1,45 @@
+"""Pooled HTTP session with keep-alive and retries, shared by the Credly requests of a run."""
+
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from readme_credly_badges.metrics import metrics
+from readme_credly_badges.settings import CREDLY_BACKOFF, CREDLY_POOL_SIZE, CREDLY_RETRIES
+
+# Transient statuses worth retrying; for 429 and 503 a ``Retry-After`` header overrides the backoff delay
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(
+    pool_size: int = CREDLY_POOL_SIZE,
+    retries: int = CREDLY_RETRIES,
+    backoff: float = CREDLY_BACKOFF,
+) -> requests.Session:
+    """
+    Create a session keeping up to ``pool_size`` connections per host alive between requests.
+    Failed connections and transient statuses are retried up to ``retries`` times, waiting
+    ``backoff * 2 ** (attempt - 1)`` seconds plus up to ``backoff`` seconds of random jitter,
+    or as long as the server's ``Retry-After`` header asks.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        backoff_jitter=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(_count_response)
+    return session
+
+
+def _count_response(_response: requests.Response, *_args: Any, **_kwargs: Any) -> None:
+    metrics.increment("credly_http_requests")
@@ -0,0 +1,155 @@
+"""Badge images downloaded once, resized locally and committed next to the README."""
+
+import hashlib
+import io
+import json
+import logging
+import posixpath
+import threading
+from collections.abc import Mapping, Sequence
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from readme_credly_badges.adapter.base import blob_sha
+from readme_credly_badges.metrics import metrics
+from readme_credly_badges.models import Badge
+from readme_credly_badges.settings import BADGE_SIZE
+from readme_credly_badges.utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+
+
+def resize_image(data: bytes, size: str) -> bytes:
+    """Scale an image to fit in ``size`` (``WIDTHxHEIGHT``), keeping its aspect ratio, and encode it as PNG."""
+    try:
+        from PIL import Image, ImageOps  # noqa: PLC0415
+    except ImportError as e:
+        raise ImportError("Pillow is required to resize badge images: pip install pillow") from e
+
+    width, height = (int(value) for value in size.split("x"))
+    with Image.open(io.BytesIO(data)) as image:
+        resized = ImageOps.contain(image.convert("RGBA"), (width, height), Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    resized.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+class ImageStore:
+    """
+    Content-addressed cache of badge images on disk, and the repository files they are committed as.
+    Originals are stored under the SHA-256 of their bytes, with an index mapping each image URL to its hash,
+    so an image is downloaded once whatever the number of runs, profiles or sizes using it.
+    Resized copies are cached next to the original they were made from.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        directory: str,
+        size: str = BADGE_SIZE,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.directory = directory.strip("/")
+        self.size = size
+        self.session = session or requests.Session()
+        self._lock = threading.Lock()
+        try:
+            self._index: dict[str, str] = json.loads((self.cache_dir / INDEX_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self._index = {}
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable image index {self.cache_dir / INDEX_FILE}: {e}")
+            self._index = {}
+
+    def _download(self, url: str) -> str:
+        """Download an image into the cache and return its SHA-256."""
+        logger.info(f"Downloading badge image {url}")
+        try:
+            with metrics.span("image_download"):
+                response = self.session.get(url, timeout=60)
+                response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to download badge image {url}: {e}")
+            raise ConnectionError(f"Failed to download badge image {url}") from e
+        digest = hashlib.sha256(response.content).hexdigest()
+        write_atomic(self.cache_dir / digest, response.content)
+        with self._lock:
+            self._index[url] = digest
+            write_atomic(self.cache_dir / INDEX_FILE, json.dumps(self._index, indent=2, sort_keys=True))
+        return digest
+
+    def original(self, url: str) -> tuple[str, bytes]:
+        """SHA-256 and bytes of an image, downloaded only if the cache does not hold it yet."""
+        with self._lock:
+            digest = self._index.get(url)
+        if digest:
+            try:
+                data = (self.cache_dir / digest).read_bytes()
+            except FileNotFoundError:
+                pass
+            else:
+                metrics.increment("image_cache_hits")
+                return digest, data
+        metrics.increment("image_cache_misses")
+        digest = self._download(url)
+        return digest, (self.cache_dir / digest).read_bytes()
+
+    def load(self, url: str) -> bytes:
+        """Bytes of an image, as ``original`` caches them; an ``ImageLoader`` for the images embedded in SVG files."""
+        return self.original(url)[1]
+
+    def resized(self, url: str) -> bytes:
+        """An image resized to ``size``, resized only once per original and size."""
+        digest, data = self.original(url)
+        path = self.cache_dir / f"{digest}-{self.size}.png"
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+        with metrics.span("image_resize"):
+            resized = resize_image(data, self.size)
+        write_atomic(path, resized)
+        return resized
+
+    def path_for(self, badge: Badge) -> str:
+        """Repository path a badge image is committed as."""
+        name = badge.id or hashlib.sha256(badge.image_url.encode("utf-8")).hexdigest()[:16]
+        return f"{self.directory}/{name}.png"
+
+    def files(self, badges: Sequence[Badge], existing: Mapping[str, str]) -> dict[str, bytes]:
+        """
+        The images of ``badges`` to commit, by repository path.
+        Images whose git blob SHA matches the one in ``existing`` (path to blob SHA) are already up to date
+        and left out.
+        """
+        files = {}
+        for badge in badges:
+            path = self.path_for(badge)
+            data = self.resized(badge.image_url)
+            if existing.get(path) != blob_sha(data):
+                files[path] = data
+        if len(files) < len(badges):
+            logger.info(f"{len(badges) - len(files)} badge images are already up to date.")
+        return files
+
+    def stale(self, badges: Sequence[Badge], existing: Mapping[str, str]) -> list[str]:
+        """
+        The images in ``existing`` (path to blob SHA) that none of ``badges`` uses any more, such as those of
+        badges removed from the profile, to delete together with the files committed for ``badges``.
+        """
+        used = {self.path_for(badge) for badge in badges}
+        stale = sorted(path for path in existing if path.endswith(".png") and path not in used)
+        if stale:
+            logger.info(f"{len(stale)} badge images are no longer used and will be deleted.")
+        return stale
+
+    def localize(self, badges: Sequence[Badge], readme_path: str) -> list[Badge]:
+        """The badges with their image URL replaced by the path of the committed image, relative to a README."""
+        base = posixpath.dirname(readme_path) or "."
+        return [replace(badge, image_url=posixpath.relpath(self.path_for(badge), base)) for badge in badges]
@@ -0,0 +1,36 @@
+"""Jobs of batch mode and their outcomes, shared by the thread pool and asyncio engines."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from readme_credly_badges.dry_run import FileChange
+from readme_credly_badges.settings import COMMIT_MESSAGE, GITHUB_BRANCH, README_FILES
+
+STATUS_UPDATED = "updated"
+STATUS_UNCHANGED = "unchanged"
+STATUS_FAILED = "failed"
+# Already finished by the interrupted run being resumed
+STATUS_SKIPPED = "skipped"
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """A single Credly profile to render into the files of a repository, committed together."""
+
+    credly_username: str
+    github_repo: str
+    github_branch: str = GITHUB_BRANCH
+    readme_files: tuple[str, ...] = tuple(README_FILES)
+    commit_message: str = COMMIT_MESSAGE
+
+
+@dataclass
+class JobResult:
+    """Outcome of running one batch job."""
+
+    job: BatchJob
+    status: str
+    duration: float
+    error: Optional[str] = None
+    # Changes the job would make, only set in dry-run mode
+    changes: Optional[list[FileChange]] = None
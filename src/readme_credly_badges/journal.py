@@ -0,0 +1,102 @@
+"""Append-only journal of batch runs, to resume an interrupted run and skip targets already up to date."""
+
+import json
+import logging
+import os
+import secrets
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from readme_credly_badges.fingerprint import FingerprintStore
+
+logger = logging.getLogger(__name__)
+
+# Statuses of a target that needs no more work in the run that recorded it
+FINISHED_STATUSES = ("updated", "unchanged")
+
+
+class Journal(FingerprintStore):
+    """
+    Durable record of the outcome of every target of a batch run, one JSON line per target, appended and
+    synced to disk as soon as the target is done, so a crash loses at most the targets in flight.
+    Each line holds the run ID, target, status, badge fingerprint and README blob SHA.
+
+    The journal is also the fingerprint store of the run: the last fingerprint recorded for a target is
+    replayed when the journal is opened, so a new run skips the targets whose badges did not change.
+    With ``resume``, the last run recorded in the journal is continued instead of starting a new one,
+    and ``finished`` tells which of its targets are already done.
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        self.shas: dict[str, str] = {}
+        self._runs: dict[str, dict[str, str]] = {}
+        self._last_run: Optional[str] = None
+        super().__init__(path)
+        self.resumed = resume and self._last_run is not None
+        self.run_id = self._last_run if resume and self._last_run else secrets.token_hex(8)
+        if self.resumed:
+            logger.info(f"Resuming run {self.run_id}: {len(self._finished())} targets already finished.")
+
+    def _load(self) -> dict[str, str]:
+        """Replay the journal: the runs and statuses, and the last fingerprint and SHA of each target."""
+        fingerprints = {}
+        for record in self._replay():
+            target = record["target"]
+            self._runs.setdefault(record["run"], {})[target] = record["status"]
+            self._last_run = record["run"]
+            if record.get("fingerprint"):
+                fingerprints[target] = record["fingerprint"]
+            if record.get("sha"):
+                self.shas[target] = record["sha"]
+        return fingerprints
+
+    def _replay(self) -> list[dict[str, Any]]:
+        """Read the records of the journal, skipping a line left incomplete by a crash."""
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        records = [self._parse(line, number) for number, line in enumerate(lines, 1)]
+        return [record for record in records if record is not None]
+
+    def _parse(self, line: str, number: int) -> Optional[dict[str, Any]]:
+        try:
+            record: dict[str, Any] = json.loads(line)
+        except ValueError:
+            logger.warning(f"Ignoring unreadable line {number} of journal {self.path}.")
+            return None
+        return record
+
+    def _finished(self) -> set[str]:
+        statuses = self._runs.get(self.run_id, {})
+        return {target for target, status in statuses.items() if status in FINISHED_STATUSES}
+
+    def finished(self, target: str) -> bool:
+        """Whether ``target`` was already updated or found up to date in the current run."""
+        with self._lock:
+            return self._runs.get(self.run_id, {}).get(target) in FINISHED_STATUSES
+
+    def record(self, target: str, status: str, sha: Optional[str] = None, error: Optional[str] = None) -> None:
+        """Append the outcome of a target, with its current fingerprint, and sync it to disk."""
+        with self._lock:
+            sha = sha or self.shas.get(target)
+            record = {
+                "run": self.run_id,
+                "target": target,
+                "status": status,
+                "fingerprint": self._fingerprints.get(target),
+                "sha": sha,
+                "error": error,
+                "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as journal:
+                journal.write(json.dumps(record, sort_keys=True) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._runs.setdefault(self.run_id, {})[target] = status
+            if sha:
+                self.shas[target] = sha
+
+    def save(self) -> None:
+        """Nothing to do: every record is written as soon as it is made."""
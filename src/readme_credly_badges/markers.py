@@ -0,0 +1,208 @@
+"""Credly badge blocks in markdown files, each rendered with the options written in its START marker."""
+
+import logging
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+from readme_credly_badges.fingerprint import fingerprint_comment, read_fingerprint, strip_fingerprint
+from readme_credly_badges.models import CREDLY_BASE_URL, Badge
+from readme_credly_badges.renderers import BlockOptions, render
+from readme_credly_badges.settings import BADGE_COLUMNS, BADGE_FORMAT, BADGE_SIZE
+from readme_credly_badges.utils import parse_sort_fields, sort_badges
+
+logger = logging.getLogger(__name__)
+
+# ``<!-- START CREDLY BADGES -->`` (optionally with options: ``<!-- START CREDLY BADGES size=110x110 limit=6 -->``)
+# and ``<!-- END CREDLY BADGES -->``, found in a single scan of the document. Keeping the ``<!-- `` prefix outside
+# the alternation lets the regex engine skip ahead with a fast literal search instead of trying every offset.
+MARKER_PATTERN = re.compile(
+    r"<!-- (?:(?P<start>START CREDLY BADGES(?P<options>(?:\s+[^\s>]+)*)\s*-->)|(?P<end>END CREDLY BADGES -->))"
+)
+SIZE_PATTERN = re.compile(r"^\d+x\d+$")
+BADGE_URL_PATTERN = re.compile(re.escape(CREDLY_BASE_URL) + r"/badges/([\w-]+)")
+
+# Formats that can be embedded in a markdown document; the others are only used for generated files
+BLOCK_FORMATS = ("markdown", "html")
+
+
+def parse_options(text: str) -> BlockOptions:
+    """
+    Parse the ``key=value`` options of a START marker.
+    Raises ValueError on unknown keys or invalid values.
+    """
+    values: dict[str, str] = {}
+    for item in text.split():
+        key, _, value = item.partition("=")
+        if key not in {"size", "limit", "format", "columns", "sort"} or not value:
+            raise ValueError(
+                f"Invalid Credly badge block option: {item}. "
+                "Use 'size=WxH', 'limit=N', 'format=F', 'columns=N' or 'sort=FIELDS'."
+            )
+        values[key] = value
+
+    size = values.get("size", BADGE_SIZE)
+    if not SIZE_PATTERN.match(size):
+        raise ValueError(f"Invalid Credly badge block size: {size}. Use WIDTHxHEIGHT, e.g. 110x110.")
+
+    limit = values.get("limit")
+    if limit is not None and not limit.isdigit():
+        raise ValueError(f"Invalid Credly badge block limit: {limit}. Use a non-negative integer.")
+
+    badge_format = values.get("format", BADGE_FORMAT)
+    if badge_format not in BLOCK_FORMATS:
+        raise ValueError(f"Invalid Credly badge block format: {badge_format}. Use 'markdown' or 'html'.")
+
+    columns = values.get("columns", str(BADGE_COLUMNS))
+    if not columns.isdigit() or int(columns) < 1:
+        raise ValueError(f"Invalid Credly badge block columns: {columns}. Use a positive integer.")
+
+    sort = values.get("sort")
+    if sort is not None:
+        parse_sort_fields(sort)
+
+    return BlockOptions(
+        size=size,
+        limit=None if limit is None else int(limit),
+        format=badge_format,
+        columns=int(columns),
+        sort=sort,
+    )
+
+
+def select_badges(badges: list[Badge], options: BlockOptions) -> list[Badge]:
+    """The badges shown by a block, in display order: sorted by the block's own fields if it has any, then limited."""
+    if options.sort:
+        badges = sort_badges(badges, options.sort)
+    return badges if options.limit is None else badges[: options.limit]
+
+
+def render_block(badges: list[Badge], options: BlockOptions) -> str:
+    """Render the content placed between the markers of a block, fingerprint comment included."""
+    return f"{fingerprint_comment(options.fingerprint(badges))}\n{render(badges, options)}"
+
+
+def badge_ids(content: str) -> list[str]:
+    """IDs of the Credly badges linked from a document, in order of first appearance."""
+    return list(dict.fromkeys(BADGE_URL_PATTERN.findall(content)))
+
+
+def linked_ids(badges: Iterable[Badge]) -> list[str]:
+    """IDs of badges as ``badge_ids`` reads them back from the rendered links, in order."""
+    return badge_ids("\n".join(badge.url for badge in badges))
+
+
+@dataclass(frozen=True)
+class BadgeDiff:
+    """Badges added to and removed from a block or file, by Credly ID, and whether the others changed order."""
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    reordered: bool = False
+
+    @classmethod
+    def between(cls, old_ids: Sequence[str], new_ids: Sequence[str]) -> "BadgeDiff":
+        old, new = set(old_ids), set(new_ids)
+        return cls(
+            added=tuple(badge_id for badge_id in new_ids if badge_id not in old),
+            removed=tuple(badge_id for badge_id in old_ids if badge_id not in new),
+            reordered=[badge_id for badge_id in old_ids if badge_id in new]
+            != [badge_id for badge_id in new_ids if badge_id in old],
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.reordered)
+
+    def __or__(self, other: "BadgeDiff") -> "BadgeDiff":
+        """Combined diff of several blocks or files, each badge listed once."""
+        return BadgeDiff(
+            added=tuple(dict.fromkeys(self.added + other.added)),
+            removed=tuple(dict.fromkeys(self.removed + other.removed)),
+            reordered=self.reordered or other.reordered,
+        )
+
+    def describe(self, names: Mapping[str, str]) -> str:
+        """Lines describing the diff in a commit message, naming badges by ``names`` (ID to name) when known."""
+        lines = []
+        if self.added:
+            lines.append("Added: " + ", ".join(names.get(badge_id, badge_id) for badge_id in self.added))
+        if self.removed:
+            lines.append("Removed: " + ", ".join(names.get(badge_id, badge_id) for badge_id in self.removed))
+        if self.reordered:
+            lines.append("Reordered badges.")
+        return "\n".join(lines)
+
+
+def _line_number(content: str, offset: int) -> int:
+    return content.count("\n", 0, offset) + 1
+
+
+def find_blocks(content: str) -> list[tuple[re.Match[str], int]]:
+    """
+    Locate every badge block in a single scan, as (START marker match, offset of its END marker) pairs.
+    Raises ValueError if the markers are missing, unbalanced or nested.
+    """
+    blocks = []
+    start: Optional[re.Match[str]] = None
+    for match in MARKER_PATTERN.finditer(content):
+        if match["start"] is not None:
+            if start is not None:
+                line = _line_number(content, match.start())
+                raise ValueError(f"Credly badge START marker on line {line} is inside another badge block.")
+            start = match
+        else:
+            if start is None:
+                line = _line_number(content, match.start())
+                raise ValueError(f"Credly badge END marker on line {line} has no matching START marker.")
+            blocks.append((start, match.start()))
+            start = None
+
+    if start is not None:
+        line = _line_number(content, start.start())
+        raise ValueError(f"Credly badge START marker on line {line} has no matching END marker.")
+    if not blocks:
+        raise ValueError("Credly badge section markers not found in README.")
+    return blocks
+
+
+def update_blocks(content: str, badges: list[Badge]) -> tuple[str, BadgeDiff]:
+    """
+    Regenerate every badge block of a markdown document, and diff the badges it shows against the old ones.
+    The output is assembled from slices of the input, so a document without changes is returned as is.
+    A block is kept exactly as it is when its embedded fingerprint matches its badges and options.
+    Otherwise the badge IDs linked from the block are compared with the new ones: a block showing other
+    badges, or the same ones in another order, is rewritten; a block showing the same badges is only
+    rewritten if it renders differently (its options or image URLs changed), ignoring the fingerprint comment.
+    Raises ValueError if the badge markers are missing or malformed.
+    """
+    parts = []
+    position = 0
+    diff = BadgeDiff()
+    changed = False
+    for start, end in find_blocks(content):
+        options = parse_options(start["options"])
+        shown = select_badges(badges, options)
+        block = content[start.end() : end]
+        if read_fingerprint(block) == options.fingerprint(shown):
+            continue
+
+        block_diff = BadgeDiff.between(badge_ids(block), linked_ids(shown))
+        rendered = f"\n{render_block(shown, options)}\n"
+        if block_diff or strip_fingerprint(rendered).strip() != strip_fingerprint(block).strip():
+            parts.append(content[position : start.end()])
+            parts.append(rendered)
+            position = end
+            diff |= block_diff
+            changed = True
+
+    if not changed:
+        return content, diff
+
+    parts.append(content[position:])
+    return "".join(parts), diff
+
+
+def replace_blocks(content: str, badges: list[Badge]) -> str:
+    """Regenerate every badge block of a markdown document; see ``update_blocks``."""
+    return update_blocks(content, badges)[0]
@@ -0,0 +1,207 @@
+"""Timing spans and counters of the pipeline stages, exported as logs, Prometheus, OTLP JSON or a job summary."""
+
+import json
+import logging
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from readme_credly_badges.settings import (
+    GITHUB_STEP_SUMMARY,
+    METRICS_JOB_SUMMARY,
+    METRICS_OTLP_FILE,
+    METRICS_PROMETHEUS_FILE,
+)
+from readme_credly_badges.utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_PREFIX = "readme_credly_badges"
+
+
+@dataclass
+class Span:
+    """One timed run of a pipeline stage."""
+
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, str] = field(default_factory=dict)
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class Metrics:
+    """
+    Thread-safe registry of the spans and counters of one process.
+    Stages are timed with ``span``; HTTP requests, bytes and cache hits are counted with ``increment``.
+    Each stage's totals are kept up to date as its spans end, so the spans themselves are only needed for the
+    OTLP trace and can be dropped once exported without losing the totals.
+    """
+
+    def __init__(self) -> None:
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self.counters: dict[str, int] = {}
+        self._stages: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: str) -> Iterator[Span]:
+        """Time the enclosed block as a run of the ``name`` stage, even if it raises."""
+        span = Span(name=name, start_ns=time.time_ns(), attributes=attributes)
+        started = time.perf_counter_ns()
+        try:
+            yield span
+        finally:
+            span.end_ns = span.start_ns + time.perf_counter_ns() - started
+            with self._lock:
+                self.spans.append(span)
+                stage = self._stages.setdefault(name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+                stage["calls"] += 1
+                stage["seconds"] += span.duration
+                stage["max_seconds"] = max(stage["max_seconds"], span.duration)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.trace_id = secrets.token_hex(16)
+            self.spans = []
+            self.counters = {}
+            self._stages = {}
+
+    def clear_spans(self) -> None:
+        """Drop the spans recorded so far, keeping the stage totals and counters they were counted in."""
+        with self._lock:
+            self.spans = []
+
+    def stages(self) -> dict[str, dict[str, float]]:
+        """Call count, total and maximum seconds of each stage, in order of first run."""
+        with self._lock:
+            return {name: dict(stage) for name, stage in self._stages.items()}
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable view of the stages and counters."""
+        stages = {
+            name: {key: round(value, 6) if key != "calls" else int(value) for key, value in stage.items()}
+            for name, stage in self.stages().items()
+        }
+        with self._lock:
+            counters = dict(sorted(self.counters.items()))
+        return {"stages": stages, "counters": counters}
+
+    def log(self) -> None:
+        """Log the snapshot as a single structured JSON line."""
+        logger.info(json.dumps({"event": "metrics", **self.snapshot()}, sort_keys=True))
+
+    def prometheus(self) -> str:
+        """The snapshot in the Prometheus text exposition format, for the node exporter textfile collector."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_stage_seconds_total Time spent in each pipeline stage.",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds_total counter",
+        ]
+        lines += [
+            f'{PROMETHEUS_PREFIX}_stage_seconds_total{{stage="{name}"}} {stage["seconds"]}'
+            for name, stage in snapshot["stages"].items()
+        ]
+        lines += [
+            f"# HELP {PROMETHEUS_PREFIX}_stage_calls_total Runs of each pipeline stage.",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_calls_total counter",
+        ]
+        lines += [
+            f'{PROMETHEUS_PREFIX}_stage_calls_total{{stage="{name}"}} {stage["calls"]}'
+            for name, stage in snapshot["stages"].items()
+        ]
+        for name, value in snapshot["counters"].items():
+            lines += [f"# TYPE {PROMETHEUS_PREFIX}_{name}_total counter", f"{PROMETHEUS_PREFIX}_{name}_total {value}"]
+        return "\n".join(lines) + "\n"
+
+    def otlp(self) -> dict[str, Any]:
+        """The spans as an OTLP/JSON trace export, readable by the OpenTelemetry collector's file receiver."""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [{"key": "service.name", "value": {"stringValue": "readme-credly-badges"}}]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [
+                                {
+                                    "traceId": self.trace_id,
+                                    "spanId": span.span_id,
+                                    "name": span.name,
+                                    "kind": 1,
+                                    "startTimeUnixNano": str(span.start_ns),
+                                    "endTimeUnixNano": str(span.end_ns),
+                                    "attributes": [
+                                        {"key": key, "value": {"stringValue": value}}
+                                        for key, value in span.attributes.items()
+                                    ],
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def job_summary(self) -> str:
+        """The snapshot as a markdown table for the GitHub Actions job summary."""
+        snapshot = self.snapshot()
+        lines = [
+            "### Credly badges timings",
+            "",
+            "| Stage | Calls | Total (s) | Max (s) |",
+            "| ----- | ----: | --------: | ------: |",
+        ]
+        lines += [
+            f"| {name} | {stage['calls']} | {stage['seconds']:.3f} | {stage['max_seconds']:.3f} |"
+            for name, stage in snapshot["stages"].items()
+        ]
+        if snapshot["counters"]:
+            lines += ["", "| Counter | Value |", "| ------- | ----: |"]
+            lines += [f"| {name} | {value} |" for name, value in snapshot["counters"].items()]
+        return "\n".join(lines) + "\n"
+
+    def export(self, prometheus_file: str = "", otlp_file: str = "", job_summary_file: str = "") -> None:
+        """Log the metrics, then write them to each configured destination."""
+        self.log()
+        if prometheus_file:
+            write_atomic(Path(prometheus_file), self.prometheus())
+            logger.info(f"Prometheus metrics written to {prometheus_file}.")
+        if otlp_file:
+            write_atomic(Path(otlp_file), json.dumps(self.otlp()) + "\n")
+            logger.info(f"OTLP trace written to {otlp_file}.")
+        if job_summary_file:
+            with open(job_summary_file, "a", encoding="utf-8") as summary:
+                summary.write(self.job_summary())
+
+
+# Shared by every stage of the process
+metrics = Metrics()
+
+
+def export_metrics(job_summary: bool = True) -> None:
+    """
+    Export the metrics of the process to the destinations configured in the environment.
+    The job summary, which is appended to rather than replaced, is left out if ``job_summary`` is False.
+    """
+    summary_file = GITHUB_STEP_SUMMARY if job_summary and METRICS_JOB_SUMMARY else ""
+    metrics.export(METRICS_PROMETHEUS_FILE, METRICS_OTLP_FILE, summary_file)
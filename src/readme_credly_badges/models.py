@@ -0,0 +1,88 @@
+"""Typed badge model shared by the fetch, sort, fingerprint and render steps."""
+
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CREDLY_BASE_URL = "https://www.credly.com"
+DATE_FIELDS = ("issued", "updated", "accepted")
+SORT_FIELDS = (*DATE_FIELDS, "name")
+# Slotted dataclasses need Python 3.10; on 3.9 badges keep a per-instance __dict__
+SLOTS: dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def parse_date(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, returning None if it is missing or invalid."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid badge date: {value}")
+        return None
+
+
+@dataclass(frozen=True, **SLOTS)
+class Badge:
+    """A Credly badge with its dates parsed once, when it is read."""
+
+    name: str
+    url: str
+    image_url: str
+    id: str = ""
+    issued_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    accepted_at: Optional[datetime] = None
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> Optional["Badge"]:
+        """Build a badge from a Credly API record, or return None if a required field is missing."""
+        badge_id = record.get("id")
+        badge_template = record.get("badge_template") or {}
+        name = badge_template.get("name")
+        image_url = badge_template.get("image_url")
+
+        # Ensure none of the fields are empty or missing
+        if not (badge_id and name and image_url):
+            logger.warning(f"Skipping incomplete badge: id={badge_id}, name={name}, image_url={image_url}")
+            return None
+
+        badge_id = badge_id.strip()
+        return cls(
+            name=name.strip(),
+            url=f"{CREDLY_BASE_URL}/badges/{badge_id}",
+            image_url=image_url.strip(),
+            id=badge_id,
+            issued_at=parse_date(record.get("issued_at")),
+            updated_at=parse_date(record.get("updated_at")),
+            accepted_at=parse_date(record.get("accepted_at")),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Badge":
+        """Inverse of ``to_dict``."""
+        return cls(
+            name=data["name"],
+            url=data["url"],
+            image_url=data["image_url"],
+            id=data.get("id", ""),
+            issued_at=parse_date(data.get("issued_at")),
+            updated_at=parse_date(data.get("updated_at")),
+            accepted_at=parse_date(data.get("accepted_at")),
+        )
+
+    def to_dict(self) -> dict[str, Optional[str]]:
+        """JSON-serializable form of the badge, with ISO 8601 dates."""
+        return {
+            "name": self.name,
+            "url": self.url,
+            "image_url": self.image_url,
+            "id": self.id,
+            "issued_at": self.issued_at.isoformat() if self.issued_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "accepted_at": self.accepted_at.isoformat() if self.accepted_at else None,
+        }
@@ -0,0 +1,125 @@
+"""Scheduling of GitHub API work within the primary and secondary rate limits."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Optional, Protocol, Union
+
+from github import Github, RateLimitExceededException
+
+from readme_credly_badges.settings import GITHUB_MIN_REMAINING, GITHUB_SECONDARY_PAUSE, GITHUB_WRITE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Protocol):
+    """A GitHub API client exposing the primary quota left, like PyGithub's ``Github``."""
+
+    @property
+    def rate_limiting(self) -> tuple[int, int]:
+        """Requests left and limit of the primary quota, negative until known."""
+
+    @property
+    def rate_limiting_resettime(self) -> int:
+        """Time the primary quota resets at, in seconds since the epoch."""
+
+
+def rate_limit_error(error: BaseException) -> Optional[RateLimitExceededException]:
+    """Return the rate limit error that caused ``error``, if any."""
+    current: Optional[BaseException] = error
+    while current is not None:
+        if isinstance(current, RateLimitExceededException):
+            return current
+        current = current.__cause__
+    return None
+
+
+class RateLimitScheduler:
+    """
+    Shared pacing of the GitHub requests made by the workers of a batch run.
+    Work waits while the queue is paused, which happens when the primary quota left in the response headers
+    falls to ``min_remaining`` (until the quota resets) or when GitHub reports a secondary rate limit
+    (for its ``Retry-After`` delay). Content writes are spaced at least ``write_interval`` seconds apart,
+    as GitHub asks for content-creating requests.
+    The quota is read from ``gh``, a PyGithub client or any client exposing the same attributes.
+    """
+
+    def __init__(
+        self,
+        gh: Union[Github, RateLimited],
+        min_remaining: int = GITHUB_MIN_REMAINING,
+        write_interval: float = GITHUB_WRITE_INTERVAL,
+        secondary_pause: float = GITHUB_SECONDARY_PAUSE,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.gh = gh
+        self.min_remaining = min_remaining
+        self.write_interval = write_interval
+        self.secondary_pause = secondary_pause
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self._next_write_at = 0.0
+
+    def pause(self, seconds: float, reason: str) -> None:
+        """Hold all work for ``seconds``, or longer if the queue is already paused for longer."""
+        with self._lock:
+            resume_at = self._clock() + seconds
+            if resume_at <= self._resume_at:
+                return
+            self._resume_at = resume_at
+        logger.warning(f"Pausing GitHub updates for {seconds:.0f}s: {reason}.")
+
+    def _wait_for_resume(self) -> None:
+        while (delay := self._resume_at - self._clock()) > 0:
+            self._sleep(delay)
+
+    def wait(self) -> None:
+        """Block until the queue may proceed, pausing it first if the primary quota is nearly spent."""
+        self._wait_for_resume()
+        remaining, limit = self.gh.rate_limiting
+        # A negative quota is not known yet
+        if 0 <= remaining <= self.min_remaining:
+            reset = self.gh.rate_limiting_resettime
+            self.pause(max(reset - self._clock(), 0) + 1, f"{remaining}/{limit} requests left until the quota resets")
+            self._wait_for_resume()
+            logger.info("Resuming GitHub updates.")
+
+    def before_write(self) -> None:
+        """Block until the next content write is allowed."""
+        self._wait_for_resume()
+        with self._lock:
+            now = self._clock()
+            write_at = max(now, self._next_write_at)
+            self._next_write_at = write_at + self.write_interval
+        if write_at > now:
+            self._sleep(write_at - now)
+
+    def handle_error(self, error: BaseException) -> bool:
+        """
+        Pause the queue if ``error`` was caused by a rate limit.
+        Returns True if it was, meaning the failed work can be retried once the queue resumes.
+        """
+        rate_limited = rate_limit_error(error)
+        if rate_limited is None:
+            return False
+
+        retry_after = (rate_limited.headers or {}).get("retry-after")
+        if retry_after and retry_after.isdigit():
+            self.pause(int(retry_after), f"secondary rate limit, retry after {retry_after}s")
+        elif self.gh.rate_limiting[0] == 0:
+            self.pause(max(self.gh.rate_limiting_resettime - self._clock(), 0) + 1, "primary rate limit exhausted")
+        else:
+            self.pause(self.secondary_pause, "secondary rate limit")
+        return True
+
+    def log_budget(self) -> None:
+        """Log the primary quota left and when it resets."""
+        remaining, limit = self.gh.rate_limiting
+        reset = datetime.fromtimestamp(self.gh.rate_limiting_resettime, tz=timezone.utc)
+        logger.info(f"GitHub API budget: {remaining}/{limit} requests left, resets at {reset:%H:%M:%S} UTC.")
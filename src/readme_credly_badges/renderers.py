@@ -0,0 +1,182 @@
+"""Badge renderers: the output formats a badge block or a generated file can be written in."""
+
+import base64
+import functools
+import html
+import json
+import logging
+import mimetypes
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Optional
+
+import requests
+
+from readme_credly_badges.fingerprint import badge_fingerprint
+from readme_credly_badges.http_session import create_session
+from readme_credly_badges.models import Badge
+from readme_credly_badges.settings import BADGE_COLUMNS, BADGE_FORMAT, BADGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+CREDLY_IMAGES_URL = "https://images.credly.com/images/"
+
+# Templates are bound once at import and reused for every badge of every profile
+MARKDOWN_BADGE = "[![{name}]({image_url})]({url})".format
+HTML_BADGE = (
+    '<a href="{url}"><img src="{image_url}" alt="{name}" title="{name}" width="{width}" height="{height}"></a>'
+).format
+SVG_DOCUMENT = (
+    '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+    'width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n{badges}\n</svg>\n'
+).format
+SVG_BADGE = (
+    '<a xlink:href="{url}"><title>{name}</title>'
+    '<image x="{x}" y="{y}" width="{width}" height="{height}" xlink:href="{data_uri}"/></a>'
+).format
+
+# Files rendered as a whole instead of between badge markers, by extension
+FILE_FORMATS = {".json": "json", ".svg": "svg"}
+
+# Bytes of the image at a URL, for the images embedded in SVG files
+ImageLoader = Callable[[str], bytes]
+
+
+@dataclass(frozen=True)
+class BlockOptions:
+    """Rendering options of one badge block or generated file."""
+
+    size: str = BADGE_SIZE
+    limit: Optional[int] = None
+    format: str = BADGE_FORMAT
+    columns: int = BADGE_COLUMNS
+    sort: Optional[str] = None
+
+    @property
+    def width(self) -> int:
+        return int(self.size.split("x")[0])
+
+    @property
+    def height(self) -> int:
+        return int(self.size.split("x")[1])
+
+    def fingerprint(self, badges: list[Badge]) -> str:
+        """Fingerprint of the badges rendered with these options."""
+        if self.format == "markdown":
+            return badge_fingerprint(badges, self.size)
+        return badge_fingerprint(badges, self.size, self.format, str(self.columns))
+
+
+def sized_image_url(image_url: str, size: str) -> str:
+    """URL of a Credly badge image resized by Credly to ``size``."""
+    return image_url.replace(CREDLY_IMAGES_URL, f"https://images.credly.com/size/{size}/images/", 1)
+
+
+@functools.cache
+def image_session() -> requests.Session:
+    """Pooled session with retries, shared by the image downloads of a run."""
+    return create_session()
+
+
+def load_image(url: str, session: Optional[requests.Session] = None) -> bytes:
+    """
+    Download an image to embed in a generated file, through ``session`` or the shared ``image_session``.
+    Raises ConnectionError if it cannot be downloaded.
+    """
+    try:
+        response = (session or image_session()).get(url, timeout=60)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to download badge image {url}: {e}")
+        raise ConnectionError(f"Failed to download badge image {url}") from e
+    return response.content
+
+
+def _rows(badges: list[Badge], columns: int) -> list[list[Badge]]:
+    return [badges[i : i + columns] for i in range(0, len(badges), columns)]
+
+
+def render_markdown(badges: list[Badge], options: BlockOptions) -> str:
+    """One linked markdown image per line."""
+    return "\n".join(
+        MARKDOWN_BADGE(name=badge.name, image_url=sized_image_url(badge.image_url, options.size), url=badge.url)
+        for badge in badges
+    )
+
+
+def render_html(badges: list[Badge], options: BlockOptions) -> str:
+    """A grid of linked ``<img>`` tags with explicit dimensions, ``columns`` badges per row."""
+    rows = [
+        "\n".join(
+            HTML_BADGE(
+                name=html.escape(badge.name),
+                image_url=html.escape(sized_image_url(badge.image_url, options.size)),
+                url=html.escape(badge.url),
+                width=options.width,
+                height=options.height,
+            )
+            for badge in row
+        )
+        for row in _rows(badges, options.columns)
+    ]
+    return '<p align="center">\n' + "\n<br>\n".join(rows) + "\n</p>" if rows else ""
+
+
+def render_json(badges: list[Badge], options: BlockOptions) -> str:
+    """The badge list as a JSON document, with resized image URLs."""
+    data = [
+        {"name": badge.name, "url": badge.url, "image_url": sized_image_url(badge.image_url, options.size)}
+        for badge in badges
+    ]
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def render_svg(badges: list[Badge], options: BlockOptions, load: ImageLoader = load_image) -> str:
+    """
+    A single SVG image laying out the badges in a grid, ``columns`` per row.
+    Badge images are embedded as data URIs, so viewing it costs one request instead of one per badge;
+    they are fetched with ``load``, which downloads them by default.
+    """
+    width, height = options.width, options.height
+    elements = []
+    for index, badge in enumerate(badges):
+        image_url = sized_image_url(badge.image_url, options.size)
+        mime_type = mimetypes.guess_type(image_url)[0] or "image/png"
+        data = base64.b64encode(load(image_url)).decode("ascii")
+        row, column = divmod(index, options.columns)
+        elements.append(
+            SVG_BADGE(
+                name=html.escape(badge.name),
+                url=html.escape(badge.url),
+                x=column * width,
+                y=row * height,
+                width=width,
+                height=height,
+                data_uri=f"data:{mime_type};base64,{data}",
+            )
+        )
+
+    rows = _rows(badges, options.columns)
+    columns = min(len(badges), options.columns)
+    return SVG_DOCUMENT(width=columns * width, height=len(rows) * height, badges="\n".join(elements))
+
+
+RENDERERS: dict[str, Callable[[list[Badge], BlockOptions], str]] = {
+    "markdown": render_markdown,
+    "html": render_html,
+    "json": render_json,
+    "svg": render_svg,
+}
+
+
+def render(badges: list[Badge], options: BlockOptions, images: Optional[ImageLoader] = None) -> str:
+    """Render badges in the format selected by ``options``; SVG images are fetched with ``images`` if given."""
+    if images and options.format == "svg":
+        return render_svg(badges, options, images)
+    return RENDERERS[options.format](badges, options)
+
+
+def file_format(path: str) -> Optional[str]:
+    """Format of a file generated as a whole, or None for markdown files with badge blocks."""
+    return FILE_FORMATS.get(PurePosixPath(path).suffix.lower())
@@ -4,13 +4,55 @@ START_COMMENT = "<!-- START CREDLY BADGES -->"
 END_COMMENT = "<!-- END CREDLY BADGES -->"
 
 CREDLY_USERNAME = os.getenv("CREDLY_USERNAME")
+CREDLY_API_URL = os.getenv("CREDLY_API_URL", "https://www.credly.com")
 BADGE_SIZE = os.getenv("BADGE_SIZE", "150x150")
 BADGE_SORT_BY = os.getenv("BADGE_SORT_BY", "issued")
+BADGE_FORMAT = os.getenv("BADGE_FORMAT", "markdown")
+BADGE_COLUMNS = int(os.getenv("BADGE_COLUMNS", "6"))
+BADGE_IMAGE_DIR = os.getenv("BADGE_IMAGE_DIR", "")
+
+CREDLY_STREAM = os.getenv("CREDLY_STREAM", "true").lower() == "true"
+CREDLY_POOL_SIZE = int(os.getenv("CREDLY_POOL_SIZE", "10"))
+CREDLY_RETRIES = int(os.getenv("CREDLY_RETRIES", "3"))
+CREDLY_BACKOFF = float(os.getenv("CREDLY_BACKOFF", "0.5"))
+
+CREDLY_CACHE_DIR = os.getenv("CREDLY_CACHE_DIR", "")
+CREDLY_CACHE_TTL = int(os.getenv("CREDLY_CACHE_TTL", "0"))
+CREDLY_OFFLINE = os.getenv("CREDLY_OFFLINE", "false").lower() == "true"
+FINGERPRINT_FILE = "fingerprints.json"
+README_CACHE_DIR = "readmes"
 
 GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_REPO = os.getenv("GITHUB_REPO")
 GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")
+GITHUB_MIN_REMAINING = int(os.getenv("GITHUB_MIN_REMAINING", "100"))
+GITHUB_WRITE_INTERVAL = float(os.getenv("GITHUB_WRITE_INTERVAL", "1.0"))
+GITHUB_SECONDARY_PAUSE = float(os.getenv("GITHUB_SECONDARY_PAUSE", "60"))
+GITHUB_GRAPHQL_BATCH_SIZE = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "50"))
 README_FILE = os.getenv("README_FILE", "README.md")
+README_FILES = [path.strip() for path in README_FILE.split(",") if path.strip()]
+
+# APIs or clone the README files are read and written through, in REPO_BACKEND and batch --backend
+REPO_BACKENDS = ("api", "graphql", "local")
+REPO_BACKEND = os.getenv("REPO_BACKEND", "api")
+LOCAL_REPO_PATH = os.getenv("LOCAL_REPO_PATH", os.getenv("GITHUB_WORKSPACE", "."))
+LOCAL_GIT_PUSH = os.getenv("LOCAL_GIT_PUSH", "true").lower() == "true"
+
+DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
+DRY_RUN_REPORT = os.getenv("DRY_RUN_REPORT", "")
+
+METRICS_PROMETHEUS_FILE = os.getenv("METRICS_PROMETHEUS_FILE", "")
+METRICS_OTLP_FILE = os.getenv("METRICS_OTLP_FILE", "")
+METRICS_JOB_SUMMARY = os.getenv("METRICS_JOB_SUMMARY", "false").lower() == "true"
+GITHUB_STEP_SUMMARY = os.getenv("GITHUB_STEP_SUMMARY", "")
 
 COMMIT_MESSAGE = os.getenv("COMMIT_MESSAGE", "Update README files with Credly badges.")
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+WATCH_MIN_INTERVAL = float(os.getenv("WATCH_MIN_INTERVAL", "300"))
+WATCH_MAX_INTERVAL = float(os.getenv("WATCH_MAX_INTERVAL", "21600"))
+WATCH_BACKOFF = float(os.getenv("WATCH_BACKOFF", "2"))
+WATCH_HOST = os.getenv("WATCH_HOST", "127.0.0.1")
+WATCH_PORT = int(os.getenv("WATCH_PORT", "8080"))
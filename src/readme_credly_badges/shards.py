@@ -0,0 +1,85 @@
+"""Sharded batch runs: split the jobs of a manifest across several runners, then merge their reports."""
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+# Batch mode selects its shard with this module, which must not import it back at runtime
+if TYPE_CHECKING:
+    from readme_credly_badges.jobs import BatchJob
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(github_repo: str, shard_count: int) -> int:
+    """
+    Shard of a repository, from a hash of its case-insensitive name that is the same on every runner.
+    All the jobs of a repository land in the same shard, so no two runners commit to it at once.
+    """
+    digest = hashlib.sha256(github_repo.lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def select_shard(jobs: Sequence["BatchJob"], shard_index: int, shard_count: int) -> list["BatchJob"]:
+    """The jobs of one shard, in manifest order. Raises ValueError on an invalid index or count."""
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index} of {shard_count}. Use 0 <= index < count.")
+    selected = [job for job in jobs if shard_of(job.github_repo, shard_count) == shard_index]
+    logger.info(f"Shard {shard_index} of {shard_count}: {len(selected)} of {len(jobs)} jobs.")
+    return selected
+
+
+def merge_reports(reports: Sequence[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Combine the JSON reports of the shards of a batch run into the report of the whole run.
+    Counts (the total and the number of jobs per status) are summed and jobs concatenated.
+    Raises ValueError if the reports come from runs split differently; a missing shard is logged.
+    """
+    merged: dict[str, Any] = {}
+    jobs = []
+    for report in reports:
+        for key, value in report.items():
+            if isinstance(value, int):
+                merged[key] = merged.get(key, 0) + value
+        jobs.extend(report.get("jobs", []))
+    merged["jobs"] = jobs
+
+    shards = [report["shard"] for report in reports if "shard" in report]
+    counts = {shard["count"] for shard in shards}
+    if len(counts) > 1:
+        raise ValueError(f"Reports come from runs with different shard counts: {sorted(counts)}.")
+    if counts:
+        [count] = counts
+        missing = sorted(set(range(count)) - {shard["index"] for shard in shards})
+        if missing:
+            logger.warning(f"Reports of shards {', '.join(map(str, missing))} of {count} are missing.")
+    return merged
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point merging shard reports. Returns 1 if any job of any shard failed."""
+    parser = argparse.ArgumentParser(description="Merge the JSON reports of the shards of a batch run.")
+    parser.add_argument("reports", type=Path, nargs="+", help="Reports written by batch --report.")
+    parser.add_argument("--output", type=Path, help="Write the merged report to this path instead of stdout.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    merged = merge_reports([json.loads(path.read_text(encoding="utf-8")) for path in args.reports])
+    text = json.dumps(merged, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        logger.info(f"Merged report of {len(args.reports)} shards written to {args.output}.")
+    else:
+        sys.stdout.write(text + "\n")
+    counts = ", ".join(f"{value} {key}" for key, value in merged.items() if key not in {"total", "jobs"})
+    logger.info(f"Merged run: {counts} out of {merged.get('total', 0)} jobs.")
+    return 1 if merged.get("failed") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
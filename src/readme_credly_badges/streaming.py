@@ -0,0 +1,114 @@
+"""Incremental parser for Credly badge payloads, keeping only the fields the badges are built from."""
+
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+DATE_FIELDS = ("issued_at", "updated_at", "accepted_at")
+TEMPLATE_FIELDS = ("name", "image_url")
+
+WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def slim_record(record: Any) -> dict[str, Any]:
+    """Copy of a badge record without the nested issuer, skills and template data that are never used."""
+    if not isinstance(record, dict):
+        return {}
+
+    slim = {key: record[key] for key in ("id", *DATE_FIELDS) if key in record}
+    template = record.get("badge_template")
+    if isinstance(template, dict):
+        slim["badge_template"] = {key: template[key] for key in TEMPLATE_FIELDS if key in template}
+    return slim
+
+
+class BadgeStream:
+    """
+    Iterate over the records of the top-level ``data`` array of a Credly JSON payload as its body is received.
+    Each record is decoded, slimmed down and handed out before the next one is read, so memory use is bounded
+    by the largest record instead of the whole payload. The other top-level values (such as the pagination
+    ``metadata``) are collected into ``fields`` while iterating.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+        self.fields: dict[str, Any] = {}
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was already consumed. False at the end of input."""
+        if self._exhausted:
+            return False
+
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+        return True
+
+    def _skip_whitespace(self) -> str:
+        """Return the next significant character without consuming it ("" at the end of input)."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        character = self._skip_whitespace()
+        if not character or character not in characters:
+            raise ValueError(f"Invalid Credly payload: expected one of {characters!r}, got {character or 'EOF'!r}.")
+        self._position += 1
+        return character
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more input until it is available."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise ValueError("Invalid Credly payload: truncated JSON value.") from None
+                continue
+
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._position = end
+            return value
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        self._expect("{")
+        if self._skip_whitespace() == "}":
+            self._position += 1
+            return
+
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "data" and self._skip_whitespace() == "[":
+                self._position += 1
+                if self._skip_whitespace() == "]":
+                    self._position += 1
+                else:
+                    while True:
+                        yield slim_record(self._value())
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                self.fields[key] = self._value()
+
+            if self._expect(",}") == "}":
+                return
@@ -1,28 +1,65 @@
 """Utility functions for handling data."""
 
-import logging
-from datetime import datetime
-from typing import Any
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Union
 
-logger = logging.getLogger(__name__)
+from readme_credly_badges.models import SORT_FIELDS, Badge
 
 
-def sort_by_field(data: list[dict[str, Any]], field: str = "issued") -> list[dict[str, Any]]:
-    """Sort a list of dictionaries by a specified date field (strict, no fallback)."""
+def write_atomic(path: Path, data: Union[str, bytes]) -> None:
+    """
+    Replace a file in one step, creating its directory if needed: the content is written to a temporary file
+    next to it, then renamed over it, so readers and concurrent runs never see a partial write.
+    Text is encoded as UTF-8.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as tmp:
+        tmp.write(data.encode("utf-8") if isinstance(data, str) else data)
+    Path(tmp_name).replace(path)
 
-    if not data:
-        return []
 
-    if field not in {"issued", "updated", "accepted"}:
-        raise ValueError(f"Invalid field for sorting: {field}. Use 'issued', 'updated', or 'accepted'.")
+def split_paths(paths: str) -> tuple[str, ...]:
+    """Parse a comma-separated list of file paths, e.g. ``README.md,docs/index.md``, dropping empty entries."""
+    return tuple(path.strip() for path in paths.split(",") if path.strip())
 
-    key = f"{field}_at"
-    try:
-        return sorted(
-            data,
-            key=lambda x: datetime.fromisoformat(x[key]),
-            reverse=True,
+
+def parse_sort_fields(sort_by: str) -> tuple[str, ...]:
+    """
+    Parse a comma-separated list of sort fields, e.g. ``issued`` or ``issued,name``.
+    Raises ValueError on unknown fields.
+    """
+    fields = tuple(field.strip() for field in sort_by.split(","))
+    if not all(field in SORT_FIELDS for field in fields):
+        raise ValueError(
+            f"Invalid field for sorting: {sort_by}. Use 'issued', 'updated', 'accepted' or 'name', comma-separated."
         )
-    except KeyError as e:
-        logger.error(f"Error sorting by {field}: {e}. Returning original data without sorting.")
-        return data
+    return fields
+
+
+def sort_key(fields: tuple[str, ...]) -> Callable[[Badge], tuple[object, ...]]:
+    """
+    Key function ordering badges by each field in turn: dates newest first with missing dates last,
+    names alphabetically.
+    """
+    attributes = tuple(f"{field}_at" if field != "name" else "name" for field in fields)
+
+    def key(badge: Badge) -> tuple[object, ...]:
+        parts: list[object] = []
+        for attribute in attributes:
+            value = getattr(badge, attribute)
+            if attribute == "name":
+                parts.append(value.casefold())
+            else:
+                parts.append((value is None, -value.timestamp() if value else 0.0))
+        return tuple(parts)
+
+    return key
+
+
+def sort_badges(badges: Iterable[Badge], sort_by: str = "issued") -> list[Badge]:
+    """Sort badges by the fields of ``sort_by``; badges that compare equal keep their order."""
+    return sorted(badges, key=sort_key(parse_sort_fields(sort_by)))
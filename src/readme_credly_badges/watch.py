@@ -0,0 +1,324 @@
+"""Watch mode: keep many Credly profiles up to date from one long-running process, polled on an adaptive schedule."""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+from readme_credly_badges.batch import JobClients, job_clients, load_manifest, make_clients, run_job
+from readme_credly_badges.cache import HttpCache, ReadmeCache
+from readme_credly_badges.fingerprint import FingerprintStore
+from readme_credly_badges.jobs import STATUS_FAILED, STATUS_UPDATED, BatchJob, JobResult
+from readme_credly_badges.metrics import export_metrics, metrics
+from readme_credly_badges.settings import (
+    BATCH_CONCURRENCY,
+    CREDLY_API_URL,
+    CREDLY_CACHE_DIR,
+    FINGERPRINT_FILE,
+    GITHUB_API_URL,
+    GITHUB_STEP_SUMMARY,
+    GITHUB_TOKEN,
+    METRICS_JOB_SUMMARY,
+    README_CACHE_DIR,
+    WATCH_BACKOFF,
+    WATCH_HOST,
+    WATCH_MAX_INTERVAL,
+    WATCH_MIN_INTERVAL,
+    WATCH_PORT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileState:
+    """Polling schedule and latest outcome of one job, with the clients kept warm between its checks."""
+
+    job: BatchJob
+    clients: JobClients = field(repr=False)
+    interval: float
+    next_check: float = 0.0
+    checks: int = 0
+    updates: int = 0
+    failures: int = 0
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    last_checked: Optional[float] = None
+    last_updated: Optional[float] = None
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        """JSON-serializable view of the state; ``now`` is the monotonic time the schedule is relative to."""
+        return {
+            "credly_username": self.job.credly_username,
+            "github_repo": self.job.github_repo,
+            "readme_files": list(self.job.readme_files),
+            "interval": self.interval,
+            "next_check_in": round(max(self.next_check - now, 0.0), 3),
+            "checks": self.checks,
+            "updates": self.updates,
+            "failures": self.failures,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked,
+            "last_updated": self.last_updated,
+        }
+
+
+class Watcher:
+    """
+    Poll every job's Credly profile and update its README when the badges change, until stopped.
+    A profile is checked again after ``min_interval`` seconds once it changed; each check finding nothing new
+    (or failing) multiplies its interval by ``backoff``, up to ``max_interval``. Checks of unchanged profiles
+    stay cheap: Credly answers 304 to the cached ETag and the recorded fingerprint skips GitHub entirely.
+    The GitHub client, rate limit scheduler, Credly session and each job's repository are created once.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[BatchJob],
+        gh_token: str,
+        gh_api_url: str = GITHUB_API_URL,
+        concurrency: int = BATCH_CONCURRENCY,
+        *,
+        credly_api_url: str = CREDLY_API_URL,
+        cache_dir: str = CREDLY_CACHE_DIR,
+        min_interval: float = WATCH_MIN_INTERVAL,
+        max_interval: float = WATCH_MAX_INTERVAL,
+        backoff: float = WATCH_BACKOFF,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f"Intervals must satisfy 0 < min <= max, got {min_interval} and {max_interval}.")
+        if backoff < 1:
+            raise ValueError(f"Backoff must be at least 1, got {backoff}.")
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}.")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.clock = clock
+        self.gh_api_url = gh_api_url
+        self.gh_token = gh_token
+        self.credly_api_url = credly_api_url
+        # The ETag cache and fingerprints are what make a check of an unchanged profile cheap, so they are always on
+        cache_dir = cache_dir or tempfile.mkdtemp(prefix="credly-watch-")
+        self.cache = HttpCache(cache_dir)
+        self.readme_cache = ReadmeCache(os.path.join(cache_dir, README_CACHE_DIR))
+        self.fingerprints = FingerprintStore(os.path.join(cache_dir, FINGERPRINT_FILE))
+        self.gh, self.scheduler, self.session = make_clients(gh_token, gh_api_url, concurrency)
+        self.states = [
+            ProfileState(
+                job=job,
+                clients=job_clients(
+                    job,
+                    self.gh,
+                    gh_api_url,
+                    gh_token,
+                    credly_api_url=credly_api_url,
+                    cache=self.cache,
+                    session=self.session,
+                    scheduler=self.scheduler,
+                    readme_cache=self.readme_cache,
+                ),
+                interval=min_interval,
+            )
+            for job in jobs
+        ]
+        self.started = clock()
+        self.rounds = 0
+        self.last_round: Optional[float] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="credly-watch")
+
+    def record(self, state: ProfileState, result: JobResult) -> None:
+        """Schedule the next check of a profile from the result of the last one."""
+        with self._lock:
+            state.checks += 1
+            state.last_status = result.status
+            state.last_error = result.error
+            state.last_checked = time.time()
+            if result.status == STATUS_UPDATED:
+                state.updates += 1
+                state.last_updated = state.last_checked
+                state.interval = self.min_interval
+            else:
+                state.failures += result.status == STATUS_FAILED
+                state.interval = min(state.interval * self.backoff, self.max_interval)
+            state.next_check = self.clock() + state.interval
+
+    def check(self, state: ProfileState) -> JobResult:
+        """Check one profile now."""
+        result = run_job(
+            state.job,
+            self.gh,
+            self.gh_api_url,
+            self.gh_token,
+            credly_api_url=self.credly_api_url,
+            cache=self.cache,
+            fingerprints=self.fingerprints,
+            session=self.session,
+            scheduler=self.scheduler,
+            clients=state.clients,
+        )
+        self.record(state, result)
+        return result
+
+    def poll(self) -> list[JobResult]:
+        """
+        Check the profiles that are due, on the worker pool, then persist the fingerprints and metrics.
+        The OTLP trace written covers the checks of this round only; the job summary is left for ``close``.
+        """
+        now = self.clock()
+        due = [state for state in self.states if state.next_check <= now]
+        results = list(self._executor.map(self.check, due)) if due else []
+        with self._lock:
+            self.rounds += 1
+            self.last_round = self.clock()
+        if results:
+            updated = sum(result.status == STATUS_UPDATED for result in results)
+            logger.info(f"Checked {len(results)} profiles: {updated} updated.")
+            self.fingerprints.save()
+            export_metrics(job_summary=False)
+            metrics.clear_spans()
+        return results
+
+    def seconds_until_next(self) -> float:
+        """Time until the next profile is due."""
+        if not self.states:
+            return self.max_interval
+        return max(min(state.next_check for state in self.states) - self.clock(), 0.0)
+
+    def run(self, stop: threading.Event) -> None:
+        """Poll until ``stop`` is set, sleeping until the next profile is due in between."""
+        logger.info(f"Watching {len(self.states)} profiles every {self.min_interval:g} to {self.max_interval:g}s.")
+        while not stop.is_set():
+            self.poll()
+            stop.wait(self.seconds_until_next())
+
+    def close(self) -> None:
+        """Wait for running checks, then save the fingerprints and write the job summary of the whole run once."""
+        self._executor.shutdown(wait=True)
+        self.fingerprints.save()
+        self.cache.log_stats()
+        self.readme_cache.log_stats()
+        metrics.export(job_summary_file=GITHUB_STEP_SUMMARY if METRICS_JOB_SUMMARY else "")
+
+    def healthy(self) -> bool:
+        """Whether the polling loop completed a round recently; a stuck loop fails after twice ``max_interval``."""
+        with self._lock:
+            last = self.last_round if self.last_round is not None else self.started
+        return self.clock() - last <= 2 * self.max_interval
+
+    def status(self) -> dict[str, Any]:
+        """JSON-serializable status of the watcher and of every profile."""
+        now = self.clock()
+        with self._lock:
+            profiles = [state.to_dict(now) for state in self.states]
+            rounds = self.rounds
+        return {
+            "healthy": self.healthy(),
+            "uptime": round(now - self.started, 3),
+            "rounds": rounds,
+            "profiles": profiles,
+        }
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """
+    Read-only HTTP endpoints of a ``Watcher``: ``/healthz`` (200 or 503), ``/status`` (JSON)
+    and ``/metrics`` (Prometheus text).
+    """
+
+    watcher: Watcher
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug(format % args)
+
+    def _send(self, status: int, body: str, content_type: str = "application/json") -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path == "/healthz":
+            healthy = self.watcher.healthy()
+            self._send(200 if healthy else 503, json.dumps({"status": "ok" if healthy else "stale"}))
+        elif self.path == "/status":
+            self._send(200, json.dumps(self.watcher.status()))
+        elif self.path == "/metrics":
+            self._send(200, metrics.prometheus(), "text/plain; version=0.0.4")
+        else:
+            self._send(404, json.dumps({"message": "Not Found"}))
+
+
+def serve_status(watcher: Watcher, host: str = WATCH_HOST, port: int = WATCH_PORT) -> ThreadingHTTPServer:
+    """Serve the status endpoints of a watcher from a background thread."""
+    server = ThreadingHTTPServer((host, port), type("Handler", (StatusHandler,), {"watcher": watcher}))
+    threading.Thread(target=server.serve_forever, name="credly-watch-status", daemon=True).start()
+    logger.info(f"Status endpoint listening on http://{host}:{server.server_address[1]}/status.")
+    return server
+
+
+def main(argv: Optional[Sequence[str]] = None, stop: Optional[threading.Event] = None) -> int:
+    """Command line entry point for watch mode. Runs until SIGINT or SIGTERM (or ``stop``) and returns 0."""
+    parser = argparse.ArgumentParser(description="Keep README files up to date with many Credly profiles.")
+    parser.add_argument("manifest", type=Path, help="Path to a .json, .yaml, .yml or .csv manifest.")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Number of worker threads.")
+    parser.add_argument(
+        "--min-interval", type=float, default=WATCH_MIN_INTERVAL, help="Seconds between checks of an active profile."
+    )
+    parser.add_argument(
+        "--max-interval", type=float, default=WATCH_MAX_INTERVAL, help="Longest time between two checks of a profile."
+    )
+    parser.add_argument(
+        "--backoff", type=float, default=WATCH_BACKOFF, help="Interval multiplier after a check found no change."
+    )
+    parser.add_argument("--host", default=WATCH_HOST, help="Address of the status endpoint.")
+    parser.add_argument("--port", type=int, default=WATCH_PORT, help="Port of the status endpoint (-1 disables it).")
+    args = parser.parse_args(argv)
+
+    if not GITHUB_TOKEN:
+        logger.error("Environment variable GITHUB_TOKEN must be set.")
+        raise ValueError("Environment variable GITHUB_TOKEN must be set.")
+
+    watcher = Watcher(
+        load_manifest(args.manifest),
+        gh_token=GITHUB_TOKEN,
+        concurrency=args.concurrency,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        backoff=args.backoff,
+    )
+    server = serve_status(watcher, args.host, args.port) if args.port >= 0 else None
+
+    stop = stop or threading.Event()
+    handlers = {signum: signal.signal(signum, lambda *_: stop.set()) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        watcher.run(stop)
+    finally:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+        if server:
+            server.shutdown()
+            server.server_close()
+        watcher.close()
+    logger.info("Watch mode stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"Benchmark fixtures: synthetic profiles and READMEs, and a report of the measurements of the session."
+
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from github import Auth, Github
+
+from readme_credly_badges.settings import END_COMMENT, START_COMMENT
+
+# Written at the end of the session if set, e.g. to compare two runs
+BENCHMARK_REPORT = os.getenv("BENCHMARK_REPORT", "")
+
+
+def synthetic_badges(count: int) -> list[dict[str, Any]]:
+    """Credly badge records as the API returns them, with the nested data the parser drops."""
+    return [
+        {
+            "id": f"00000000-0000-4000-8000-{index:012d}",
+            "issued_at": f"20{10 + index % 15:02d}-{1 + index % 12:02d}-01T00:00:00.000-05:00",
+            "badge_template": {
+                "name": f"Certification {index}",
+                "image_url": f"https://images.credly.com/images/{index}/image.png",
+                "description": "A synthetic badge. " * 20,
+                "skills": [{"name": f"Skill {skill}"} for skill in range(10)],
+            },
+            "issuer": {"entities": [{"entity": {"name": "Issuer", "url": "https://example.com"}}]},
+        }
+        for index in range(count)
+    ]
+
+
+def synthetic_readme(size: int) -> str:
+    """A markdown document of about ``size`` bytes with one badge block in the middle."""
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.\n"
+    half = filler * max(1, size // (2 * len(filler)))
+    return f"# Profile\n{half}{START_COMMENT}\n{END_COMMENT}\n{half}"
+
+
+def github_client(url: str) -> Github:
+    """A PyGithub client without its request throttling, so the benchmarks measure this package."""
+    return Github(
+        base_url=url, auth=Auth.Token("token"), retry=None, seconds_between_requests=None, seconds_between_writes=None
+    )
+
+
+class BenchmarkReport:
+    """Measurements of the session, printed as a table once all benchmarks ran."""
+
+    def __init__(self) -> None:
+        self.results: list[dict[str, Any]] = []
+
+    def measure(self, name: str, run: Callable[[], int], stub: Any) -> dict[str, Any]:
+        """
+        Run ``run`` once, which returns how many profiles it processed, and record its latency,
+        throughput, peak Python memory and the API calls it made.
+        """
+        calls = len(stub.requests)
+        tracemalloc.start()
+        started = time.perf_counter()
+        profiles = run()
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        requests = stub.requests[calls:]
+        result = {
+            "name": name,
+            "profiles": profiles,
+            "seconds": round(elapsed, 4),
+            "profiles_per_second": round(profiles / elapsed, 2),
+            "peak_memory_mb": round(peak / 2**20, 2),
+            "credly_calls": sum(1 for _method, path in requests if path.startswith("/users/")),
+            "github_calls": sum(1 for _method, path in requests if path.startswith(("/repos/", "/graphql"))),
+        }
+        self.results.append(result)
+        return result
+
+    def table(self) -> list[str]:
+        header = f"{'benchmark':<34} {'latency (s)':>11} {'profiles/s':>10} {'peak MB':>8} {'credly':>6} {'github':>6}"
+        rows = [
+            f"{r['name']:<34} {r['seconds']:>11.4f} {r['profiles_per_second']:>10.2f} {r['peak_memory_mb']:>8.2f} "
+            f"{r['credly_calls']:>6} {r['github_calls']:>6}"
+            for r in self.results
+        ]
+        return [header, "-" * len(header), *rows]
+
+
+REPORT = BenchmarkReport()
+
+
+@pytest.fixture
+def benchmark_report():
+    return REPORT
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not REPORT.results:
+        return
+
+    terminalreporter.write_sep("=", "benchmark results")
+    for line in REPORT.table():
+        terminalreporter.write_line(line)
+    if BENCHMARK_REPORT:
+        with open(BENCHMARK_REPORT, "w", encoding="utf-8") as file:
+            json.dump(REPORT.results, file, indent=2)
+        terminalreporter.write_line(f"Benchmark report written to {BENCHMARK_REPORT}.")
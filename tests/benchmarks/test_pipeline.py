@@ -0,0 +1,113 @@
+"""
+End-to-end benchmarks of the README update pipeline against the local Credly and GitHub stand-in servers.
+Run them with ``nox -s benchmark``; they are skipped by the default test run.
+The stand-in servers run in the same process, so peak memory includes what they allocate.
+"""
+
+import pytest
+
+from readme_credly_badges.adapter import Credly, GithubRepo
+from readme_credly_badges.batch import STATUS_FAILED, BatchJob, run_batch
+from readme_credly_badges.entrypoint import update_readme
+from readme_credly_badges.http_session import create_session
+
+from .conftest import github_client, synthetic_badges, synthetic_readme
+
+pytestmark = pytest.mark.benchmark
+
+PROFILES = 20
+CONCURRENCY = 8
+KB = 1024
+
+
+def make_repo(stub, gh, repository="bench/repo", paths=("README.md",)):
+    return GithubRepo("Update badges", stub.url, "token", repository, "main", paths[0], gh=gh)
+
+
+@pytest.mark.parametrize("badges", [1, 10, 100, 1000])
+def test_profile_size(stub_server, benchmark_report, badges):
+    """Latency of one profile, from the Credly fetch to the README commit."""
+    stub_server.badges["bench"] = synthetic_badges(badges)
+    stub_server.add_file("bench/repo", "README.md", synthetic_readme(4 * KB))
+    credly = Credly("bench", api_url=stub_server.url, session=create_session())
+    github_repo = make_repo(stub_server, github_client(stub_server.url))
+
+    result = benchmark_report.measure(
+        f"profile with {badges} badges", lambda: int(update_readme(credly, github_repo)), stub_server
+    )
+
+    assert result["profiles"] == 1
+    assert result["credly_calls"] == -(-badges // stub_server.per_page)
+    # Repository lookup, README read and README write
+    assert result["github_calls"] == 3  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("size", [1 * KB, 100 * KB, 1024 * KB, 10 * 1024 * KB], ids=["1KB", "100KB", "1MB", "10MB"])
+def test_readme_size(stub_server, benchmark_report, size):
+    """Latency and memory of rewriting the badge block of a large README."""
+    stub_server.badges["bench"] = synthetic_badges(48)
+    stub_server.add_file("bench/repo", "README.md", synthetic_readme(size))
+    credly = Credly("bench", api_url=stub_server.url, session=create_session())
+    github_repo = make_repo(stub_server, github_client(stub_server.url))
+
+    result = benchmark_report.measure(
+        f"README of {size // KB} KB", lambda: int(update_readme(credly, github_repo)), stub_server
+    )
+
+    assert result["profiles"] == 1
+    assert "Certification 0" in stub_server.read_file("bench/repo", "README.md")
+
+
+def test_multi_file_commit(stub_server, benchmark_report):
+    """A README, a docs page and a generated JSON file committed together through the git data API."""
+    paths = ["README.md", "docs/index.md", "badges.json"]
+    stub_server.badges["bench"] = synthetic_badges(100)
+    for path in paths[:2]:
+        stub_server.add_file("bench/repo", path, synthetic_readme(4 * KB))
+    stub_server.add_file("bench/repo", "badges.json", "[]\n")
+    credly = Credly("bench", api_url=stub_server.url, session=create_session())
+    github_repo = make_repo(stub_server, github_client(stub_server.url), paths=paths)
+
+    result = benchmark_report.measure(
+        "3 files in one commit", lambda: int(update_readme(credly, github_repo, paths=paths)), stub_server
+    )
+
+    assert result["profiles"] == 1
+    # Repository lookup, three reads, then ref, commit, the tree checked against the reads, the new tree,
+    # commit and ref update
+    assert result["github_calls"] == 10  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(("backend", "badges"), [("api", 10), ("api", 100), ("graphql", 10)])
+def test_batch_throughput(stub_server, benchmark_report, backend, badges):
+    """
+    Profiles per second of a batch run on a thread pool sharing one GitHub client and Credly session.
+    Both backends run through ``run_batch`` without spacing their commits, so their numbers compare:
+    the REST backend reads and writes each README with its own requests, the GraphQL backend reads every
+    README with one query and writes each with one mutation.
+    """
+    jobs = []
+    for index in range(PROFILES):
+        stub_server.badges[f"user{index}"] = synthetic_badges(badges)
+        stub_server.add_file(f"bench/repo{index}", "README.md", synthetic_readme(4 * KB))
+        jobs.append(BatchJob(credly_username=f"user{index}", github_repo=f"bench/repo{index}"))
+
+    def run():
+        results = run_batch(
+            jobs,
+            "token",
+            stub_server.url,
+            CONCURRENCY,
+            credly_api_url=stub_server.url,
+            backend=backend,
+            write_interval=0,
+        )
+        assert all(result.status != STATUS_FAILED for result in results)
+        return len(results)
+
+    name = f"{'GraphQL batch' if backend == 'graphql' else 'batch'} of {PROFILES} x {badges} badges"
+    result = benchmark_report.measure(name, run, stub_server)
+
+    assert result["profiles"] == PROFILES
+    # REST: repository lookup, read and write per profile; GraphQL: one read query, then a mutation per profile
+    assert result["github_calls"] == (3 * PROFILES if backend == "api" else 1 + PROFILES)
@@ -0,0 +1,59 @@
+"""
+Scaling benchmarks of the README block replacement and of the incremental Credly payload parser.
+Run them with ``nox -s benchmark``; they are skipped by the default test run.
+"""
+
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from readme_credly_badges.markers import replace_blocks
+from readme_credly_badges.streaming import BadgeStream
+
+from ..test_markers import BADGES
+from ..test_streaming import chunked, record
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_replace_blocks_scales_linearly():
+    def best_time(size):
+        filler = "Some generated documentation text.\n" * (size // 36)
+        block = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+        content = filler + block + filler + block + filler
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            replace_blocks(content, BADGES)
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    small, large = best_time(1_000_000), best_time(8_000_000)
+
+    # 8x the input must take well under 64x (quadratic) the time; linear is about 8x.
+    assert large / small < 24  # noqa: PLR2004
+
+
+def test_stream_benchmark_against_full_decode():
+    payload = json.dumps({"data": [record(i) for i in range(300)], "metadata": {}}).encode("utf-8")
+
+    def measure(parse):
+        tracemalloc.start()
+        records = parse()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            parse()
+            timings.append(time.perf_counter() - started)
+        return len(records), peak, min(timings)
+
+    full_count, full_peak, full_time = measure(lambda: json.loads(payload)["data"])
+    stream_count, stream_peak, stream_time = measure(lambda: list(BadgeStream(chunked(payload, 65536))))
+
+    assert stream_count == full_count
+    assert stream_peak * 4 < full_peak
+    assert stream_time < full_time * 3
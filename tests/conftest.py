@@ -0,0 +1,352 @@
+"Shared fixtures: a local stub server standing in for the Credly API and the GitHub REST and GraphQL APIs."
+
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pytest
+
+BADGES_PATH = re.compile(r"^/users/(?P<user>[^/]+)/badges\.json$")
+REPO_PATH = re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)$")
+CONTENTS_PATH = re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/contents/(?P<path>.+)$")
+REF_PATH = re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/git/refs?/heads/(?P<branch>.+)$")
+GIT_OBJECT_PATH = re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/git/(?P<kind>blobs|trees|commits)(?:/(?P<sha>[0-9a-f]+))?$")
+TOKENS = ("Bearer token", "token token")
+GRAPHQL_OPERATION = re.compile(r"^\s*(?:query|mutation)\s+(?P<name>\w+)")
+GRAPHQL_LIMIT = 5000
+REST_LIMIT = 5000
+
+
+def blob_sha(content: bytes) -> str:
+    """Compute the git blob SHA of some content, like GitHub does."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()  # noqa: S324
+
+
+class StubServer:
+    """
+    In-memory Credly profiles and repository files served over HTTP on localhost.
+    Repositories support the contents API (with ETags) and the part of the git data API used to commit several files
+    (trees, commits and branch refs); a new tree only lists the files it changes or deletes, and any tree read back
+    lists the current files of the repository.
+    The GraphQL endpoint answers the operations sent by ``GraphQLClient``, by name, each costing one point.
+    """
+
+    def __init__(self):
+        self.badges: dict[str, list[dict]] = {}
+        self.per_page = 48
+        self.failures: list[tuple[int, dict[str, str]]] = []
+        self.files: dict[tuple[str, str], bytes] = {}
+        self.requests: list[tuple[str, str]] = []
+        # Git objects created through the git data API: trees hold the files they change (None for a deletion),
+        # commits their tree
+        self.blobs: dict[str, bytes] = {}
+        self.trees: dict[str, dict[str, Optional[bytes]]] = {}
+        self.commits: dict[str, str] = {}
+        self.heads: dict[tuple[str, str], str] = {}
+        # Names of the GraphQL operations received, and the input of every commit created through GraphQL
+        self.operations: list[str] = []
+        self.graphql_commits: list[dict] = []
+        self.lock = threading.Lock()
+        self.url = ""
+
+    def add_file(self, repo: str, path: str, content: Union[str, bytes]) -> None:
+        self.files[repo, path] = content.encode("utf-8") if isinstance(content, str) else content
+
+    def read_file(self, repo: str, path: str) -> str:
+        return self.files[repo, path].decode("utf-8")
+
+    def count(self, method: str, prefix: str = "") -> int:
+        return sum(1 for m, path in self.requests if m == method and path.startswith(prefix))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler of a ``StubServer``, bound to it by ``_make_handler``."""
+
+    stub: StubServer
+    # Answer small requests without waiting for delayed ACKs, like a real server
+    disable_nagle_algorithm = True
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _rate_limit(self):
+        return {"limit": REST_LIMIT, "remaining": REST_LIMIT - len(self.stub.requests), "reset": int(time.time()) + 3600}
+
+    def _send(self, status, body=None, headers=None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        # Every response carries the REST quota, unless the caller reports another one
+        rate = self._rate_limit()
+        headers = {
+            "X-RateLimit-Limit": str(rate["limit"]),
+            "X-RateLimit-Remaining": str(rate["remaining"]),
+            "X-RateLimit-Reset": str(rate["reset"]),
+            **(headers or {}),
+        }
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _record(self):
+        url = urlparse(self.path)
+        with self.stub.lock:
+            self.stub.requests.append((self.command, url.path))
+        return url
+
+    def _read_json(self):
+        return json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+    def _ref(self, repo, branch):
+        sha = self.stub.heads.setdefault((repo, branch), hashlib.sha1(f"{repo}@{branch}".encode()).hexdigest())  # noqa: S324
+        url = f"{self.stub.url}/repos/{repo}/git/refs/heads/{branch}"
+        return {"ref": f"refs/heads/{branch}", "url": url, "object": {"sha": sha, "type": "commit"}}
+
+    def _commit(self, repo, sha):
+        tree = self.stub.commits.get(sha, sha)
+        return {"sha": sha, "url": f"{self.stub.url}/repos/{repo}/git/commits/{sha}", "tree": {"sha": tree}}
+
+    def _tree_listing(self, repo, sha):
+        # Whatever commit it belongs to, a tree read back lists the files the repository holds now
+        tree = [
+            {"path": path, "mode": "100644", "type": "blob", "sha": blob_sha(content)}
+            for (file_repo, path), content in sorted(self.stub.files.items())
+            if file_repo == repo
+        ]
+        return {"sha": sha, "url": f"{self.stub.url}/repos/{repo}/git/trees/{sha}", "tree": tree, "truncated": False}
+
+    def do_GET(self):  # noqa: PLR0911
+        url = self._record()
+        if match := BADGES_PATH.match(url.path):
+            return self._get_badges(match, url)
+
+        if url.path == "/rate_limit":
+            return self._send(200, {"resources": {"core": self._rate_limit()}, "rate": self._rate_limit()})
+
+        if match := REPO_PATH.match(url.path):
+            repo = match["repo"]
+            return self._send(
+                200, {"full_name": repo, "name": repo.split("/")[1], "url": f"{self.stub.url}/repos/{repo}"}
+            )
+
+        if match := REF_PATH.match(url.path):
+            return self._send(200, self._ref(match["repo"], match["branch"]))
+
+        if (match := GIT_OBJECT_PATH.match(url.path)) and match["kind"] != "blobs" and match["sha"]:
+            git_object = self._commit if match["kind"] == "commits" else self._tree_listing
+            return self._send(200, git_object(match["repo"], match["sha"]))
+
+        if match := CONTENTS_PATH.match(url.path):
+            return self._get_contents(match, url)
+
+        return self._send(404, {"message": "Not Found"})
+
+    def _get_badges(self, match, url):
+        with self.stub.lock:
+            failure = self.stub.failures.pop(0) if self.stub.failures else None
+        if failure:
+            return self._send(failure[0], {"message": "Unavailable"}, failure[1])
+        if match["user"] not in self.stub.badges:
+            return self._send(404, {"message": "Not Found"})
+        badges = self.stub.badges[match["user"]]
+        page = int(parse_qs(url.query).get("page", ["1"])[0])
+        pages = max(1, -(-len(badges) // self.stub.per_page))
+        data = badges[(page - 1) * self.stub.per_page : page * self.stub.per_page]
+        return self._send(200, {"data": data, "metadata": {"current_page": page, "total_pages": pages}})
+
+    def _get_contents(self, match, url):
+        key = (match["repo"], unquote(match["path"]))
+        if key not in self.stub.files:
+            return self._list_directory(*key)
+        content = self.stub.files[key]
+        etag = f'"{blob_sha(content)}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag})
+        return self._send(
+            200,
+            {
+                "type": "file",
+                "path": key[1],
+                "sha": blob_sha(content),
+                "encoding": "base64",
+                "content": base64.b64encode(content).decode("ascii"),
+                "ref": parse_qs(url.query).get("ref", ["main"])[0],
+            },
+            {"ETag": etag},
+        )
+
+    def _list_directory(self, repo, directory):
+        prefix = f"{directory.rstrip('/')}/"
+        entries = [
+            {"type": "file", "path": path, "name": path[len(prefix) :], "sha": blob_sha(content)}
+            for (file_repo, path), content in sorted(self.stub.files.items())
+            if file_repo == repo and path.startswith(prefix) and "/" not in path[len(prefix) :]
+        ]
+        if not entries:
+            return self._send(404, {"message": "Not Found"})
+        return self._send(200, entries)
+
+    def do_PUT(self):
+        url = self._record()
+        match = CONTENTS_PATH.match(url.path)
+        if not match:
+            return self._send(404, {"message": "Not Found"})
+
+        if self.headers.get("Authorization") not in TOKENS:
+            return self._send(401, {"message": "Bad credentials"})
+
+        body = self._read_json()
+        key = (match["repo"], unquote(match["path"]))
+        with self.stub.lock:
+            if key in self.stub.files and body.get("sha") != blob_sha(self.stub.files[key]):
+                return self._send(409, {"message": "sha does not match"})
+            self.stub.files[key] = base64.b64decode(body["content"])
+            sha = blob_sha(self.stub.files[key])
+        return self._send(200, {"content": {"path": key[1], "sha": sha}, "commit": {"message": body["message"]}})
+
+    def do_POST(self):
+        url = self._record()
+        if url.path == "/graphql":
+            return self._graphql()
+        match = GIT_OBJECT_PATH.match(url.path)
+        if not match or match["sha"]:
+            return self._send(404, {"message": "Not Found"})
+
+        body = self._read_json()
+        if match["kind"] == "blobs":
+            content = base64.b64decode(body["content"])
+            sha = blob_sha(content)
+            with self.stub.lock:
+                self.stub.blobs[sha] = content
+            return self._send(201, {"sha": sha, "url": f"{self.stub.url}/repos/{match['repo']}/git/blobs/{sha}"})
+
+        if match["kind"] == "trees":
+            files = {
+                item["path"]: item["content"].encode("utf-8")
+                if "content" in item
+                else item["sha"] and self.stub.blobs[item["sha"]]
+                for item in body["tree"]
+            }
+            sha = hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()  # noqa: S324
+            with self.stub.lock:
+                self.stub.trees[sha] = files
+            return self._send(201, {"sha": sha, "url": f"{self.stub.url}/repos/{match['repo']}/git/trees/{sha}"})
+
+        sha = hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()  # noqa: S324
+        with self.stub.lock:
+            self.stub.commits[sha] = body["tree"]
+        return self._send(201, self._commit(match["repo"], sha))
+
+    def _graphql(self):
+        body = self._read_json()
+        if self.headers.get("Authorization") not in TOKENS:
+            return self._send(401, {"message": "Bad credentials"})
+
+        name = GRAPHQL_OPERATION.match(body["query"])["name"]
+        with self.stub.lock:
+            self.stub.operations.append(name)
+            handler = {"ReadFiles": self._read_files, "ListDirectory": self._tree, "CreateCommit": self._create_commit}
+            data, errors = handler[name](body["variables"])
+            remaining = GRAPHQL_LIMIT - len(self.stub.operations)
+        if "rateLimit" in body["query"]:
+            data["rateLimit"] = {"cost": 1, "limit": GRAPHQL_LIMIT, "remaining": remaining, "resetAt": None}
+        headers = {"X-RateLimit-Limit": str(GRAPHQL_LIMIT), "X-RateLimit-Remaining": str(remaining)}
+        return self._send(200, {"data": data, **({"errors": errors} if errors else {})}, headers)
+
+    def _repositories(self):
+        return {repo for repo, _path in self.stub.files}
+
+    def _read_files(self, variables):
+        data, errors = {}, []
+        for i in range(len(variables) // 4):
+            repo = f"{variables[f'owner{i}']}/{variables[f'name{i}']}"
+            if repo not in self._repositories():
+                data[f"r{i}"] = None
+                errors.append({"type": "NOT_FOUND", "path": [f"r{i}"], "message": f"Could not resolve {repo}."})
+                continue
+            branch, path = variables[f"expression{i}"].split(":", 1)
+            content = self.stub.files.get((repo, path))
+            blob = None
+            if content is not None:
+                binary = b"\0" in content
+                text = None if binary else content.decode("utf-8")
+                blob = {"oid": blob_sha(content), "text": text, "isBinary": binary, "isTruncated": False}
+            data[f"r{i}"] = {"ref": {"target": {"oid": self._ref(repo, branch)["object"]["sha"]}}, "object": blob}
+        return data, errors
+
+    def _tree(self, variables):
+        repo = f"{variables['owner']}/{variables['name']}"
+        directory = variables["expression"].split(":", 1)[1]
+        if (repo, directory) in self.stub.files:
+            return {"repository": {"object": {"__typename": "Blob"}}}, []
+        prefix = f"{directory}/"
+        entries = [
+            {"name": path[len(prefix) :], "type": "blob", "oid": blob_sha(content)}
+            for (file_repo, path), content in sorted(self.stub.files.items())
+            if file_repo == repo and path.startswith(prefix) and "/" not in path[len(prefix) :]
+        ]
+        tree = {"__typename": "Tree", "entries": entries} if entries else None
+        return {"repository": {"object": tree}}, []
+
+    def _create_commit(self, variables):
+        commit = variables["input"]
+        repo, branch = commit["branch"]["repositoryNameWithOwner"], commit["branch"]["branchName"]
+        head = self._ref(repo, branch)["object"]["sha"]
+        if commit["expectedHeadOid"] != head:
+            message = f'Expected branch to point to "{commit["expectedHeadOid"]}" but it did not. Pull and try again.'
+            error = {"type": "STALE_DATA", "path": ["createCommitOnBranch"], "message": message}
+            return {"createCommitOnBranch": None}, [error]
+        for addition in commit["fileChanges"]["additions"]:
+            self.stub.files[repo, addition["path"]] = base64.b64decode(addition["contents"])
+        for deletion in commit["fileChanges"].get("deletions", []):
+            self.stub.files.pop((repo, deletion["path"]), None)
+        sha = hashlib.sha1(json.dumps(commit, sort_keys=True).encode()).hexdigest()  # noqa: S324
+        self.stub.heads[repo, branch] = sha
+        self.stub.graphql_commits.append(commit)
+        return {"createCommitOnBranch": {"commit": {"oid": sha}}}, []
+
+    def do_PATCH(self):
+        url = self._record()
+        match = REF_PATH.match(url.path)
+        if not match:
+            return self._send(404, {"message": "Not Found"})
+
+        repo, sha = match["repo"], self._read_json()["sha"]
+        with self.stub.lock:
+            for path, content in self.stub.trees[self.stub.commits[sha]].items():
+                if content is None:
+                    self.stub.files.pop((repo, path), None)
+                else:
+                    self.stub.files[repo, path] = content
+            self.stub.heads[repo, match["branch"]] = sha
+        return self._send(200, self._ref(repo, match["branch"]))
+
+
+def _make_handler(stub: StubServer):
+    return type("Handler", (StubHandler,), {"stub": stub})
+
+
+@pytest.fixture
+def stub_server():
+    """Start a stub Credly/GitHub server on a free local port for the duration of a test."""
+    stub = StubServer()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(stub))
+    stub.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield stub
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,349 @@
+"Test cases for the asyncio engine and adapters, run against the local stub server."
+
+import asyncio
+import json
+import logging
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from readme_credly_badges import aio
+from readme_credly_badges.adapter.async_credly import AsyncCredly
+from readme_credly_badges.adapter.async_github_repo import AsyncGithubRepo
+from readme_credly_badges.adapter.base import WriteConflictError
+from readme_credly_badges.jobs import STATUS_FAILED, STATUS_UNCHANGED, STATUS_UPDATED, BatchJob
+
+PROFILES = 10
+README = "Intro\n<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\nOutro\n"
+
+
+def badge(badge_id: str, issued_at: str = "2024-01-01T00:00:00.000+00:00") -> dict:
+    return {
+        "id": badge_id,
+        "issued_at": issued_at,
+        "badge_template": {"name": f"Badge {badge_id}", "image_url": f"https://images.credly.com/images/{badge_id}.png"},
+    }
+
+
+def make_repo(stub_server, client, repository="user/repo", token="token"):  # noqa: S107
+    return AsyncGithubRepo(
+        commit_message="commit",
+        gh_api_url=stub_server.url,
+        gh_token=token,
+        repository=repository,
+        branch="main",
+        readme_filename="README.md",
+        client=client,
+    )
+
+
+def test_async_credly_fetches_sorted_badges(stub_server):
+    stub_server.badges["alice"] = [badge("old", "2020-01-01T00:00:00+00:00"), badge("new", "2024-01-01T00:00:00+00:00")]
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await AsyncCredly("alice", client=client, api_url=stub_server.url).fetch_badges()
+
+    badges = asyncio.run(fetch())
+
+    assert [b.url for b in badges] == ["https://www.credly.com/badges/new", "https://www.credly.com/badges/old"]
+
+
+def test_async_credly_fetches_all_pages(stub_server):
+    stub_server.per_page = 2
+    stub_server.badges["alice"] = [badge(f"b{i}", f"2024-01-0{i + 1}T00:00:00+00:00") for i in range(5)]
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await AsyncCredly("alice", client=client, api_url=stub_server.url).fetch_badges()
+
+    badges = asyncio.run(fetch())
+
+    assert [b.name for b in badges] == [f"Badge b{i}" for i in reversed(range(5))]
+    assert stub_server.count("GET", "/users/alice/") == 3  # noqa: PLR2004
+
+
+def test_async_credly_bounds_pages_in_flight():
+    in_flight, peak = 0, 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        page = request.url.params.get("page", "1")
+        return httpx.Response(200, json={"data": [badge(f"b{page}")], "metadata": {"total_pages": 10}})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await AsyncCredly("alice", client=client, api_url="https://credly.test").fetch_badges()
+
+    with patch("readme_credly_badges.adapter.async_credly.PAGE_CONCURRENCY", 2):
+        badges = asyncio.run(fetch())
+
+    assert len(badges) == 10  # noqa: PLR2004
+    assert peak == 2  # noqa: PLR2004
+
+
+def test_async_credly_raises_connection_error(stub_server):
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await AsyncCredly("missing", client=client, api_url=stub_server.url).fetch_badges()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(fetch())
+
+
+def test_async_github_repo_round_trip(stub_server):
+    stub_server.add_file("user/repo", "README.md", "Hello World!")
+
+    async def round_trip():
+        async with httpx.AsyncClient() as client:
+            repo = make_repo(stub_server, client)
+            content = await repo.get_readme()
+            await repo.save_readme(content + " Updated")
+            return content
+
+    assert asyncio.run(round_trip()) == "Hello World!"
+    assert stub_server.read_file("user/repo", "README.md") == "Hello World! Updated"
+    assert stub_server.count("GET", "/repos/") == 1
+
+
+def test_async_github_repo_save_without_prior_read(stub_server):
+    stub_server.add_file("user/repo", "README.md", "Hello")
+
+    async def save():
+        async with httpx.AsyncClient() as client:
+            await make_repo(stub_server, client).save_readme("Bye")
+
+    asyncio.run(save())
+
+    assert stub_server.read_file("user/repo", "README.md") == "Bye"
+
+
+def test_async_github_repo_file_not_found(stub_server):
+    async def read():
+        async with httpx.AsyncClient() as client:
+            await make_repo(stub_server, client).get_readme()
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(read())
+
+
+def test_async_github_repo_write_failure(stub_server):
+    stub_server.add_file("user/repo", "README.md", "Hello")
+
+    async def save():
+        async with httpx.AsyncClient() as client:
+            await make_repo(stub_server, client, token="bad").save_readme("Bye")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(save())
+    assert stub_server.read_file("user/repo", "README.md") == "Hello"
+
+
+def test_async_github_repo_commits_several_files_at_once(stub_server):
+    stub_server.add_file("user/repo", "README.md", "Hello")
+
+    async def save():
+        async with httpx.AsyncClient() as client:
+            repo = make_repo(stub_server, client)
+            await repo.get_readme()
+            with pytest.raises(FileNotFoundError):
+                await repo.get_file("badges.json")
+            await repo.save_files({"README.md": "Bye", "badges.json": "[]"}, message_body="Added: Badge.")
+            return repo
+
+    repo = asyncio.run(save())
+
+    assert stub_server.read_file("user/repo", "README.md") == "Bye"
+    assert stub_server.read_file("user/repo", "badges.json") == "[]"
+    assert stub_server.count("PATCH", "/repos/user/repo/git/refs/heads/main") == 1
+    assert stub_server.count("PUT") == 0
+    assert repo.missing == set()
+
+
+def test_async_github_repo_creates_missing_file(stub_server):
+    async def save():
+        async with httpx.AsyncClient() as client:
+            repo = make_repo(stub_server, client)
+            with pytest.raises(FileNotFoundError):
+                await repo.get_file("badges.json")
+            await repo.save_files({"badges.json": "[]"})
+
+    asyncio.run(save())
+
+    assert stub_server.read_file("user/repo", "badges.json") == "[]"
+
+
+@pytest.mark.parametrize("files", [{"README.md": "Bye"}, {"README.md": "Bye", "badges.json": "[]"}])
+def test_async_github_repo_raises_on_changes_since_read(stub_server, files):
+    stub_server.add_file("user/repo", "README.md", "Hello")
+
+    async def save():
+        async with httpx.AsyncClient() as client:
+            repo = make_repo(stub_server, client)
+            await repo.get_readme()
+            stub_server.add_file("user/repo", "README.md", "Edited")
+            await repo.save_files(files)
+
+    with pytest.raises(WriteConflictError, match=r"README\.md changed"):
+        asyncio.run(save())
+    assert stub_server.read_file("user/repo", "README.md") == "Edited"
+
+
+def test_async_github_repo_raises_when_branch_moved():
+    commits = []
+
+    def handler(request):
+        if request.method == "PATCH":
+            return httpx.Response(422, json={"message": "Update is not a fast forward"})
+        if "/git/ref/" in request.url.path:
+            return httpx.Response(200, json={"object": {"sha": "head"}})
+        if request.method == "GET":
+            return httpx.Response(200, json={"sha": "head", "tree": {"sha": "tree"}})
+        if request.url.path.endswith("/git/commits"):
+            commits.append(json.loads(request.content))
+        return httpx.Response(201, json={"sha": "new"})
+
+    async def save():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            repo = AsyncGithubRepo(
+                commit_message="commit",
+                gh_api_url="https://api.github.com",
+                gh_token="token",
+                repository="user/repo",
+                branch="main",
+                readme_filename="README.md",
+                client=client,
+            )
+            await repo.save_files({"README.md": "a", "badges.json": "[]"}, message_body="Added: Badge.")
+
+    with pytest.raises(WriteConflictError, match="moved"):
+        asyncio.run(save())
+    assert commits == [{"message": "commit\n\nAdded: Badge.", "tree": "new", "parents": ["head"]}]
+
+
+def test_async_github_repo_rejects_directory():
+    async def read():
+        transport = httpx.MockTransport(lambda _request: httpx.Response(200, json=[{"type": "file"}]))
+        async with httpx.AsyncClient(transport=transport) as client:
+            repo = AsyncGithubRepo(
+                commit_message="commit",
+                gh_api_url="https://api.github.com",
+                gh_token="token",
+                repository="user/repo",
+                branch="main",
+                readme_filename="README.md",
+                client=client,
+            )
+            await repo.get_readme()
+
+    with pytest.raises(ValueError):
+        asyncio.run(read())
+
+
+def test_run_batch_against_stub_server(stub_server):
+    jobs = []
+    for i in range(PROFILES):
+        stub_server.badges[f"user{i}"] = [badge(f"b{i}")]
+        stub_server.add_file(f"user{i}/repo", "README.md", README)
+        jobs.append(BatchJob(credly_username=f"user{i}", github_repo=f"user{i}/repo"))
+    jobs.append(BatchJob(credly_username="ghost", github_repo="ghost/repo"))
+
+    results = asyncio.run(
+        aio.run_batch(jobs, gh_token="token", gh_api_url=stub_server.url, concurrency=4, credly_api_url=stub_server.url)
+    )
+
+    assert [result.status for result in results] == [STATUS_UPDATED] * PROFILES + [STATUS_FAILED]
+    assert "[![Badge b3]" in stub_server.read_file("user3/repo", "README.md")
+    assert stub_server.count("PUT") == PROFILES
+
+    rerun = asyncio.run(
+        aio.run_batch(jobs[:PROFILES], gh_token="token", gh_api_url=stub_server.url, credly_api_url=stub_server.url)
+    )
+    assert {result.status for result in rerun} == {STATUS_UNCHANGED}
+    assert stub_server.count("PUT") == PROFILES
+
+
+def test_update_readme_keeps_changes_made_since_read(stub_server, caplog):
+    stub_server.badges["alice"] = [badge("a1")]
+    stub_server.add_file("alice/alice", "README.md", README)
+
+    async def update():
+        async with httpx.AsyncClient() as client:
+            repo = make_repo(stub_server, client, repository="alice/alice")
+            read = repo.get_file
+            edits = []
+
+            async def get_file(path):
+                # Someone else changes the README right after the update first reads it
+                content = await read(path)
+                if path == "README.md" and not edits:
+                    edits.append(path)
+                    stub_server.add_file("alice/alice", path, f"Edited\n{README}")
+                return content
+
+            repo.get_file = get_file
+            credly = AsyncCredly("alice", client=client, api_url=stub_server.url)
+            return await aio.update_readme(credly, repo, paths=["README.md", "badges.json"])
+
+    assert asyncio.run(update()) is True
+
+    readme = stub_server.read_file("alice/alice", "README.md")
+    assert readme.startswith("Edited\n")
+    assert "[![Badge a1]" in readme
+    assert "a1" in stub_server.read_file("alice/alice", "badges.json")
+    assert "Reading the files again" in caplog.text
+
+
+def test_update_readme_requires_markdown_files(stub_server):
+    stub_server.badges["alice"] = [badge("a1")]
+
+    async def update():
+        async with httpx.AsyncClient() as client:
+            repo = make_repo(stub_server, client, repository="alice/alice")
+            credly = AsyncCredly("alice", client=client, api_url=stub_server.url)
+            return await aio.update_readme(credly, repo)
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(update())
+
+
+def test_run_batch_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        asyncio.run(aio.run_batch([], gh_token="token", concurrency=0))
+
+
+def test_async_main(stub_server, caplog):
+    caplog.set_level(logging.INFO)
+    stub_server.badges["alice"] = [badge("a1")]
+    stub_server.add_file("alice/alice", "README.md", README)
+    stub_server.add_file("alice/alice", "docs/index.md", README)
+
+    with (
+        patch.multiple(
+            "readme_credly_badges.aio",
+            CREDLY_USERNAME="alice",
+            GITHUB_TOKEN="token",
+            GITHUB_REPO="alice/alice",
+            GITHUB_API_URL=stub_server.url,
+            CREDLY_API_URL=stub_server.url,
+            README_FILES=["README.md", "docs/index.md"],
+        ),
+    ):
+        asyncio.run(aio.main())
+
+    assert "[![Badge a1]" in stub_server.read_file("alice/alice", "README.md")
+    assert "[![Badge a1]" in stub_server.read_file("alice/alice", "docs/index.md")
+    # The badges are fetched once and both files are written in one commit
+    assert stub_server.count("GET", "/users/alice/") == 1
+    assert stub_server.count("PATCH", "/repos/alice/alice/git/refs/") == 1
+    assert "README updated with new Credly badges." in caplog.text
+
+
+def test_async_main_missing_env_vars():
+    with patch.multiple("readme_credly_badges.aio", CREDLY_USERNAME=None), pytest.raises(ValueError):
+        asyncio.run(aio.main())
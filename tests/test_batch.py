@@ -0,0 +1,419 @@
+"Test cases for batch mode in readme_credly_badges/batch.py"
+
+import json
+import logging
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from github import RateLimitExceededException
+
+from readme_credly_badges import batch
+from readme_credly_badges.batch import BatchJob, load_manifest, run_batch, summarize
+from readme_credly_badges.journal import Journal
+
+
+@pytest.fixture
+def mock_pipeline():
+    with (
+        patch("readme_credly_badges.batch.Github") as MockGithub,
+        patch("readme_credly_badges.batch.Credly") as MockCredly,
+        patch("readme_credly_badges.batch.GithubRepo") as MockGithubRepo,
+        patch("readme_credly_badges.batch.update_readme") as mock_update,
+    ):
+        MockGithub.return_value.rate_limiting = (5000, 5000)
+        MockGithub.return_value.rate_limiting_resettime = 0
+        yield MockGithub, MockCredly, MockGithubRepo, mock_update
+
+
+def test_load_manifest_json(tmp_path):
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "jobs": [
+                    {"credly_username": "alice", "github_repo": "alice/alice", "github_branch": "master"},
+                    {"credly_username": "bob", "github_repo": "bob/bob", "readme_file": "docs/index.md, docs/a.md"},
+                ]
+            }
+        )
+    )
+
+    jobs = load_manifest(manifest)
+
+    assert jobs[0] == BatchJob(credly_username="alice", github_repo="alice/alice", github_branch="master")
+    assert jobs[0].readme_files == ("README.md",)
+    assert jobs[1].readme_files == ("docs/index.md", "docs/a.md")
+    assert jobs[1].github_branch == "main"
+
+
+def test_load_manifest_csv(tmp_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text("credly_username,github_repo,github_branch\nalice,alice/alice,\nbob,bob/bob,dev\n")
+
+    jobs = load_manifest(manifest)
+
+    assert [job.credly_username for job in jobs] == ["alice", "bob"]
+    assert jobs[0].github_branch == "main"
+    assert jobs[1].github_branch == "dev"
+
+
+def test_load_manifest_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    manifest = tmp_path / "jobs.yaml"
+    manifest.write_text("- credly_username: alice\n  github_repo: alice/alice\n")
+
+    assert load_manifest(manifest) == [BatchJob(credly_username="alice", github_repo="alice/alice")]
+
+
+def test_load_manifest_yaml_without_pyyaml(tmp_path):
+    manifest = tmp_path / "jobs.yml"
+    manifest.write_text("[]")
+
+    with patch.dict("sys.modules", {"yaml": None}), pytest.raises(ImportError):
+        load_manifest(manifest)
+
+
+@pytest.mark.parametrize(
+    ("filename", "content"),
+    [
+        ("jobs.txt", ""),
+        ("jobs.json", '"not a list"'),
+        ("jobs.json", '["not a mapping"]'),
+        ("jobs.json", '[{"credly_username": "alice"}]'),
+        ("jobs.json", '[{"credly_username": "alice", "github_repo": "a/a", "typo": "x"}]'),
+    ],
+)
+def test_load_manifest_invalid(tmp_path, filename, content):
+    manifest = tmp_path / filename
+    manifest.write_text(content)
+
+    with pytest.raises(ValueError):
+        load_manifest(manifest)
+
+
+def test_run_batch_collects_results_in_order(mock_pipeline):
+    MockGithub, _MockCredly, MockGithubRepo, mock_update = mock_pipeline
+    jobs = [BatchJob(credly_username=f"user{i}", github_repo=f"user{i}/repo") for i in range(5)]
+    mock_update.return_value = True
+
+    results = run_batch(jobs, gh_token="token", concurrency=3)
+
+    assert [result.job for result in results] == jobs
+    assert all(result.status == batch.STATUS_UPDATED for result in results)
+    MockGithub.assert_called_once_with(
+        base_url="https://api.github.com", login_or_token="token", pool_size=3, seconds_between_writes=None
+    )
+    for call in MockGithubRepo.call_args_list:
+        assert call.kwargs["gh"] is MockGithub.return_value
+
+
+def test_run_batch_spaces_commits_by_write_interval(mock_pipeline):
+    _MockGithub, _MockCredly, MockGithubRepo, _mock_update = mock_pipeline
+    jobs = [BatchJob(credly_username="alice", github_repo="alice/alice")]
+
+    run_batch(jobs, gh_token="token", write_interval=0.5)
+
+    assert MockGithubRepo.call_args.kwargs["scheduler"].write_interval == 0.5  # noqa: PLR2004
+
+
+def test_batch_renders_every_file_of_readme_file_setting(stub_server, tmp_path):
+    readme = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+    stub_server.badges["alice"] = [
+        {"id": "1", "issued_at": "2024-01-01T00:00:00.000+00:00", "badge_template": {"name": "Badge", "image_url": "i"}}
+    ]
+    for path in ("a.md", "b.md"):
+        stub_server.add_file("alice/alice", path, readme)
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text('[{"credly_username": "alice", "github_repo": "alice/alice"}]')
+    env = {
+        **os.environ,
+        "README_FILE": "a.md,b.md",
+        "GITHUB_TOKEN": "token",
+        "GITHUB_API_URL": stub_server.url,
+        "CREDLY_API_URL": stub_server.url,
+        "GITHUB_WRITE_INTERVAL": "0",
+    }
+
+    # The defaults of batch jobs are read from the settings when the module is imported
+    command = [sys.executable, "-m", "readme_credly_badges.batch", str(manifest)]
+    subprocess.run(command, env=env, capture_output=True, check=True)  # noqa: S603
+
+    assert "[![Badge]" in stub_server.read_file("alice/alice", "a.md")
+    assert "[![Badge]" in stub_server.read_file("alice/alice", "b.md")
+    assert stub_server.count("PATCH", "/repos/alice/alice/git/refs/") == 1
+
+
+def test_run_batch_isolates_failures(mock_pipeline):
+    _MockGithub, _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    jobs = [BatchJob(credly_username="ok", github_repo="ok/ok"), BatchJob(credly_username="bad", github_repo="b/b")]
+
+    mock_update.side_effect = [False, ConnectionError("Credly down")]
+
+    results = run_batch(jobs, gh_token="token", concurrency=1)
+
+    assert results[0].status == batch.STATUS_UNCHANGED
+    assert results[1].status == batch.STATUS_FAILED
+    assert results[1].error == "Credly down"
+
+
+def test_run_batch_retries_rate_limited_job(mock_pipeline):
+    _MockGithub, _MockCredly, MockGithubRepo, mock_update = mock_pipeline
+    jobs = [BatchJob(credly_username="alice", github_repo="alice/alice")]
+    error = RuntimeError("Authentication failed.")
+    error.__cause__ = RateLimitExceededException(403, {"message": "secondary rate limit"}, {"retry-after": "0"})
+    mock_update.side_effect = [error, True]
+
+    results = run_batch(jobs, gh_token="token", concurrency=1)
+
+    assert results[0].status == batch.STATUS_UPDATED
+    assert mock_update.call_count == 2  # noqa: PLR2004
+    assert MockGithubRepo.call_args.kwargs["scheduler"] is not None
+
+
+def test_run_batch_gives_up_after_one_rate_limit_retry(mock_pipeline):
+    _MockGithub, _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    jobs = [BatchJob(credly_username="alice", github_repo="alice/alice")]
+    mock_update.side_effect = RateLimitExceededException(429, {"message": "slow down"}, {"retry-after": "0"})
+
+    results = run_batch(jobs, gh_token="token", concurrency=1)
+
+    assert results[0].status == batch.STATUS_FAILED
+    assert mock_update.call_count == 2  # noqa: PLR2004
+
+
+def test_run_job_without_scheduler_does_not_retry(mock_pipeline):
+    MockGithub, _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    job = BatchJob(credly_username="alice", github_repo="alice/alice")
+    mock_update.side_effect = RateLimitExceededException(403, {"message": "secondary rate limit"}, {})
+
+    result = batch.run_job(job, MockGithub.return_value, "https://api.github.com", "token")
+
+    assert result.status == batch.STATUS_FAILED
+    mock_update.assert_called_once()
+
+
+def test_run_batch_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        run_batch([], gh_token="token", concurrency=0)
+
+
+BADGE = {"id": "b1", "badge_template": {"name": "Badge", "image_url": "https://images.credly.com/images/b1.png"}}
+README = "# Profile\n<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+
+
+def test_run_batch_graphql_backend(stub_server, caplog):
+    jobs = [BatchJob(credly_username=f"user{i}", github_repo=f"user{i}/repo") for i in range(3)]
+    for i in range(2):
+        stub_server.badges[f"user{i}"] = [BADGE]
+        stub_server.add_file(f"user{i}/repo", "README.md", README)
+
+    with caplog.at_level(logging.INFO):
+        results = run_batch(jobs, "token", stub_server.url, credly_api_url=stub_server.url, backend="graphql")
+
+    assert [result.status for result in results] == ["updated", "updated", "failed"]
+    assert "(https://www.credly.com/badges/b1)" in stub_server.read_file("user1/repo", "README.md")
+    # All README files are read in one query, then each update is one mutation
+    assert stub_server.operations == ["ReadFiles", "CreateCommit", "CreateCommit"]
+    assert stub_server.count("GET", "/repos/") == 0
+    assert "GitHub GraphQL API usage: 1 queries costing 1 points, 2 mutations" in caplog.text
+
+
+def test_run_batch_graphql_backend_reads_one_by_one_if_prefetch_fails(stub_server, caplog):
+    stub_server.badges["user"] = [BADGE]
+    stub_server.add_file("user/repo", "README.md", README)
+
+    with caplog.at_level(logging.WARNING):
+        [result] = run_batch(
+            [BatchJob(credly_username="user", github_repo="user/repo")],
+            "wrong",
+            stub_server.url,
+            credly_api_url=stub_server.url,
+            backend="graphql",
+        )
+
+    assert result.status == "failed"
+    assert "Bad credentials" in result.error
+    assert "Failed to prefetch README files" in caplog.text
+
+
+def test_run_batch_rejects_invalid_backend():
+    with pytest.raises(ValueError):
+        run_batch([], "token", backend="soap")
+
+
+def test_summarize_counts_statuses():
+    job = BatchJob(credly_username="alice", github_repo="alice/alice")
+    results = [
+        batch.JobResult(job=job, status=batch.STATUS_UPDATED, duration=0.5),
+        batch.JobResult(job=job, status=batch.STATUS_FAILED, duration=0.25, error="boom"),
+    ]
+
+    summary = summarize(results)
+
+    assert summary["total"] == len(results)
+    assert summary["updated"] == 1
+    assert summary["unchanged"] == 0
+    assert summary["failed"] == 1
+    assert summary["jobs"][1]["error"] == "boom"
+    assert summary["jobs"][0]["credly_username"] == "alice"
+
+
+def test_main_writes_report(tmp_path, mock_pipeline, caplog):
+    caplog.set_level(logging.INFO)
+    _MockGithub, _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    mock_update.return_value = True
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text('[{"credly_username": "alice", "github_repo": "alice/alice"}]')
+    report = tmp_path / "report.json"
+
+    with patch.multiple(batch, GITHUB_TOKEN="token", CREDLY_CACHE_DIR=str(tmp_path / "cache")):
+        exit_code = batch.main([str(manifest), "--concurrency", "2", "--report", str(report)])
+
+    assert exit_code == 0
+    assert json.loads(report.read_text())["updated"] == 1
+    assert "Batch finished: 1 updated" in caplog.text
+    assert "Credly cache: 0 hits, 0 misses." in caplog.text
+
+
+def test_main_returns_failure_exit_code(tmp_path, mock_pipeline):
+    _MockGithub, _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    mock_update.side_effect = RuntimeError("Authentication failed.")
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text('[{"credly_username": "alice", "github_repo": "alice/alice"}]')
+
+    with patch.object(batch, "GITHUB_TOKEN", "token"):
+        assert batch.main([str(manifest)]) == 1
+
+
+def test_main_requires_token(tmp_path):
+    with patch.object(batch, "GITHUB_TOKEN", None), pytest.raises(ValueError):
+        batch.main([str(tmp_path / "jobs.json")])
+
+
+def test_main_async_engine(tmp_path):
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text('[{"credly_username": "alice", "github_repo": "alice/alice"}]')
+    job = BatchJob(credly_username="alice", github_repo="alice/alice")
+
+    async def fake_run_batch(jobs, **_kwargs):
+        return [batch.JobResult(job=jobs[0], status=batch.STATUS_UNCHANGED, duration=0.1)]
+
+    with (
+        patch.object(batch, "GITHUB_TOKEN", "token"),
+        patch("readme_credly_badges.aio.run_batch", side_effect=fake_run_batch) as mock_run,
+    ):
+        assert batch.main([str(manifest), "--engine", "async"]) == 0
+
+    assert mock_run.call_args.args[0] == [job]
+
+
+def test_main_dry_run_reports_changes_without_saving(tmp_path, mock_pipeline):
+    _MockGithub, _MockCredly, MockGithubRepo, mock_update = mock_pipeline
+    MockGithubRepo.return_value.target_for.side_effect = lambda path: f"alice/alice@main:{path}"
+    MockGithubRepo.return_value.get_file.return_value = "old\n"
+
+    def preview_update(**kwargs):
+        assert "fingerprints" not in kwargs
+        github_repo = kwargs["github_repo"]
+        github_repo.get_file("README.md")
+        github_repo.save_files({"README.md": "new\n"})
+        return True
+
+    mock_update.side_effect = preview_update
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text('[{"credly_username": "alice", "github_repo": "alice/alice"}]')
+    report, diff = tmp_path / "report.json", tmp_path / "changes.diff"
+
+    with patch.object(batch, "GITHUB_TOKEN", "token"):
+        exit_code = batch.main([str(manifest), "--dry-run", "--report", str(report), "--diff", str(diff)])
+
+    assert exit_code == 0
+    MockGithubRepo.return_value.save_files.assert_not_called()
+    [job] = json.loads(report.read_text())["jobs"]
+    assert job["changes"] == [{"target": "alice/alice@main:README.md", "added": [], "removed": [], "bytes_changed": 0}]
+    assert diff.read_text() == "--- a/README.md\n+++ b/README.md\n@@ -1 +1 @@\n-old\n+new\n"
+
+
+def test_main_resumes_interrupted_run_from_journal(tmp_path, mock_pipeline):
+    _MockGithub, _MockCredly, MockGithubRepo, mock_update = mock_pipeline
+    MockGithubRepo.side_effect = lambda **kwargs: MagicMock(
+        target=f"{kwargs['repository']}@{kwargs['branch']}:{kwargs['readme_filename']}", shas={"README.md": "sha"}
+    )
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(
+        '[{"credly_username": "alice", "github_repo": "alice/alice"}, {"credly_username": "bob", "github_repo": "b/b"}]'
+    )
+    journal, report = tmp_path / "journal.jsonl", tmp_path / "report.json"
+
+    def update(**kwargs):
+        assert isinstance(kwargs["fingerprints"], Journal)
+        if kwargs["github_repo"].target.startswith("b/b"):
+            raise RuntimeError("interrupted")
+        return True
+
+    mock_update.side_effect = update
+    with patch.object(batch, "GITHUB_TOKEN", "token"):
+        assert batch.main([str(manifest), "--journal", str(journal)]) == 1
+        mock_update.side_effect = None
+        mock_update.return_value = False
+        assert batch.main([str(manifest), "--journal", str(journal), "--resume", "--report", str(report)]) == 0
+
+    summary = json.loads(report.read_text())
+    assert [job["status"] for job in summary["jobs"]] == ["skipped", "unchanged"]
+    assert summary["skipped"] == 1
+    records = [json.loads(line) for line in journal.read_text().splitlines()]
+    # The first run's jobs finish in any order
+    assert sorted((record["target"], record["status"]) for record in records[:2]) == [
+        ("alice/alice@main:README.md", "updated"),
+        ("b/b@main:README.md", "failed"),
+    ]
+    assert (records[2]["target"], records[2]["status"], records[2]["sha"]) == ("b/b@main:README.md", "unchanged", "sha")
+
+
+def test_main_runs_one_shard(tmp_path, mock_pipeline):
+    _MockGithub, MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    mock_update.return_value = True
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(json.dumps([{"credly_username": f"user{i}", "github_repo": f"user{i}/repo"} for i in range(6)]))
+    report = tmp_path / "report.json"
+
+    with patch.object(batch, "GITHUB_TOKEN", "token"):
+        assert batch.main([str(manifest), "--shard-index", "1", "--shard-count", "3", "--report", str(report)]) == 0
+
+    summary = json.loads(report.read_text())
+    assert [job["credly_username"] for job in summary["jobs"]] == ["user0", "user2"]
+    assert summary["shard"] == {"index": 1, "count": 3}
+    assert MockCredly.call_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--shard-index", "2", "--shard-count", "2"],
+        ["--shard-count", "0"],
+        ["--resume"],
+        ["--journal", "j.jsonl", "--dry-run"],
+        ["--journal", "j.jsonl", "--engine", "async"],
+        ["--backend", "graphql", "--engine", "async"],
+        ["--diff", "changes.diff"],
+    ],
+)
+def test_main_rejects_invalid_journal_options(tmp_path, args):
+    with pytest.raises(SystemExit):
+        batch.main([str(tmp_path / "jobs.json"), *args])
+
+
+def test_parse_args_defaults_to_repo_backend():
+    with patch("readme_credly_badges.batch.REPO_BACKEND", "graphql"):
+        assert batch.parse_args(["jobs.json"]).backend == "graphql"
+    with patch("readme_credly_badges.batch.REPO_BACKEND", "local"), pytest.raises(SystemExit):
+        batch.parse_args(["jobs.json"])
+    assert batch.parse_args(["jobs.json", "--backend", "api"]).backend == "api"
+
+
+def test_main_dry_run_requires_threads_engine(tmp_path):
+    with pytest.raises(SystemExit):
+        batch.main([str(tmp_path / "jobs.json"), "--dry-run", "--engine", "async"])
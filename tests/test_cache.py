@@ -0,0 +1,86 @@
+"""Test cases for the on-disk HTTP cache."""
+
+import time
+
+from readme_credly_badges.cache import CacheEntry, HttpCache, ReadmeCache, ReadmeEntry
+from readme_credly_badges.models import Badge
+
+URL = "https://www.credly.com/users/testuser/badges.json"
+BADGES = [Badge(name="Python Pro", url="https://www.credly.com/badges/1", image_url="img.png")]
+TARGET = "user/repo@main:README.md"
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    cache.put(CacheEntry(url=URL, sort_by="issued", badges=BADGES, etag='"abc"'))
+
+    entry = cache.get(URL, "issued")
+
+    assert entry is not None
+    assert entry.badges == BADGES
+    assert entry.etag == '"abc"'
+    assert list((tmp_path / "cache").glob("*.tmp")) == []
+
+
+def test_get_missing_or_other_sort_order(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.put(CacheEntry(url=URL, sort_by="issued", badges=BADGES))
+
+    assert cache.get("https://example.com/other.json", "issued") is None
+    assert cache.get(URL, "updated") is None
+    assert cache.get(URL, None).sort_by == "issued"
+
+
+def test_get_ignores_corrupt_entry(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.put(CacheEntry(url=URL, sort_by="issued", badges=BADGES))
+    next(tmp_path.glob("*.json")).write_text("{not json")
+
+    assert cache.get(URL, "issued") is None
+
+
+def test_entry_freshness():
+    entry = CacheEntry(url=URL, sort_by="issued", badges=[], stored_at=time.time())
+
+    assert entry.is_fresh(60)
+    assert not entry.is_fresh(0)
+    entry.stored_at -= 120
+    assert not entry.is_fresh(60)
+
+
+def test_entry_conditional_headers():
+    assert CacheEntry(url=URL, sort_by="issued", badges=[]).conditional_headers() == {}
+
+    entry = CacheEntry(url=URL, sort_by="issued", badges=[], etag='"abc"', last_modified="Mon, 01 Jan 2024")
+    assert entry.conditional_headers() == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024"}
+
+
+def test_stats_are_logged(tmp_path, caplog):
+    caplog.set_level("INFO")
+    cache = HttpCache(str(tmp_path))
+    cache.record(hit=True)
+    cache.record(hit=True)
+    cache.record(hit=False)
+
+    cache.log_stats()
+
+    assert "Credly cache: 2 hits, 1 misses." in caplog.text
+
+
+def test_readme_cache_round_trip(tmp_path, caplog):
+    cache = ReadmeCache(str(tmp_path / "readmes"))
+    cache.put(ReadmeEntry(target=TARGET, etag='"abc"', sha="sha", content="# Profile\n"))
+
+    assert cache.get(TARGET) == ReadmeEntry(target=TARGET, etag='"abc"', sha="sha", content="# Profile\n")
+    assert cache.get("user/repo@dev:README.md") is None
+    assert list((tmp_path / "readmes").glob("*.tmp")) == []
+
+    next((tmp_path / "readmes").glob("*.json")).write_text('{"target": "other"}')
+    caplog.set_level("INFO")
+    assert cache.get(TARGET) is None
+    assert "Ignoring unreadable README cache entry" in caplog.text
+
+    cache.record(hit=True)
+    cache.record(hit=False)
+    cache.log_stats()
+    assert "README cache: 1 hits, 1 misses." in caplog.text
@@ -1,9 +1,12 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
 from readme_credly_badges.adapter import Credly
+from readme_credly_badges.adapter.credly import parse_badges, total_pages
+from readme_credly_badges.cache import HttpCache
 
 # Sample valid badge data
 VALID_BADGE = {
@@ -23,29 +26,35 @@ BADGES_WITH_MISSING_FIELDS = [
 ]
 
 
-@patch("readme_credly_badges.adapter.credly.requests.get")
+def set_payload(response, payload):
+    """Serve ``payload`` both as a streamed body and as decoded JSON."""
+    response.json.return_value = payload
+    response.iter_content.return_value = [json.dumps(payload).encode("utf-8")]
+
+
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
 def test_fetch_valid_badges(mock_get):
     """Test that valid badges are returned correctly."""
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {"data": [VALID_BADGE]}
+    set_payload(mock_response, {"data": [VALID_BADGE]})
     mock_get.return_value = mock_response
 
     credly = Credly("testuser")
     badges = credly.fetch_badges()
 
     assert len(badges) == 1
-    assert badges[0]["name"] == "Python Pro"
-    assert badges[0]["url"] == "https://www.credly.com/badges/123456"
-    assert badges[0]["image_url"] == "https://example.com/image.png"
+    assert badges[0].name == "Python Pro"
+    assert badges[0].url == "https://www.credly.com/badges/123456"
+    assert badges[0].image_url == "https://example.com/image.png"
 
 
-@patch("readme_credly_badges.adapter.credly.requests.get")
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
 def test_fetch_skips_incomplete_badges(mock_get):
     """Test that incomplete badges are skipped."""
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {"data": BADGES_WITH_MISSING_FIELDS}
+    set_payload(mock_response, {"data": BADGES_WITH_MISSING_FIELDS})
     mock_get.return_value = mock_response
 
     credly = Credly("testuser")
@@ -54,7 +63,7 @@ def test_fetch_skips_incomplete_badges(mock_get):
     assert badges == []
 
 
-@patch("readme_credly_badges.adapter.credly.requests.get")
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
 def test_fetch_handles_http_error(mock_get):
     """Test that HTTP errors raise a ConnectionError."""
     mock_response = MagicMock()
@@ -66,7 +75,7 @@ def test_fetch_handles_http_error(mock_get):
         credly.fetch_badges()
 
 
-@patch("readme_credly_badges.adapter.credly.requests.get")
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
 def test_fetch_handles_network_error(mock_get):
     """Test that request exceptions raise a ConnectionError."""
     mock_get.side_effect = requests.exceptions.RequestException("Network down")
@@ -76,15 +85,142 @@ def test_fetch_handles_network_error(mock_get):
         credly.fetch_badges()
 
 
-@patch("readme_credly_badges.adapter.credly.requests.get")
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
 def test_fetch_handles_missing_data_key(mock_get):
     """Test fallback if 'data' key is missing."""
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {}
+    set_payload(mock_response, {})
     mock_get.return_value = mock_response
 
     credly = Credly("testuser")
     badges = credly.fetch_badges()
 
     assert badges == []
+
+
+def _response(status_code, data=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    set_payload(response, {"data": data or []})
+    response.headers = headers or {}
+    return response
+
+
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
+def test_fetch_revalidates_cached_badges(mock_get, tmp_path):
+    """Test that a 304 answer is served from the cache without parsing the body."""
+    cache = HttpCache(str(tmp_path))
+    mock_get.return_value = _response(200, [VALID_BADGE], {"ETag": '"v1"'})
+    first = Credly("testuser", cache=cache)
+    badges = first.fetch_badges()
+
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert mock_get.call_args.kwargs["headers"] == {}
+
+    not_modified = _response(304)
+    mock_get.return_value = not_modified
+    second = Credly("testuser", cache=cache)
+
+    assert second.fetch_badges() == badges
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    not_modified.json.assert_not_called()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
+def test_fetch_serves_fresh_entries_without_request(mock_get, tmp_path):
+    """Test that entries younger than the TTL skip the HTTP request entirely."""
+    cache = HttpCache(str(tmp_path), ttl=3600)
+    mock_get.return_value = _response(200, [VALID_BADGE])
+    Credly("testuser", cache=cache).fetch_badges()
+
+    credly = Credly("testuser", cache=cache)
+    badges = credly.fetch_badges()
+
+    assert mock_get.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert badges[0].name == "Python Pro"
+
+
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
+def test_fetch_offline_resorts_cached_badges(mock_get, tmp_path):
+    """Test that offline mode serves cached badges of any age and order without a request."""
+    cache = HttpCache(str(tmp_path))
+    newer = {**VALID_BADGE, "id": "2", "issued_at": "2024-01-01T00:00:00"}
+    older = {"id": "1", "issued_at": "2023-01-01T00:00:00", "badge_template": {"name": "A", "image_url": "a.png"}}
+    mock_get.return_value = _response(200, [newer, older])
+    Credly("testuser", cache=cache).fetch_badges()
+
+    with patch("readme_credly_badges.adapter.credly.BADGE_SORT_BY", "name"):
+        credly = Credly("testuser", cache=cache, offline=True)
+        badges = credly.fetch_badges()
+
+    assert mock_get.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert [badge.name for badge in badges] == ["A", "Python Pro"]
+
+
+def test_fetch_offline_requires_cached_badges(tmp_path):
+    with pytest.raises(ConnectionError, match="No cached badges"):
+        Credly("testuser", cache=HttpCache(str(tmp_path)), offline=True).fetch_badges()
+
+
+@pytest.mark.parametrize("stream", [True, False])
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
+def test_fetch_with_and_without_streaming(mock_get, stream):
+    response = _response(200, [VALID_BADGE])
+    response.iter_content.return_value = [b'{"data": [', json.dumps(VALID_BADGE).encode("utf-8"), b"]}"]
+    mock_get.return_value = response
+
+    badges = Credly("testuser", stream=stream).fetch_badges()
+
+    assert [badge.name for badge in badges] == ["Python Pro"]
+    assert mock_get.call_args.kwargs["stream"] is stream
+    assert response.json.called is not stream
+    response.close.assert_called_once()
+
+
+def paged_badges(count):
+    return [
+        {
+            "id": f"b{i:03}",
+            "issued_at": f"2024-01-01T00:{i // 60:02}:{i % 60:02}+00:00",
+            "badge_template": {"name": f"Badge {i}", "image_url": f"https://images.credly.com/images/{i}.png"},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_fetch_merges_all_pages(stub_server, stream):
+    stub_server.badges["heavy"] = paged_badges(150)
+
+    badges = Credly("heavy", api_url=stub_server.url, stream=stream).fetch_badges()
+
+    assert [badge.name for badge in badges] == [f"Badge {i}" for i in reversed(range(150))]
+    assert stub_server.count("GET", "/users/heavy/") == 4  # noqa: PLR2004
+
+
+@patch("readme_credly_badges.adapter.credly.requests.Session.get")
+def test_fetch_fails_when_a_page_fails(mock_get):
+    response = _response(200, [VALID_BADGE])
+    set_payload(response, {"data": [VALID_BADGE], "metadata": {"total_pages": 3}})
+    mock_get.side_effect = [response, requests.exceptions.RequestException("Boom!"), response]
+
+    with pytest.raises(ConnectionError):
+        Credly("testuser").fetch_badges()
+
+
+@pytest.mark.parametrize(
+    ("metadata", "expected"),
+    [(None, 1), ({}, 1), ({"total_pages": "3"}, 1), ({"total_pages": 0}, 1), ({"total_pages": 3}, 3)],
+)
+def test_total_pages(metadata, expected):
+    assert total_pages(metadata) == expected
+
+
+def test_parse_badges_skips_duplicate_ids():
+    badges = parse_badges([VALID_BADGE, dict(VALID_BADGE, badge_template={"name": "Copy", "image_url": "x.png"})])
+
+    assert [badge.name for badge in badges] == ["Python Pro"]
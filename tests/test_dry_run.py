@@ -0,0 +1,72 @@
+"Test cases for dry-run mode in readme_credly_badges/dry_run.py"
+
+import io
+import json
+import logging
+from unittest.mock import MagicMock
+
+from readme_credly_badges.dry_run import FileChange, PreviewRepository, write_report
+
+OLD = "# Me\n[![A](a.png)](https://www.credly.com/badges/a1)\n[![B](b.png)](https://www.credly.com/badges/b2)\n"
+NEW = "# Me\n[![B](b.png)](https://www.credly.com/badges/b2)\n[![C](c.png)](https://www.credly.com/badges/c-3)\n"
+
+
+def test_file_change_between():
+    change = FileChange.between("user/repo@main:README.md", "README.md", OLD, NEW)
+
+    assert change.added == ["c-3"]
+    assert change.removed == ["a1"]
+    assert change.bytes_changed == len(NEW) - len(OLD)
+    assert change.diff.startswith("--- a/README.md\n+++ b/README.md\n")
+    assert "-[![A](a.png)](https://www.credly.com/badges/a1)\n" in change.diff
+    assert change.summary() == {
+        "target": "user/repo@main:README.md",
+        "added": ["c-3"],
+        "removed": ["a1"],
+        "bytes_changed": change.bytes_changed,
+    }
+
+
+def test_preview_repository_logs_message_body(caplog):
+    preview = PreviewRepository(MagicMock(readme_filename="README.md"))
+
+    with caplog.at_level(logging.INFO):
+        preview.save_files({"README.md": NEW}, message_body="Added: C")
+
+    assert "the commit message would list:\nAdded: C" in caplog.text
+
+
+def test_preview_repository_records_writes_instead_of_saving():
+    repository = MagicMock(readme_filename="README.md")
+    repository.target_for.side_effect = lambda path: f"user/repo@main:{path}"
+    repository.get_file.return_value = OLD
+    preview = PreviewRepository(repository)
+
+    assert preview.get_readme() == OLD
+    preview.save_readme(NEW)
+    preview.save_files({"badges.json": "[]\n", "assets/a1.png": b"\x89PNG"}, deletions=["assets/old.png"])
+
+    repository.save_files.assert_not_called()
+    repository.save_readme.assert_not_called()
+    assert [change.path for change in preview.changes] == ["README.md", "badges.json", "assets/a1.png", "assets/old.png"]
+    assert preview.changes[0].removed == ["a1"]
+    assert preview.changes[1].diff == "--- a/badges.json\n+++ b/badges.json\n@@ -0,0 +1 @@\n+[]\n"
+    assert preview.changes[2].diff == "Binary files a/assets/a1.png and b/assets/a1.png differ\n"
+    assert preview.changes[2].bytes_changed == len(b"\x89PNG")
+    assert preview.changes[3].diff == "Binary files a/assets/old.png and /dev/null differ\n"
+    assert preview.file_shas("assets") is repository.file_shas.return_value
+    assert preview.target is repository.target
+
+
+def test_write_report(tmp_path, caplog):
+    changes = [FileChange.between("user/repo@main:README.md", "README.md", OLD, NEW)]
+    out = io.StringIO()
+    report = tmp_path / "report.json"
+
+    write_report(changes, str(report), out=out)
+    with caplog.at_level(logging.INFO):
+        write_report(changes, out=io.StringIO())
+
+    assert out.getvalue() == changes[0].diff
+    assert json.loads(report.read_text())[0]["added"] == ["c-3"]
+    assert '"removed": [' in caplog.text
@@ -1,16 +1,29 @@
+import io
+import json
 import logging
 from unittest.mock import MagicMock, patch
 
 import pytest
+from github import Auth, Github
 
 import readme_credly_badges.entrypoint as main_module
+from readme_credly_badges.adapter import GithubRepo, GraphQLClient, GraphQLRepo, LocalRepo
+from readme_credly_badges.fingerprint import FingerprintStore, badge_fingerprint, read_fingerprint
+from readme_credly_badges.images import ImageStore
+from readme_credly_badges.models import Badge
+
+
+def make_repo():
+    github_repo = MagicMock(readme_filename="README.md")
+    github_repo.target_for.side_effect = lambda path: f"user/repo@main:{path}"
+    return github_repo
 
 
 def test_generate_new_readme_content_success():
     old_readme = "Header\n<!-- START CREDLY BADGES -->\nold badges\n<!-- END CREDLY BADGES -->\nFooter\n"
     badges = [
-        {"name": "Badge1", "image_url": "image1.png", "url": "http://url1"},
-        {"name": "Badge2", "image_url": "image2.png", "url": "http://url2"},
+        Badge(name="Badge1", image_url="image1.png", url="http://url1"),
+        Badge(name="Badge2", image_url="image2.png", url="http://url2"),
     ]
 
     expected_new_badges = "[![Badge1](image1.png)](http://url1)\n[![Badge2](image2.png)](http://url2)"
@@ -42,24 +55,24 @@ def test_main_happy_path(mock_githubrepo_cls, mock_credly_cls, caplog):
         GITHUB_REPO="repo",
         GITHUB_API_URL="https://api.github.com",
         GITHUB_BRANCH="main",
-        README_FILE="README.md",
+        README_FILES=["README.md"],
         COMMIT_MESSAGE="commit message",
     ):
         # Mock Credly instance and badges
         mock_credly = MagicMock()
         mock_credly.fetch_badges.return_value = [
-            {
-                "name": "Test Badge",
-                "image_url": "img.png",
-                "url": "http://badge.url",
-            }
+            Badge(
+                name="Test Badge",
+                image_url="img.png",
+                url="http://badge.url",
+            )
         ]
         mock_credly_cls.return_value = mock_credly
 
         # Mock GithubRepo instance and README contents
         mock_repo = MagicMock()
         old_readme_content = "Intro\n<!-- START CREDLY BADGES -->\nold\n<!-- END CREDLY BADGES -->\nOutro"
-        mock_repo.get_readme.return_value = old_readme_content
+        mock_repo.get_file.return_value = old_readme_content
         mock_githubrepo_cls.return_value = mock_repo
 
         # Run main
@@ -67,11 +80,11 @@ def test_main_happy_path(mock_githubrepo_cls, mock_credly_cls, caplog):
 
         # Check methods called as expected
         mock_credly.fetch_badges.assert_called_once()
-        mock_repo.get_readme.assert_called_once()
-        mock_repo.save_readme.assert_called_once()
+        mock_repo.get_file.assert_called_once_with("README.md")
+        mock_repo.save_files.assert_called_once()
 
         # The new README content saved should contain the badge markdown
-        saved_content = mock_repo.save_readme.call_args[1]["new_content"]
+        saved_content = mock_repo.save_files.call_args.args[0]["README.md"]
         assert "![Test Badge](img.png)" in saved_content
 
         # Logging info that README updated
@@ -89,11 +102,11 @@ def test_main_no_update_needed(mock_githubrepo_cls, mock_credly_cls, caplog):
         GITHUB_REPO="repo",
         GITHUB_API_URL="https://api.github.com",
         GITHUB_BRANCH="main",
-        README_FILE="README.md",
+        README_FILES=["README.md"],
         COMMIT_MESSAGE="commit message",
     ):
         mock_credly = MagicMock()
-        badges = [{"name": "Badge", "image_url": "img.png", "url": "http://url"}]
+        badges = [Badge(name="Badge", image_url="img.png", url="http://url")]
         mock_credly.fetch_badges.return_value = badges
         mock_credly_cls.return_value = mock_credly
 
@@ -101,12 +114,12 @@ def test_main_no_update_needed(mock_githubrepo_cls, mock_credly_cls, caplog):
         readme_content = f"Start\n<!-- START CREDLY BADGES -->\n{badge_markdown}\n<!-- END CREDLY BADGES -->\nEnd"
 
         mock_repo = MagicMock()
-        mock_repo.get_readme.return_value = readme_content
+        mock_repo.get_file.return_value = readme_content
         mock_githubrepo_cls.return_value = mock_repo
 
         main_module.main()
 
-        mock_repo.save_readme.assert_not_called()
+        mock_repo.save_files.assert_not_called()
         assert "README is already up to date." in caplog.text
 
 
@@ -122,3 +135,438 @@ def test_main_missing_env_vars():
         pytest.raises(ValueError),
     ):
         main_module.main()
+
+
+def test_update_readme_returns_whether_saved():
+    credly = MagicMock()
+    credly.fetch_badges.return_value = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    github_repo = MagicMock(readme_filename="README.md")
+    github_repo.get_file.return_value = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->"
+
+    assert main_module.update_readme(credly=credly, github_repo=github_repo) is True
+    github_repo.save_files.assert_called_once()
+
+    github_repo.get_file.return_value = github_repo.save_files.call_args.args[0]["README.md"]
+    assert main_module.update_readme(credly=credly, github_repo=github_repo) is False
+
+
+def test_update_readme_skips_github_when_fingerprint_recorded(tmp_path):
+    badges = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    credly = MagicMock()
+    credly.fetch_badges.return_value = badges
+    github_repo = make_repo()
+    fingerprints = FingerprintStore(str(tmp_path / "fingerprints.json"))
+    fingerprints.set("user/repo@main:README.md", main_module.update_fingerprint(badges))
+
+    assert main_module.update_readme(credly=credly, github_repo=github_repo, fingerprints=fingerprints) is False
+    github_repo.get_file.assert_not_called()
+    github_repo.save_files.assert_not_called()
+
+
+def test_update_readme_uses_embedded_fingerprint(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    badges = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    credly = MagicMock()
+    credly.fetch_badges.return_value = badges
+    github_repo = make_repo()
+    github_repo.get_file.return_value = main_module.generate_new_readme_content(
+        badges, "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->"
+    )
+    fingerprints = FingerprintStore(str(tmp_path / "fingerprints.json"))
+
+    with patch("readme_credly_badges.markers.render_block") as mock_render:
+        assert main_module.update_readme(credly=credly, github_repo=github_repo, fingerprints=fingerprints) is False
+
+    mock_render.assert_not_called()
+    github_repo.save_files.assert_not_called()
+    assert fingerprints.get("user/repo@main:README.md") == main_module.update_fingerprint(badges)
+    assert "README is already up to date." in caplog.text
+
+
+def test_update_readme_records_fingerprint_after_save(tmp_path):
+    badges = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    credly = MagicMock()
+    credly.fetch_badges.return_value = badges
+    github_repo = make_repo()
+    github_repo.get_file.return_value = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->"
+    fingerprints = FingerprintStore(str(tmp_path / "fingerprints.json"))
+
+    assert main_module.update_readme(credly=credly, github_repo=github_repo, fingerprints=fingerprints) is True
+
+    saved = github_repo.save_files.call_args.args[0]["README.md"]
+    assert read_fingerprint(saved) == badge_fingerprint(badges)
+    assert fingerprints.get("user/repo@main:README.md") == main_module.update_fingerprint(badges)
+
+
+def test_update_readme_saves_all_changed_files_in_one_commit(tmp_path):
+    badges = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    credly = MagicMock()
+    credly.fetch_badges.return_value = badges
+    block = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->"
+    current = main_module.generate_new_readme_content(badges, block)
+    files = {
+        "README.md": block,
+        "docs/index.md": current,
+        "docs/about.md": f"<!-- START CREDLY BADGES limit=1 -->\n<!-- END CREDLY BADGES -->\n{current}",
+    }
+    github_repo = make_repo()
+    github_repo.get_file.side_effect = files.__getitem__
+    fingerprints = FingerprintStore(str(tmp_path / "fingerprints.json"))
+
+    assert main_module.update_readme(credly, github_repo, fingerprints, paths=list(files)) is True
+
+    github_repo.save_files.assert_called_once()
+    assert list(github_repo.save_files.call_args.args[0]) == ["README.md", "docs/about.md"]
+    assert all(fingerprints.get(f"user/repo@main:{path}") for path in files)
+
+
+def test_update_readme_lists_badge_changes_in_commit_message():
+    old = [
+        Badge(name="Old", image_url="old.png", url="https://www.credly.com/badges/o1", id="o1"),
+        Badge(name="Kept", image_url="kept.png", url="https://www.credly.com/badges/k2", id="k2"),
+    ]
+    new = [old[1], Badge(name="New", image_url="new.png", url="https://www.credly.com/badges/n3", id="n3")]
+    block = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->"
+    credly = MagicMock()
+    credly.fetch_badges.return_value = new
+    github_repo = make_repo()
+    github_repo.get_file.side_effect = {
+        "README.md": main_module.generate_new_readme_content(old, block),
+        "badges.json": main_module.generate_file_content("badges.json", old, ""),
+    }.__getitem__
+
+    assert main_module.update_readme(credly, github_repo, paths=["README.md", "badges.json"]) is True
+
+    assert github_repo.save_files.call_args.kwargs["message_body"] == "Added: New\nRemoved: o1"
+
+
+def test_update_readme_propagates_missing_markers():
+    credly = MagicMock()
+    credly.fetch_badges.return_value = []
+    github_repo = make_repo()
+    github_repo.get_file.side_effect = ["<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->", "No markers."]
+
+    with pytest.raises(ValueError):
+        main_module.update_readme(credly, github_repo, paths=["README.md", "docs/index.md"])
+
+    github_repo.save_files.assert_not_called()
+
+
+@patch("readme_credly_badges.entrypoint.update_readme")
+@patch("readme_credly_badges.entrypoint.GithubRepo")
+def test_main_uses_credly_cache(_mock_githubrepo_cls, _mock_update, tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    with patch.multiple(
+        "readme_credly_badges.entrypoint",
+        CREDLY_USERNAME="user",
+        GITHUB_TOKEN="token",
+        GITHUB_REPO="repo",
+        CREDLY_CACHE_DIR=str(tmp_path),
+    ):
+        main_module.main()
+
+    assert "Credly cache: 0 hits, 0 misses." in caplog.text
+    _mock_update.assert_called_once()
+    assert isinstance(_mock_update.call_args.kwargs["fingerprints"], FingerprintStore)
+
+
+def test_open_repository_local_backend(tmp_path):
+    with patch.multiple(
+        "readme_credly_badges.entrypoint",
+        REPO_BACKEND="local",
+        LOCAL_REPO_PATH=str(tmp_path),
+        LOCAL_GIT_PUSH=False,
+        README_FILES=["docs/index.md"],
+        GITHUB_TOKEN=None,
+    ):
+        repo = main_module.open_repository()
+
+    assert isinstance(repo, LocalRepo)
+    assert repo.file_path == tmp_path / "docs" / "index.md"
+    assert repo.push is False
+
+
+@patch("readme_credly_badges.entrypoint.GithubRepo")
+def test_open_repository_api_backend(mock_githubrepo_cls):
+    with patch.multiple(
+        "readme_credly_badges.entrypoint", REPO_BACKEND="api", GITHUB_TOKEN="token", GITHUB_REPO="user/repo"
+    ):
+        assert main_module.open_repository() is mock_githubrepo_cls.return_value
+
+
+def test_open_repository_graphql_backend():
+    with patch.multiple(
+        "readme_credly_badges.entrypoint",
+        REPO_BACKEND="graphql",
+        GITHUB_API_URL="https://github.example.com/api/v3",
+        GITHUB_TOKEN="token",
+        GITHUB_REPO="user/repo",
+    ):
+        repo = main_module.open_repository()
+
+    assert isinstance(repo, GraphQLRepo)
+    assert repo.client.url == "https://github.example.com/api/graphql"
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"REPO_BACKEND": "ftp"},
+        {"REPO_BACKEND": "api", "GITHUB_TOKEN": None},
+    ],
+)
+def test_open_repository_invalid_configuration(settings):
+    with patch.multiple("readme_credly_badges.entrypoint", **settings), pytest.raises(ValueError):
+        main_module.open_repository()
+
+
+@patch("readme_credly_badges.entrypoint.Credly")
+def test_main_local_backend(mock_credly_cls, tmp_path):
+    mock_credly_cls.return_value.fetch_badges.return_value = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    (tmp_path / "README.md").write_text("<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n")
+
+    with patch.multiple(
+        "readme_credly_badges.entrypoint",
+        CREDLY_USERNAME="user",
+        GITHUB_TOKEN=None,
+        GITHUB_REPO=None,
+        REPO_BACKEND="local",
+        LOCAL_REPO_PATH=str(tmp_path),
+        LOCAL_GIT_PUSH=False,
+        README_FILES=["README.md"],
+    ):
+        main_module.main()
+
+    assert "[![Badge](img.png)](http://url)" in (tmp_path / "README.md").read_text()
+
+
+def test_update_readme_creates_generated_files():
+    badges = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    credly = MagicMock()
+    credly.fetch_badges.return_value = badges
+    github_repo = make_repo()
+    github_repo.get_file.side_effect = FileNotFoundError("missing")
+
+    assert main_module.update_readme(credly, github_repo, paths=["badges.json"]) is True
+
+    saved = github_repo.save_files.call_args.args[0]["badges.json"]
+    assert json.loads(saved) == [{"name": "Badge", "url": "http://url", "image_url": "img.png"}]
+
+    with pytest.raises(FileNotFoundError):
+        main_module.update_readme(credly, github_repo, paths=["README.md"])
+
+
+@patch("readme_credly_badges.entrypoint.Credly")
+def test_main_dry_run_writes_nothing(mock_credly_cls, tmp_path, capsys):
+    mock_credly_cls.return_value.fetch_badges.return_value = [
+        Badge(name="Badge", image_url="img.png", url="https://www.credly.com/badges/b1", id="b1")
+    ]
+    readme = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+    (tmp_path / "README.md").write_text(readme)
+    report = tmp_path / "report.json"
+
+    with patch.multiple(
+        "readme_credly_badges.entrypoint",
+        CREDLY_USERNAME="user",
+        REPO_BACKEND="local",
+        LOCAL_REPO_PATH=str(tmp_path),
+        README_FILES=["README.md"],
+        DRY_RUN=True,
+        DRY_RUN_REPORT=str(report),
+    ):
+        main_module.main()
+
+    assert (tmp_path / "README.md").read_text() == readme
+    assert "+[![Badge](img.png)](https://www.credly.com/badges/b1)" in capsys.readouterr().out
+    [summary] = json.loads(report.read_text())
+    assert summary["added"] == ["b1"]
+    assert summary["target"].endswith(":README.md")
+
+
+def image_store(tmp_path):
+    out = io.BytesIO()
+    pytest.importorskip("PIL.Image").new("RGB", (300, 300), "blue").save(out, format="PNG")
+    session = MagicMock()
+    session.get.return_value.content = out.getvalue()
+    return ImageStore(str(tmp_path / "images"), "assets/credly", size="100x100", session=session)
+
+
+def test_update_readme_commits_new_or_changed_images_with_readme(stub_server, tmp_path):
+    badges = [
+        Badge(
+            name="A",
+            image_url="https://images.credly.com/images/a/a.png",
+            url="https://www.credly.com/badges/a1",
+            id="a1",
+        ),
+        Badge(
+            name="B",
+            image_url="https://images.credly.com/images/b/b.png",
+            url="https://www.credly.com/badges/b2",
+            id="b2",
+        ),
+    ]
+    credly = MagicMock()
+    credly.fetch_badges.return_value = badges
+    stub_server.add_file("user/repo", "docs/README.md", "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n")
+    gh = Github(base_url=stub_server.url, auth=Auth.Token("token"), retry=None, seconds_between_writes=None)
+    github_repo = GithubRepo("commit", stub_server.url, "token", "user/repo", "main", "docs/README.md", gh=gh)
+    images = image_store(tmp_path)
+    # b2 is already committed with the same content
+    stub_server.add_file("user/repo", "assets/credly/b2.png", images.resized(badges[1].image_url))
+
+    assert main_module.update_readme(credly, github_repo, images=images) is True
+
+    assert "[![A](../assets/credly/a1.png)](https://www.credly.com/badges/a1)" in stub_server.read_file(
+        "user/repo", "docs/README.md"
+    )
+    assert stub_server.files["user/repo", "assets/credly/a1.png"] == images.resized(badges[0].image_url)
+    assert stub_server.count("POST", "/repos/user/repo/git/blobs") == 1
+    assert stub_server.count("PATCH") == 1
+
+    assert main_module.update_readme(credly, github_repo, images=images) is False
+
+
+def test_update_readme_deletes_images_of_removed_badges(stub_server, tmp_path):
+    badge = Badge(name="A", image_url="https://images.credly.com/images/a/a.png", url="http://url", id="a1")
+    credly = MagicMock()
+    credly.fetch_badges.return_value = [badge]
+    images = image_store(tmp_path)
+    readme = "<!-- START CREDLY BADGES -->\n[![A](assets/credly/a1.png)](http://url)\n<!-- END CREDLY BADGES -->\n"
+    stub_server.add_file("user/repo", "README.md", readme)
+    stub_server.add_file("user/repo", "assets/credly/a1.png", images.resized(badge.image_url))
+    stub_server.add_file("user/repo", "assets/credly/old.png", b"\x89PNG")
+    gh = Github(base_url=stub_server.url, auth=Auth.Token("token"), retry=None, seconds_between_writes=None)
+    github_repo = GithubRepo("commit", stub_server.url, "token", "user/repo", "main", "README.md", gh=gh)
+
+    assert main_module.update_readme(credly, github_repo, images=images) is True
+
+    assert ("user/repo", "assets/credly/old.png") not in stub_server.files
+    assert stub_server.read_file("user/repo", "README.md") == readme
+    assert stub_server.count("PATCH") == 1
+    assert main_module.update_readme(credly, github_repo, images=images) is False
+
+
+@pytest.mark.parametrize(
+    ("setting", "value"), [("BADGE_FORMAT", "html"), ("BADGE_COLUMNS", 3), ("BADGE_SORT_BY", "name")]
+)
+def test_update_fingerprint_depends_on_rendering_settings(setting, value):
+    badges = [Badge(name="Badge", image_url="img.png", url="http://url", id="b1")]
+    fingerprint = main_module.update_fingerprint(badges)
+
+    with patch.object(main_module, setting, value):
+        assert main_module.update_fingerprint(badges) != fingerprint
+
+
+def test_update_readme_fingerprint_depends_on_image_dir(tmp_path):
+    credly = MagicMock()
+    credly.fetch_badges.return_value = [Badge(name="Badge", image_url="img.png", url="http://url", id="b1")]
+    github_repo = make_repo()
+    fingerprints = FingerprintStore(str(tmp_path / "fingerprints.json"))
+    fingerprints.set("user/repo@main:README.md", main_module.update_fingerprint(credly.fetch_badges.return_value))
+    github_repo.file_shas.return_value = {}
+    github_repo.get_file.return_value = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+
+    assert main_module.update_readme(credly, github_repo, fingerprints, images=image_store(tmp_path)) is True
+    assert list(github_repo.save_files.call_args.args[0]) == ["README.md", "assets/credly/b1.png"]
+    github_repo.file_shas.assert_called_once_with("assets/credly")
+
+
+def test_update_readme_embeds_images_from_the_image_store():
+    credly = MagicMock()
+    credly.fetch_badges.return_value = [Badge(name="Badge", image_url="img.png", url="http://url", id="b1")]
+    github_repo = make_repo()
+    github_repo.get_file.side_effect = FileNotFoundError
+    images = MagicMock(directory="assets/credly")
+    images.load.return_value = b"png"
+
+    assert main_module.update_readme(credly, github_repo, paths=["badges.svg"], images=images) is True
+
+    images.load.assert_called_once_with("img.png")
+    images.files.assert_not_called()
+    assert "data:image/png;base64,cG5n" in github_repo.save_files.call_args.args[0]["badges.svg"]
+
+
+@patch("readme_credly_badges.entrypoint.Credly")
+def test_main_commits_badge_images(mock_credly_cls, tmp_path):
+    mock_credly_cls.return_value.fetch_badges.return_value = [
+        Badge(name="Badge", image_url="https://images.credly.com/images/a/a.png", url="http://url", id="b1")
+    ]
+    (tmp_path / "README.md").write_text("<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n")
+    store = image_store(tmp_path / "cache")
+
+    with (
+        patch.multiple(
+            "readme_credly_badges.entrypoint",
+            CREDLY_USERNAME="user",
+            REPO_BACKEND="local",
+            LOCAL_REPO_PATH=str(tmp_path),
+            LOCAL_GIT_PUSH=False,
+            README_FILES=["README.md"],
+            BADGE_IMAGE_DIR="assets/credly",
+            BADGE_SIZE="100x100",
+            CREDLY_CACHE_DIR=str(tmp_path / "cache"),
+        ),
+        patch("readme_credly_badges.entrypoint.create_session", return_value=store.session),
+    ):
+        main_module.main()
+
+    assert "[![Badge](assets/credly/b1.png)](http://url)" in (tmp_path / "README.md").read_text()
+    assert (tmp_path / "assets" / "credly" / "b1.png").read_bytes() == store.resized(
+        "https://images.credly.com/images/a/a.png"
+    )
+    assert (tmp_path / "cache" / "images" / "index.json").exists()
+
+
+def test_open_image_store_without_cache_dir_uses_a_temporary_directory(caplog):
+    with (
+        patch.multiple("readme_credly_badges.entrypoint", CREDLY_CACHE_DIR="", BADGE_IMAGE_DIR="assets/credly"),
+        caplog.at_level(logging.INFO),
+    ):
+        store = main_module.open_image_store()
+
+    assert store.cache_dir.name.startswith("credly-")
+    assert "badge images are downloaded again on every run" in caplog.text
+    store.cache_dir.rmdir()
+
+
+def edit_after_first_read(stub_server, github_repo, monkeypatch):
+    """Have someone else change the README (and so move the branch) right after the update first reads it."""
+    read = github_repo.get_file
+    edits = []
+
+    def get_file(path):
+        content = read(path)
+        if path == "README.md" and not edits:
+            edits.append(content.replace("# Profile", "# Edited profile"))
+            stub_server.add_file("user/repo", path, edits[0])
+            stub_server.heads["user/repo", "main"] = "e" * 40
+        return content
+
+    monkeypatch.setattr(github_repo, "get_file", get_file)
+
+
+@pytest.mark.parametrize(
+    ("backend", "paths"),
+    [("api", ["README.md"]), ("api", ["README.md", "badges.json"]), ("graphql", ["README.md"])],
+)
+def test_update_readme_keeps_changes_made_since_read(stub_server, monkeypatch, backend, paths):
+    stub_server.add_file(
+        "user/repo", "README.md", "# Profile\n<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+    )
+    stub_server.add_file("user/repo", "badges.json", "[]\n")
+    if backend == "api":
+        gh = Github(base_url=stub_server.url, auth=Auth.Token("token"), retry=None, seconds_between_writes=None)
+        github_repo = GithubRepo("commit", stub_server.url, "token", "user/repo", "main", "README.md", gh=gh)
+    else:
+        client = GraphQLClient(stub_server.url, "token")
+        github_repo = GraphQLRepo("commit", client, "user/repo", "main", "README.md")
+    credly = MagicMock()
+    credly.fetch_badges.return_value = [Badge(name="Badge", image_url="img.png", url="http://url", id="b1")]
+    edit_after_first_read(stub_server, github_repo, monkeypatch)
+
+    assert main_module.update_readme(credly, github_repo, paths=paths) is True
+
+    readme = stub_server.read_file("user/repo", "README.md")
+    assert readme.startswith("# Edited profile\n")
+    assert "[![Badge](img.png)](http://url)" in readme
@@ -0,0 +1,67 @@
+"""Test cases for badge fingerprints."""
+
+from readme_credly_badges.fingerprint import (
+    FingerprintStore,
+    badge_fingerprint,
+    fingerprint_comment,
+    read_fingerprint,
+    strip_fingerprint,
+)
+from readme_credly_badges.models import Badge
+
+BADGES = [
+    Badge(name="Badge1", image_url="image1.png", url="http://url1"),
+    Badge(name="Badge2", image_url="image2.png", url="http://url2"),
+]
+
+
+def test_fingerprint_is_stable_and_order_sensitive():
+    assert badge_fingerprint(BADGES) == badge_fingerprint([Badge.from_dict(badge.to_dict()) for badge in BADGES])
+    assert badge_fingerprint(BADGES) != badge_fingerprint(BADGES[::-1])
+    assert badge_fingerprint(BADGES) != badge_fingerprint(BADGES[:1])
+
+
+def test_fingerprint_covers_render_options():
+    assert badge_fingerprint(BADGES, "150x150") != badge_fingerprint(BADGES, "110x110")
+
+
+def test_read_and_strip_embedded_fingerprint():
+    fingerprint = badge_fingerprint(BADGES)
+    content = f"Intro\n<!-- START CREDLY BADGES -->\n{fingerprint_comment(fingerprint)}\nbadges\n"
+
+    assert read_fingerprint(content) == fingerprint
+    assert strip_fingerprint(content) == "Intro\n<!-- START CREDLY BADGES -->\nbadges\n"
+    assert read_fingerprint("no fingerprint here") is None
+
+
+def test_store_round_trip(tmp_path):
+    path = tmp_path / "state" / "fingerprints.json"
+    store = FingerprintStore(str(path))
+    assert store.get("user/repo@main:README.md") is None
+
+    store.set("user/repo@main:README.md", "abc")
+    store.save()
+
+    assert FingerprintStore(str(path)).get("user/repo@main:README.md") == "abc"
+
+
+def test_store_only_writes_changes(tmp_path):
+    path = tmp_path / "fingerprints.json"
+    store = FingerprintStore(str(path))
+    store.save()
+    assert not path.exists()
+
+    store.set("target", "abc")
+    store.save()
+    path.unlink()
+    store.set("target", "abc")
+    store.save()
+
+    assert not path.exists()
+
+
+def test_store_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "fingerprints.json"
+    path.write_text("{not json")
+
+    assert FingerprintStore(str(path)).get("target") is None
@@ -7,6 +7,10 @@ import pytest
 from github.GithubException import GithubException, UnknownObjectException
 
 from readme_credly_badges.adapter import GithubRepo
+from readme_credly_badges.adapter.base import WriteConflictError
+from readme_credly_badges.adapter.github_repo import blob_sha
+from readme_credly_badges.cache import ReadmeCache
+from readme_credly_badges.metrics import metrics
 
 
 @pytest.fixture
@@ -16,7 +20,7 @@ def mock_repo():
 
 @pytest.fixture
 def mock_github(mock_repo):
-    with patch("readme_credly_badges.adapter.github_repo.Github") as MockGithub:
+    with patch("github.Github") as MockGithub:
         MockGithub.return_value.get_repo.return_value = mock_repo
         yield MockGithub, mock_repo
 
@@ -51,18 +55,34 @@ def test_initialization_success(mock_github):
     assert repo.commit_message == "Init test"
 
 
+def test_initialization_makes_no_api_call(mock_github):
+    MockGithub, _mock_repo = mock_github
+
+    GithubRepo(
+        commit_message="Init test",
+        repository="user/repo",
+        gh_token="fake-token",
+        gh_api_url="https://api.github.com",
+        branch="main",
+        readme_filename="README.md",
+    )
+
+    MockGithub.return_value.get_repo.assert_not_called()
+
+
 def test_initialization_auth_failure():
-    with patch("readme_credly_badges.adapter.github_repo.Github") as MockGithub:
+    with patch("github.Github") as MockGithub:
         MockGithub.return_value.get_repo.side_effect = GithubException(401, {}, {})
+        repo = GithubRepo(
+            commit_message="fail",
+            repository="user/repo",
+            gh_token="bad-token",
+            gh_api_url="https://api.github.com",
+            branch="main",
+            readme_filename="README.md",
+        )
         with pytest.raises(RuntimeError):
-            GithubRepo(
-                commit_message="fail",
-                repository="user/repo",
-                gh_token="bad-token",
-                gh_api_url="https://api.github.com",
-                branch="main",
-                readme_filename="README.md",
-            )
+            repo.get_readme()
 
 
 def test_get_readme_success(github_repo):
@@ -112,9 +132,22 @@ def test_save_readme_success(github_repo):
         message=repo.commit_message,
         content="New Content",
         sha="fake-sha",
+        branch=repo.branch,
     )
 
 
+def test_save_readme_waits_for_scheduler(github_repo):
+    repo, mock_repo = github_repo
+    repo.scheduler = MagicMock()
+    repo.scheduler.before_write.side_effect = mock_repo.update_file.assert_not_called
+    mock_repo.get_contents.return_value.sha = "fake-sha"
+
+    repo.save_readme("New Content")
+
+    repo.scheduler.before_write.assert_called_once_with()
+    mock_repo.update_file.assert_called_once()
+
+
 def test_save_readme_file_not_found(github_repo):
     repo, mock_repo = github_repo
     mock_repo.get_contents.side_effect = UnknownObjectException(404, {}, {})
@@ -134,3 +167,305 @@ def test_save_readme_when_readme_is_directory(github_repo):
 
     assert f"{repo.readme_filename} is a directory" in str(exc_info.value)
     mock_repo.get_contents.assert_called_once_with(repo.readme_filename, ref=repo.branch)
+
+
+def test_initialization_reuses_shared_client():
+    with patch("github.Github") as MockGithub:
+        shared = MagicMock()
+        repo = GithubRepo(
+            commit_message="commit",
+            repository="user/repo",
+            gh_token="token",
+            gh_api_url="https://api.github.com",
+            branch="main",
+            readme_filename="README.md",
+            gh=shared,
+        )
+
+    MockGithub.assert_not_called()
+    assert repo.repo == shared.get_repo.return_value
+    shared.get_repo.assert_called_once_with("user/repo")
+
+
+def test_target_identifies_file(github_repo):
+    repo, _mock_repo = github_repo
+
+    assert repo.target == "test/repo@main:README.md"
+
+
+def test_save_readme_reuses_sha_from_read(github_repo):
+    repo, mock_repo = github_repo
+    mock_file = MagicMock()
+    mock_file.content = base64.b64encode(b"Old Content").decode("utf-8")
+    mock_file.sha = "read-sha"
+    mock_file.etag = 'W/"etag"'
+    mock_repo.get_contents.return_value = mock_file
+    mock_repo.update_file.return_value = {"content": MagicMock(sha="written-sha"), "commit": MagicMock()}
+
+    repo.get_readme()
+    repo.save_readme("New Content")
+    repo.save_readme("Newer Content")
+
+    mock_repo.get_contents.assert_called_once_with(repo.readme_filename, ref=repo.branch)
+    assert [call.kwargs["sha"] for call in mock_repo.update_file.call_args_list] == ["read-sha", "written-sha"]
+    assert repo.etags == {"README.md": 'W/"etag"'}
+
+
+@pytest.mark.parametrize("status", [409, 422])
+def test_save_readme_raises_on_sha_conflict(github_repo, status):
+    repo, mock_repo = github_repo
+    repo.shas["README.md"] = "stale-sha"
+    mock_repo.update_file.side_effect = GithubException(status, {}, {})
+
+    with pytest.raises(WriteConflictError):
+        repo.save_readme("New Content")
+
+    # The stale content is not written again: the caller reads the file and renders it anew
+    mock_repo.update_file.assert_called_once()
+    mock_repo.get_contents.assert_not_called()
+    assert repo.shas == {}
+
+
+def test_save_readme_raises_when_missing_file_was_created(github_repo):
+    repo, mock_repo = github_repo
+    repo.missing.add("README.md")
+    mock_repo.create_file.side_effect = GithubException(422, {}, {})
+
+    with pytest.raises(WriteConflictError):
+        repo.save_readme("New Content")
+
+    assert repo.missing == set()
+
+
+def test_save_readme_does_not_retry_other_errors(github_repo):
+    repo, mock_repo = github_repo
+    repo.shas["README.md"] = "sha"
+    mock_repo.update_file.side_effect = GithubException(500, {}, {})
+
+    with pytest.raises(GithubException):
+        repo.save_readme("New Content")
+
+    mock_repo.get_contents.assert_not_called()
+    mock_repo.update_file.assert_called_once()
+
+
+def test_save_files_commits_several_files_at_once(github_repo):
+    repo, mock_repo = github_repo
+    files = {"README.md": "Readme", "docs/index.md": "Docs"}
+
+    repo.save_files(files)
+
+    mock_repo.get_git_ref.assert_called_once_with("heads/main")
+    parent = mock_repo.get_git_commit.return_value
+    elements = mock_repo.create_git_tree.call_args.args[0]
+    assert [element._identity["path"] for element in elements] == list(files)
+    assert mock_repo.create_git_tree.call_args.kwargs["base_tree"] is parent.tree
+    mock_repo.create_git_commit.assert_called_once_with("commit", mock_repo.create_git_tree.return_value, [parent])
+    mock_repo.get_git_ref.return_value.edit.assert_called_once_with(mock_repo.create_git_commit.return_value.sha)
+    mock_repo.update_file.assert_not_called()
+    assert repo.shas == {"README.md": blob_sha("Readme"), "docs/index.md": blob_sha("Docs")}
+
+
+def test_save_files_adds_message_body(github_repo):
+    repo, mock_repo = github_repo
+
+    repo.save_files({"README.md": "Readme", "docs/index.md": "Docs"}, message_body="Added: Badge")
+    repo.save_files({"README.md": "Readme"}, message_body="Added: Badge")
+
+    assert mock_repo.update_file.call_args.kwargs["message"] == "commit\n\nAdded: Badge"
+    assert mock_repo.create_git_commit.call_args.args[0] == "commit\n\nAdded: Badge"
+
+
+def test_save_files_uploads_binary_files_as_blobs(github_repo):
+    repo, mock_repo = github_repo
+    mock_repo.create_git_blob.return_value.sha = "f" * 40
+
+    repo.save_files({"README.md": "Readme", "assets/b1.png": b"\x89PNG"})
+
+    mock_repo.create_git_blob.assert_called_once_with(base64.b64encode(b"\x89PNG").decode("ascii"), "base64")
+    [_, image] = mock_repo.create_git_tree.call_args.args[0]
+    assert image._identity == {"path": "assets/b1.png", "mode": "100644", "type": "blob", "sha": "f" * 40}
+    assert repo.shas["assets/b1.png"] == blob_sha(b"\x89PNG")
+
+
+def test_save_files_deletes_files_in_the_same_commit(github_repo):
+    repo, mock_repo = github_repo
+    repo.shas["assets/old.png"] = "sha"
+
+    repo.save_files({"README.md": "Readme"}, deletions=["assets/old.png"])
+
+    mock_repo.update_file.assert_not_called()
+    [_, deletion] = mock_repo.create_git_tree.call_args.args[0]
+    assert deletion._identity == {"path": "assets/old.png", "mode": "100644", "type": "blob", "sha": None}
+    assert "assets/old.png" not in repo.shas
+
+
+def test_file_shas_lists_directory(github_repo):
+    repo, mock_repo = github_repo
+    mock_repo.get_contents.return_value = [
+        MagicMock(type="file", path="assets/b1.png", sha="sha1"),
+        MagicMock(type="dir", path="assets/old", sha="sha2"),
+    ]
+
+    assert repo.file_shas("assets") == {"assets/b1.png": "sha1"}
+    mock_repo.get_contents.assert_called_once_with("assets", ref="main")
+
+
+def test_file_shas_of_missing_directory_or_file(github_repo):
+    repo, mock_repo = github_repo
+    mock_repo.get_contents.side_effect = UnknownObjectException(404, {}, {})
+    assert repo.file_shas("assets") == {}
+
+    mock_repo.get_contents.side_effect = None
+    mock_repo.get_contents.return_value = MagicMock(type="file")
+    with pytest.raises(ValueError):
+        repo.file_shas("README.md")
+
+
+def test_save_files_raises_when_branch_moved(github_repo):
+    repo, mock_repo = github_repo
+    mock_repo.get_git_ref.return_value.edit.side_effect = GithubException(422, {}, {})
+
+    with pytest.raises(WriteConflictError):
+        repo.save_files({"README.md": "Readme", "docs/index.md": "Docs"})
+
+    mock_repo.create_git_commit.assert_called_once()
+    assert repo.shas == {}
+
+
+def test_save_files_does_not_retry_other_errors(github_repo):
+    repo, mock_repo = github_repo
+    mock_repo.get_git_ref.return_value.edit.side_effect = GithubException(500, {}, {})
+
+    with pytest.raises(GithubException):
+        repo.save_files({"README.md": "Readme", "docs/index.md": "Docs"})
+
+    mock_repo.create_git_commit.assert_called_once()
+
+
+def test_save_files_checks_files_read_against_branch_head(github_repo):
+    repo, mock_repo = github_repo
+    repo.shas["README.md"] = blob_sha("Old readme")
+    repo.missing.add("badges.json")
+    mock_repo.get_git_tree.return_value.tree = [
+        MagicMock(type="blob", path="README.md", sha=blob_sha("Old readme")),
+        MagicMock(type="blob", path="docs/index.md", sha=blob_sha("Edited docs")),
+    ]
+
+    repo.save_files({"README.md": "Readme", "docs/index.md": "Docs", "badges.json": "[]"})
+
+    parent = mock_repo.get_git_commit.return_value
+    mock_repo.get_git_tree.assert_called_once_with(parent.tree.sha, recursive=True)
+    assert repo.missing == set()
+
+    # badges.json was created by someone else in the meantime
+    mock_repo.get_git_tree.return_value.tree = [
+        MagicMock(type="blob", path="README.md", sha=blob_sha("Readme")),
+        MagicMock(type="blob", path="badges.json", sha=blob_sha("[1]")),
+    ]
+    repo.missing.add("badges.json")
+    with pytest.raises(WriteConflictError, match=r"^badges\.json changed"):
+        repo.save_files({"README.md": "Readme", "badges.json": "[]"})
+    mock_repo.create_git_commit.assert_called_once()
+
+
+def test_save_readme_creates_file_found_missing(github_repo):
+    repo, mock_repo = github_repo
+    repo.readme_filename = "badges.json"
+    mock_repo.get_contents.side_effect = UnknownObjectException(404, {}, {})
+    mock_repo.create_file.return_value = {"content": MagicMock(sha="created-sha")}
+
+    with pytest.raises(FileNotFoundError):
+        repo.get_readme()
+    repo.save_readme("[]")
+
+    mock_repo.create_file.assert_called_once_with(path="badges.json", message="commit", content="[]", branch="main")
+    mock_repo.update_file.assert_not_called()
+    assert repo.shas == {"badges.json": "created-sha"}
+    assert repo.missing == set()
+
+
+def test_client_is_created_on_first_use():
+    with patch("github.Github") as MockGithub:
+        repo = GithubRepo("commit", "https://ghe.example.com/api/v3", "token", "user/repo", "main", "README.md")
+        MockGithub.assert_not_called()
+
+        assert repo.gh is MockGithub.return_value
+        assert repo.gh is MockGithub.return_value
+
+    MockGithub.assert_called_once_with(base_url="https://ghe.example.com/api/v3", login_or_token="token")
+
+
+def test_cached_reads_are_conditional(stub_server, tmp_path):
+    stub_server.add_file("user/repo", "README.md", "# Profile\n")
+    stub_server.add_file("user/repo", "docs/index.md", "# Docs\n")
+    cache = ReadmeCache(str(tmp_path))
+
+    def read(path="README.md"):
+        repo = GithubRepo("commit", stub_server.url, "token", "user/repo", "main", path, readme_cache=cache)
+        return repo.get_readme(), repo
+
+    assert read()[0] == "# Profile\n"
+    # A later run revalidates its cached copy and gets a 304 instead of the file
+    content, repo = read()
+    assert content == "# Profile\n"
+    sha = blob_sha("# Profile\n")
+    assert repo.shas == {"README.md": sha}
+    assert repo.etags == {"README.md": f'"{sha}"'}
+    assert (cache.hits, cache.misses) == (1, 1)
+    # The repository lookup is not needed to read
+    assert stub_server.count("GET", "/repos/user/repo/contents/") == stub_server.count("GET") == 2  # noqa: PLR2004
+
+    stub_server.add_file("user/repo", "README.md", "# New\n")
+    assert read()[0] == "# New\n"
+    assert read()[0] == "# New\n"
+    assert read("docs/index.md")[0] == "# Docs\n"
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_requests_are_counted(stub_server):
+    stub_server.add_file("user/repo", "README.md", "# Profile\n")
+    repo = GithubRepo("commit", stub_server.url, "token", "user/repo", "main", "README.md")
+    metrics.reset()
+
+    repo.get_readme()
+    repo.save_readme("# New\n")
+
+    assert metrics.counters["github_http_requests"] == len(stub_server.requests) == 3  # noqa: PLR2004
+    assert metrics.counters["github_http_bytes"] > 0
+
+
+def test_cached_read_errors(stub_server, tmp_path):
+    stub_server.add_file("user/repo", "docs/index.md", "# Docs\n")
+    cache = ReadmeCache(str(tmp_path))
+
+    def repo(path):
+        return GithubRepo("commit", stub_server.url, "token", "user/repo", "main", path, readme_cache=cache)
+
+    with pytest.raises(FileNotFoundError):
+        repo("README.md").get_readme()
+    with pytest.raises(ValueError, match="directory"):
+        repo("docs").get_readme()
+
+
+def test_cached_read_without_etag_is_not_cached(mock_github, tmp_path):
+    MockGithub, _mock_repo = mock_github
+    content = base64.b64encode(b"# Profile\n").decode()
+    MockGithub.return_value.requester.requestJsonAndCheck.return_value = ({}, {"content": content, "sha": "abc"})
+    cache = ReadmeCache(str(tmp_path))
+    repo = GithubRepo("commit", "https://api.github.com", "token", "user/repo", "main", "README.md", readme_cache=cache)
+
+    assert repo.get_readme() == "# Profile\n"
+    assert repo.shas == {"README.md": "abc"}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cached_read_without_content_or_entry(mock_github, tmp_path):
+    MockGithub, _mock_repo = mock_github
+    MockGithub.return_value.requester.requestJsonAndCheck.return_value = ({}, None)
+    cache = ReadmeCache(str(tmp_path))
+    repo = GithubRepo("commit", "https://api.github.com", "token", "user/repo", "main", "README.md", readme_cache=cache)
+
+    with pytest.raises(RuntimeError, match=r"no content for README\.md"):
+        repo.get_readme()
+    assert (cache.hits, cache.misses) == (0, 0)
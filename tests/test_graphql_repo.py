@@ -0,0 +1,193 @@
+"Test cases for the GraphQL backend in readme_credly_badges/adapter/graphql_repo.py"
+
+from unittest.mock import MagicMock
+
+import pytest
+from github import RateLimitExceededException
+
+from readme_credly_badges.adapter import GraphQLClient, GraphQLRepo
+from readme_credly_badges.adapter.base import WriteConflictError, blob_sha
+from readme_credly_badges.adapter.graphql_repo import GraphQLError, graphql_url
+from readme_credly_badges.rate_limit import RateLimitScheduler
+
+README = "# Profile\n<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+
+
+def make_repo(client, repository="user/repo", readme="README.md"):
+    return GraphQLRepo("Update badges", client, repository, "main", readme)
+
+
+@pytest.mark.parametrize(
+    ("api_url", "expected"),
+    [
+        ("https://api.github.com", "https://api.github.com/graphql"),
+        ("https://github.example.com/api/v3/", "https://github.example.com/api/graphql"),
+    ],
+)
+def test_graphql_url(api_url, expected):
+    assert graphql_url(api_url) == expected
+
+
+def test_prefetch_reads_many_repositories_in_one_query(stub_server):
+    for i in range(3):
+        stub_server.add_file(f"user{i}/repo", "README.md", f"{README}{i}")
+    client = GraphQLClient(stub_server.url, "token")
+    repos = [make_repo(client, f"user{i}/repo") for i in range(3)]
+    missing_file = make_repo(client, "user0/repo", "docs/README.md")
+    missing_repo = make_repo(client, "nobody/repo")
+
+    client.prefetch([*repos, missing_file, missing_repo])
+
+    assert [repo.get_readme() for repo in repos] == [f"{README}{i}" for i in range(3)]
+    assert repos[0].shas == {"README.md": blob_sha(f"{README}0")}
+    with pytest.raises(FileNotFoundError):
+        missing_file.get_readme()
+    with pytest.raises(RuntimeError, match="not found"):
+        missing_repo.get_readme()
+    assert stub_server.operations == ["ReadFiles"]
+    assert (client.queries, client.cost, client.mutations) == (1, 1, 0)
+    assert client.rate_limiting == (4999, 5000)
+    assert client.usage() == "1 queries costing 1 points, 0 mutations, 4999/5000 points left"
+
+
+def test_reads_are_split_into_batches(stub_server):
+    stub_server.add_file("user/repo", "README.md", README)
+    client = GraphQLClient(stub_server.url, "token", batch_size=2)
+
+    remote = client.read_files([("user/repo", "main", "README.md")] * 5)
+
+    assert [file.text for file in remote] == [README] * 5
+    assert stub_server.operations == ["ReadFiles"] * 3
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        GraphQLClient("https://api.github.com", "token", batch_size=0)
+
+
+def test_save_files_commits_with_one_mutation(stub_server):
+    stub_server.add_file("user/repo", "README.md", README)
+    client = GraphQLClient(stub_server.url, "token")
+    repo = make_repo(client)
+
+    repo.get_readme()
+    repo.save_files({"README.md": "new", "assets/badge.png": b"\x89PNG\0"}, message_body="Added: Badge.")
+
+    assert stub_server.read_file("user/repo", "README.md") == "new"
+    assert stub_server.files["user/repo", "assets/badge.png"] == b"\x89PNG\0"
+    [commit] = stub_server.graphql_commits
+    assert commit["message"] == {"headline": "Update badges", "body": "Added: Badge."}
+    assert repo.shas["README.md"] == blob_sha("new")
+    assert repo.head == stub_server.heads["user/repo", "main"]
+    assert stub_server.operations == ["ReadFiles", "CreateCommit"]
+    assert client.mutations == 1
+    # No REST call was needed
+    assert stub_server.count("GET") == stub_server.count("PUT") == 0
+    with pytest.raises(ValueError, match="binary"):
+        repo.get_file("assets/badge.png")
+
+
+def test_save_files_deletes_files_in_the_same_mutation(stub_server):
+    stub_server.add_file("user/repo", "README.md", README)
+    stub_server.add_file("user/repo", "assets/old.png", b"\x89PNG\0")
+    repo = make_repo(GraphQLClient(stub_server.url, "token"))
+
+    repo.file_shas("assets")
+    repo.save_files({"README.md": "new"}, deletions=["assets/old.png"])
+
+    assert ("user/repo", "assets/old.png") not in stub_server.files
+    [commit] = stub_server.graphql_commits
+    assert commit["fileChanges"]["deletions"] == [{"path": "assets/old.png"}]
+    assert "assets/old.png" not in repo.shas
+
+
+def test_save_without_read_fetches_branch_head(stub_server):
+    stub_server.add_file("user/repo", "README.md", README)
+    repo = make_repo(GraphQLClient(stub_server.url, "token"))
+
+    repo.save_readme("new")
+
+    assert stub_server.read_file("user/repo", "README.md") == "new"
+    assert stub_server.operations == ["ReadFiles", "CreateCommit"]
+
+
+def test_save_raises_when_branch_moved(stub_server):
+    stub_server.add_file("user/repo", "README.md", README)
+    repo = make_repo(GraphQLClient(stub_server.url, "token"))
+    repo.get_readme()
+    stub_server.heads["user/repo", "main"] = "0" * 40
+
+    with pytest.raises(WriteConflictError, match="moved"):
+        repo.save_readme("new")
+
+    assert stub_server.read_file("user/repo", "README.md") == README
+    assert repo.head is None
+    # The next read picks up the new head
+    repo.get_readme()
+    assert repo.head == "0" * 40
+
+
+def test_errors_are_raised(stub_server):
+    stub_server.add_file("user/repo", "README.md", README)
+
+    with pytest.raises(GraphQLError, match="Bad credentials"):
+        make_repo(GraphQLClient(stub_server.url, "wrong")).get_readme()
+
+    client = MagicMock()
+    client.execute.side_effect = GraphQLError([{"type": "FORBIDDEN", "message": "Resource not accessible"}])
+    repo = make_repo(client)
+    repo.head = "abc"
+    with pytest.raises(GraphQLError, match="Resource not accessible"):
+        repo.save_readme("new")
+
+
+def test_file_shas_lists_a_directory(stub_server):
+    stub_server.add_file("user/repo", "assets/credly/a.png", b"a")
+    stub_server.add_file("user/repo", "assets/credly/nested/b.png", b"b")
+    repo = make_repo(GraphQLClient(stub_server.url, "token"))
+
+    assert repo.file_shas("assets/credly/") == {"assets/credly/a.png": blob_sha(b"a")}
+    assert repo.file_shas("missing") == {}
+    with pytest.raises(ValueError, match="is a file"):
+        repo.file_shas("assets/credly/a.png")
+
+
+def rate_limited_response(status, headers, errors=()):
+    response = MagicMock(status_code=status, ok=status == 200, text="limited")  # noqa: PLR2004
+    response.headers = {"Content-Type": "application/json", **headers}
+    response.json.return_value = {"errors": list(errors)} if errors else {"message": "limited"}
+    return response
+
+
+@pytest.mark.parametrize(
+    ("status", "headers", "errors"),
+    [
+        (403, {"Retry-After": "30"}, []),
+        (200, {"x-ratelimit-remaining": "0"}, [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]),
+    ],
+)
+def test_rate_limits_pause_the_scheduler(status, headers, errors):
+    session = MagicMock()
+    session.post.return_value = rate_limited_response(status, headers, errors)
+    client = GraphQLClient("https://api.github.com", "token", session=session)
+    scheduler = RateLimitScheduler(client, sleep=MagicMock())
+
+    with pytest.raises(RateLimitExceededException) as exc_info:
+        client.read_files([("user/repo", "main", "README.md")])
+
+    assert scheduler.handle_error(exc_info.value)
+    assert client.queries == 0
+
+
+def test_scheduler_ignores_unknown_quota():
+    session = MagicMock()
+    session.post.return_value = MagicMock(status_code=200, ok=True, headers={"Content-Type": "application/json"})
+    session.post.return_value.json.return_value = {"data": {"r0": None}}
+    client = GraphQLClient("https://api.github.com", "token", session=session)
+    sleep = MagicMock()
+
+    client.read_files([("user/repo", "main", "README.md")])
+    RateLimitScheduler(client, sleep=sleep).wait()
+
+    sleep.assert_not_called()
+    assert client.usage() == "1 queries costing 0 points, 0 mutations, quota unknown"
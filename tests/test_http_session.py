@@ -0,0 +1,64 @@
+"Test cases for the pooled Credly session in readme_credly_badges/http_session.py"
+
+import time
+
+import pytest
+
+from readme_credly_badges.adapter import Credly
+from readme_credly_badges.http_session import RETRY_STATUSES, create_session
+from readme_credly_badges.metrics import metrics
+
+BADGE = {"id": "b1", "badge_template": {"name": "Badge", "image_url": "https://images.credly.com/images/b1.png"}}
+
+
+def test_create_session_configures_pool_and_retries():
+    session = create_session(pool_size=4, retries=2, backoff=0.25)
+
+    adapter = session.get_adapter("https://www.credly.com")
+    assert adapter._pool_maxsize == 4  # noqa: PLR2004
+    retry = adapter.max_retries
+    assert (retry.total, retry.backoff_factor, retry.backoff_jitter) == (2, 0.25, 0.25)
+    assert set(retry.status_forcelist) == set(RETRY_STATUSES)
+    assert retry.respect_retry_after_header
+    assert retry.allowed_methods == frozenset({"GET"})
+
+
+def test_transient_errors_are_retried(stub_server):
+    stub_server.badges["alice"] = [BADGE]
+    stub_server.failures = [(503, {"Retry-After": "0"}), (429, {"Retry-After": "0"}), (502, {})]
+
+    badges = Credly("alice", api_url=stub_server.url, session=create_session(backoff=0)).fetch_badges()
+
+    assert [badge.name for badge in badges] == ["Badge"]
+    assert stub_server.count("GET", "/users/alice/") == 4  # noqa: PLR2004
+
+
+def test_retry_after_is_honoured(stub_server):
+    stub_server.badges["alice"] = [BADGE]
+    stub_server.failures = [(429, {"Retry-After": "1"})]
+
+    started = time.perf_counter()
+    Credly("alice", api_url=stub_server.url, session=create_session(backoff=0)).fetch_badges()
+
+    assert time.perf_counter() - started >= 1
+
+
+def test_gives_up_after_retries(stub_server):
+    stub_server.badges["alice"] = [BADGE]
+    stub_server.failures = [(500, {})] * 3
+
+    with pytest.raises(ConnectionError):
+        Credly("alice", api_url=stub_server.url, session=create_session(retries=2, backoff=0)).fetch_badges()
+
+    assert stub_server.count("GET", "/users/alice/") == 3  # noqa: PLR2004
+
+
+def test_requests_and_bytes_are_counted(stub_server):
+    stub_server.badges["alice"] = [BADGE]
+    metrics.reset()
+
+    Credly("alice", api_url=stub_server.url, session=create_session(backoff=0)).fetch_badges()
+
+    assert metrics.counters["credly_http_requests"] == 1
+    assert metrics.counters["credly_http_bytes"] > 0
+    assert list(metrics.stages()) == ["json_parse", "sort", "credly_fetch"]
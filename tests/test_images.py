@@ -0,0 +1,128 @@
+"Test cases for the badge image store in readme_credly_badges/images.py"
+
+import io
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from readme_credly_badges.adapter.base import blob_sha
+from readme_credly_badges.images import ImageStore, resize_image
+from readme_credly_badges.models import Badge
+
+Image = pytest.importorskip("PIL.Image")
+
+URL = "https://images.credly.com/images/abc/badge.png"
+
+
+def make_png(size=(600, 300), color="red"):
+    out = io.BytesIO()
+    Image.new("RGB", size, color).save(out, format="PNG")
+    return out.getvalue()
+
+
+def make_store(tmp_path, png=None, directory="assets/credly"):
+    session = MagicMock()
+    session.get.return_value.content = png or make_png()
+    return ImageStore(str(tmp_path / "cache"), directory, size="100x100", session=session), session
+
+
+def badge(badge_id="b1", image_url=URL):
+    return Badge(name="Badge", url=f"https://www.credly.com/badges/{badge_id}", image_url=image_url, id=badge_id)
+
+
+def test_resize_image_keeps_aspect_ratio():
+    resized = resize_image(make_png((600, 300)), "100x100")
+
+    with Image.open(io.BytesIO(resized)) as image:
+        assert image.format == "PNG"
+        assert image.size == (100, 50)
+
+
+def test_resize_image_without_pillow():
+    with patch.dict("sys.modules", {"PIL": None}), pytest.raises(ImportError, match="pip install pillow"):
+        resize_image(b"", "100x100")
+
+
+def test_images_are_downloaded_and_resized_once(tmp_path):
+    store, session = make_store(tmp_path)
+
+    first = store.resized(URL)
+    assert store.resized(URL) == first
+    # A later run finds the image in the content-addressed cache
+    again, later_session = make_store(tmp_path)
+    assert again.resized(URL) == first
+
+    session.get.assert_called_once_with(URL, timeout=60)
+    later_session.get.assert_not_called()
+    assert sorted(path.name for path in (tmp_path / "cache").iterdir()) == sorted(
+        ["index.json", *store._index.values(), f"{store._index[URL]}-100x100.png"]
+    )
+
+
+def test_image_is_downloaded_again_if_its_file_is_gone(tmp_path):
+    store, session = make_store(tmp_path)
+    digest, data = store.original(URL)
+    (tmp_path / "cache" / digest).unlink()
+
+    assert store.original(URL) == (digest, data)
+    assert session.get.call_count == 2  # noqa: PLR2004
+
+
+def test_load_serves_originals_from_the_cache(tmp_path):
+    store, session = make_store(tmp_path, png=b"original")
+
+    assert store.load(URL) == store.load(URL) == b"original"
+    session.get.assert_called_once()
+
+
+def test_download_errors_are_connection_errors(tmp_path):
+    store, session = make_store(tmp_path)
+    session.get.return_value.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+
+    with pytest.raises(ConnectionError, match=r"badge\.png"):
+        store.original(URL)
+    assert store._index == {}
+
+
+def test_unreadable_index_is_ignored(tmp_path, caplog):
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "cache" / "index.json").write_text("{not json")
+
+    with caplog.at_level(logging.WARNING):
+        store, _ = make_store(tmp_path)
+
+    assert store._index == {}
+    assert "Ignoring unreadable image index" in caplog.text
+
+
+def test_files_only_returns_new_or_changed_images(tmp_path, caplog):
+    store, _ = make_store(tmp_path)
+    badges = [badge("b1"), badge("b2", "https://images.credly.com/images/def/other.png")]
+    current = store.resized(URL)
+
+    with caplog.at_level(logging.INFO):
+        files = store.files(badges, {"assets/credly/b1.png": blob_sha(current), "assets/credly/b2.png": "stale"})
+
+    assert list(files) == ["assets/credly/b2.png"]
+    assert "1 badge images are already up to date." in caplog.text
+
+
+def test_stale_lists_images_no_badge_uses(tmp_path, caplog):
+    store, _ = make_store(tmp_path)
+    existing = {"assets/credly/old.png": "sha1", "assets/credly/b1.png": "sha2", "assets/credly/notes.txt": "sha3"}
+
+    with caplog.at_level(logging.INFO):
+        assert store.stale([badge("b1")], existing) == ["assets/credly/old.png"]
+
+    assert "1 badge images are no longer used and will be deleted." in caplog.text
+    assert store.stale([badge("b1")], {"assets/credly/b1.png": "sha2"}) == []
+
+
+def test_localize_uses_paths_relative_to_the_readme(tmp_path):
+    store, _ = make_store(tmp_path, directory="/assets/credly/")
+
+    assert store.localize([badge()], "README.md")[0].image_url == "assets/credly/b1.png"
+    assert store.localize([badge()], "docs/profile.md")[0].image_url == "../assets/credly/b1.png"
+    assert store.path_for(badge("")).startswith("assets/credly/")
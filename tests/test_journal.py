@@ -0,0 +1,59 @@
+"Test cases for the batch run journal in readme_credly_badges/journal.py"
+
+import json
+import logging
+
+from readme_credly_badges.journal import Journal
+
+TARGET = "alice/alice@main:README.md"
+OTHER = "bob/bob@main:README.md"
+
+
+def test_records_are_appended_and_replayed(tmp_path):
+    path = tmp_path / "runs" / "journal.jsonl"
+    journal = Journal(str(path))
+    journal.set(TARGET, "f1")
+    journal.record(TARGET, "updated", sha="s1")
+    journal.record(OTHER, "failed", error="boom")
+    journal.save()
+
+    [first, second] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert first["run"] == second["run"] == journal.run_id
+    assert (first["target"], first["status"], first["fingerprint"], first["sha"]) == (TARGET, "updated", "f1", "s1")
+    assert (second["status"], second["fingerprint"], second["error"]) == ("failed", None, "boom")
+
+    reopened = Journal(str(path))
+    assert reopened.get(TARGET) == "f1"
+    assert reopened.shas == {TARGET: "s1"}
+    assert reopened.run_id != journal.run_id
+    assert not reopened.finished(TARGET)
+
+
+def test_resume_continues_the_last_run(tmp_path, caplog):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(str(path), resume=True)
+    assert not journal.resumed
+    journal.record(TARGET, "unchanged")
+    journal.record(OTHER, "failed")
+
+    with caplog.at_level(logging.INFO):
+        resumed = Journal(str(path), resume=True)
+
+    assert resumed.resumed
+    assert resumed.run_id == journal.run_id
+    assert resumed.finished(TARGET)
+    assert not resumed.finished(OTHER)
+    assert "1 targets already finished" in caplog.text
+
+
+def test_incomplete_line_is_ignored(tmp_path, caplog):
+    path = tmp_path / "journal.jsonl"
+    Journal(str(path)).record(TARGET, "updated", sha="s1")
+    with path.open("a") as journal:
+        journal.write('{"run": "cut sho')
+
+    with caplog.at_level(logging.WARNING):
+        reopened = Journal(str(path), resume=True)
+
+    assert reopened.finished(TARGET)
+    assert "Ignoring unreadable line 2" in caplog.text
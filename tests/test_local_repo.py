@@ -0,0 +1,159 @@
+"Test cases for the LocalRepo class in readme_credly_badges/adapter/local_repo.py"
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from readme_credly_badges.adapter import LocalRepo
+from readme_credly_badges.adapter.base import blob_sha
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout  # noqa: S603, S607
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    """A working tree cloned from a bare remote, with a committed README."""
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    git(tmp_path, "init", "--bare", "--initial-branch=main", str(remote))
+    git(tmp_path, "clone", str(remote), str(work))
+    git(work, "checkout", "-b", "main")
+    (work / "README.md").write_text("Old Content\n")
+    git(work, "add", "README.md")
+    git(work, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-m", "init")
+    git(work, "push", "origin", "main")
+    return work, remote
+
+
+def make_repo(path, push=False, readme_filename="README.md"):
+    return LocalRepo(commit_message="commit", path=str(path), branch="main", readme_filename=readme_filename, push=push)
+
+
+def test_get_readme(checkout):
+    work, _remote = checkout
+
+    assert make_repo(work).get_readme() == "Old Content\n"
+
+
+def test_get_readme_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        make_repo(tmp_path).get_readme()
+
+
+def test_get_readme_when_readme_is_directory(tmp_path):
+    (tmp_path / "docs").mkdir()
+
+    with pytest.raises(ValueError) as exc_info:
+        make_repo(tmp_path, readme_filename="docs").get_readme()
+
+    assert "docs is a directory" in str(exc_info.value)
+
+
+def test_save_readme_without_push_only_writes_file(checkout):
+    work, remote = checkout
+
+    make_repo(work).save_readme("New Content\n")
+
+    assert (work / "README.md").read_text() == "New Content\n"
+    assert git(work, "status", "--porcelain").strip() == "M README.md"
+    assert git(remote, "log", "--format=%s", "main").split() == ["init"]
+
+
+def test_save_readme_commits_and_pushes(checkout):
+    work, remote = checkout
+
+    make_repo(work, push=True).save_readme("New Content\n")
+
+    assert git(remote, "log", "--format=%s", "main").splitlines() == ["commit", "init"]
+    assert git(remote, "show", "main:README.md") == "New Content\n"
+    assert git(work, "log", "-1", "--format=%an").strip() == "github-actions[bot]"
+
+
+def test_save_files_adds_message_body(checkout):
+    work, remote = checkout
+
+    make_repo(work, push=True).save_files({"README.md": "New Content\n"}, message_body="Added: Badge")
+
+    assert git(remote, "log", "-1", "--format=%B", "main").strip() == "commit\n\nAdded: Badge"
+
+
+def test_save_readme_skips_commit_without_changes(checkout):
+    work, remote = checkout
+
+    make_repo(work, push=True).save_readme("Old Content\n")
+
+    assert git(remote, "log", "--format=%s", "main").split() == ["init"]
+
+
+def test_git_failure_raises_runtime_error(tmp_path):
+    (tmp_path / "README.md").write_text("Old")
+
+    with pytest.raises(RuntimeError):
+        make_repo(tmp_path, push=True).save_readme("New")
+
+
+def test_git_missing_raises_runtime_error(tmp_path):
+    with patch("readme_credly_badges.adapter.local_repo.shutil.which", return_value=None), pytest.raises(RuntimeError):
+        make_repo(tmp_path, push=True).save_readme("New")
+
+
+def test_target_uses_resolved_path(tmp_path):
+    assert make_repo(tmp_path).target == f"{tmp_path.resolve()}@main:README.md"
+
+
+def test_save_files_commits_all_files_together(checkout):
+    work, remote = checkout
+    (work / "docs").mkdir()
+    (work / "docs" / "index.md").write_text("Docs\n")
+    git(work, "add", "docs/index.md")
+
+    make_repo(work, push=True).save_files({"README.md": "New Content\n", "docs/index.md": "New Docs\n"})
+
+    assert git(remote, "show", "main:docs/index.md") == "New Docs\n"
+    assert git(remote, "show", "--name-only", "--format=", "main").split() == ["README.md", "docs/index.md"]
+    assert git(remote, "rev-list", "--count", "main").strip() == "2"
+
+
+def test_save_files_writes_binary_files(checkout):
+    work, _ = checkout
+    repo = make_repo(work)
+
+    repo.save_files({"assets/b1.png": b"\x89PNG"})
+
+    assert (work / "assets" / "b1.png").read_bytes() == b"\x89PNG"
+    assert repo.file_shas("assets/") == {"assets/b1.png": blob_sha(b"\x89PNG")}
+    assert repo.file_shas("missing") == {}
+
+
+def test_save_files_deletes_files_in_the_same_commit(checkout):
+    work, remote = checkout
+    (work / "assets").mkdir()
+    (work / "assets" / "old.png").write_bytes(b"\x89PNG")
+    (work / "assets" / "untracked.png").write_bytes(b"\x89PNG")
+    git(work, "add", "assets/old.png")
+    git(work, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-m", "image")
+    git(work, "push", "origin", "main")
+
+    make_repo(work, push=True).save_files(
+        {"README.md": "New Content\n"}, deletions=["assets/old.png", "assets/untracked.png"]
+    )
+
+    assert not (work / "assets" / "old.png").exists()
+    assert not (work / "assets" / "untracked.png").exists()
+    assert git(remote, "show", "--name-only", "--format=", "main").split() == ["README.md", "assets/old.png"]
+    assert git(remote, "ls-tree", "-r", "--name-only", "main").split() == ["README.md"]
+    assert git(remote, "rev-list", "--count", "main").strip() == "3"
+
+
+@pytest.mark.parametrize("push", [False, True])
+def test_save_files_only_deleting_untracked_files_commits_nothing(checkout, push):
+    work, remote = checkout
+    (work / "old.png").write_bytes(b"\x89PNG")
+
+    make_repo(work, push=push).save_files({}, deletions=["old.png"])
+
+    assert not (work / "old.png").exists()
+    assert git(remote, "rev-list", "--count", "main").strip() == "1"
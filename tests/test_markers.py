@@ -0,0 +1,147 @@
+"Test cases for the badge blocks in readme_credly_badges/markers.py"
+
+import pytest
+
+from readme_credly_badges.markers import BadgeDiff, BlockOptions, parse_options, replace_blocks, update_blocks
+from readme_credly_badges.models import Badge
+
+BADGES = [
+    Badge(name=f"Badge{i}", image_url=f"https://images.credly.com/images/{i}.png", url=f"http://url{i}")
+    for i in range(3)
+]
+
+
+def test_parse_options_defaults():
+    assert parse_options("") == BlockOptions()
+
+
+def test_parse_options_values():
+    assert parse_options(" size=110x110  limit=2 format=html columns=4 sort=name,issued") == BlockOptions(
+        size="110x110", limit=2, format="html", columns=4, sort="name,issued"
+    )
+
+
+@pytest.mark.parametrize(
+    "text", ["color=red", "limit", "size=big", "limit=-1", "format=json", "columns=0", "columns=x", "sort=color"]
+)
+def test_parse_options_rejects_invalid_values(text):
+    with pytest.raises(ValueError):
+        parse_options(text)
+
+
+def test_replace_blocks_renders_each_block_with_its_options():
+    content = (
+        "Intro\n<!-- START CREDLY BADGES size=110x110 limit=1 -->\nold\n<!-- END CREDLY BADGES -->\n"
+        "Middle\n<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\nOutro\n"
+    )
+
+    new_content = replace_blocks(content, BADGES)
+
+    first, second = new_content.split("Middle")
+    assert first.startswith("Intro\n<!-- START CREDLY BADGES size=110x110 limit=1 -->\n")
+    assert "https://images.credly.com/size/110x110/images/0.png" in first
+    assert "Badge1" not in first
+    assert all(f"Badge{i}" in second for i in range(3))
+    assert new_content.endswith("<!-- END CREDLY BADGES -->\nOutro\n")
+
+
+def test_replace_blocks_sorts_blocks_before_limiting():
+    content = (
+        "<!-- START CREDLY BADGES sort=name limit=2 -->\n<!-- END CREDLY BADGES -->\n"
+        "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+    )
+
+    new_content = replace_blocks(content, BADGES[::-1])
+
+    first, second = new_content.split("<!-- START CREDLY BADGES -->")
+    assert first.index("Badge0") < first.index("Badge1")
+    assert "Badge2" not in first
+    # Blocks without a sort option keep the order of the badges given
+    assert second.index("Badge2") < second.index("Badge1") < second.index("Badge0")
+    assert replace_blocks(new_content, BADGES[::-1]) is new_content
+
+
+def test_replace_blocks_keeps_blocks_with_matching_fingerprint():
+    content = replace_blocks("<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->", BADGES)
+    edited = content.replace("Badge1", "Badge1 (kept)")
+
+    assert replace_blocks(edited, BADGES) == edited
+    assert replace_blocks(edited, BADGES[:2]) != edited
+
+
+def test_replace_blocks_returns_unchanged_document_as_is():
+    content = (
+        "Intro\n<!-- START CREDLY BADGES -->\n"
+        + "\n".join(
+            f"[![{b.name}](https://images.credly.com/size/150x150/images/{i}.png)]({b.url})"
+            for i, b in enumerate(BADGES)
+        )
+        + "\n<!-- END CREDLY BADGES -->\nOutro"
+    )
+
+    assert replace_blocks(content, BADGES) is content
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ("No markers.", "not found"),
+        ("<!-- START CREDLY BADGES -->\nno end", "line 1 has no matching END"),
+        ("Intro\n<!-- END CREDLY BADGES -->", "line 2 has no matching START"),
+        ("<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n<!-- END CREDLY BADGES -->", "no matching START"),
+        ("<!-- START CREDLY BADGES -->\n<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->", "inside another"),
+    ],
+)
+def test_replace_blocks_rejects_malformed_markers(content, message):
+    with pytest.raises(ValueError, match=message):
+        replace_blocks(content, BADGES)
+
+
+def test_replace_blocks_renders_html_blocks():
+    content = "<!-- START CREDLY BADGES format=html columns=2 -->\n<!-- END CREDLY BADGES -->"
+
+    new_content = replace_blocks(content, BADGES)
+
+    assert new_content.count("<br>") == 1
+    assert replace_blocks(new_content, BADGES) is new_content
+
+
+def credly_badge(badge_id):
+    return Badge(name=f"Badge {badge_id}", image_url="img.png", url=f"https://www.credly.com/badges/{badge_id}")
+
+
+def test_badge_diff_between():
+    diff = BadgeDiff.between(["a", "b", "c"], ["c", "b", "d"])
+
+    assert diff == BadgeDiff(added=("d",), removed=("a",), reordered=True)
+    assert BadgeDiff.between(["a", "b"], ["a", "c", "b"]) == BadgeDiff(added=("c",))
+    assert not BadgeDiff.between(["a", "b"], ["a", "b"])
+
+
+def test_badge_diff_describe():
+    diff = BadgeDiff(added=("a",), removed=("b",)) | BadgeDiff(added=("a", "c"), reordered=True)
+
+    assert diff.describe({"a": "Badge A"}) == "Added: Badge A, c\nRemoved: b\nReordered badges."
+    assert BadgeDiff().describe({}) == ""
+
+
+def test_update_blocks_diffs_badge_ids_of_each_block():
+    content = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n"
+    old = replace_blocks(content, [credly_badge("a1"), credly_badge("b2")])
+
+    new, diff = update_blocks(old, [credly_badge("b2"), credly_badge("a1"), credly_badge("c3")])
+
+    assert diff == BadgeDiff(added=("c3",), reordered=True)
+    assert new.index("/badges/b2") < new.index("/badges/a1") < new.index("/badges/c3")
+    assert update_blocks(new, [credly_badge("b2"), credly_badge("a1"), credly_badge("c3")]) == (new, BadgeDiff())
+
+
+def test_update_blocks_rewrites_same_badges_rendered_differently():
+    badges = [credly_badge("a1")]
+    old = replace_blocks("<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->\n", badges)
+    as_html = old.replace("START CREDLY BADGES", "START CREDLY BADGES format=html")
+
+    new, diff = update_blocks(as_html, badges)
+
+    assert not diff
+    assert new != as_html
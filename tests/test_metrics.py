@@ -0,0 +1,135 @@
+"Test cases for the pipeline metrics in readme_credly_badges/metrics.py"
+
+import json
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import readme_credly_badges.entrypoint as main_module
+from readme_credly_badges import metrics as metrics_module
+from readme_credly_badges.metrics import Metrics, metrics
+from readme_credly_badges.models import Badge
+
+
+@pytest.fixture
+def recorded():
+    registry = Metrics()
+    with registry.span("render", target="user/repo@main:README.md"):
+        pass
+    with registry.span("render"):
+        pass
+    with pytest.raises(RuntimeError), registry.span("write"):
+        raise RuntimeError("boom")
+    registry.increment("credly_http_requests")
+    registry.increment("credly_http_bytes", 2048)
+    return registry
+
+
+def test_spans_and_counters_are_aggregated(recorded):
+    snapshot = recorded.snapshot()
+
+    assert list(snapshot["stages"]) == ["render", "write"]
+    assert snapshot["stages"]["render"]["calls"] == 2  # noqa: PLR2004
+    assert snapshot["stages"]["write"]["calls"] == 1
+    assert snapshot["stages"]["render"]["seconds"] >= snapshot["stages"]["render"]["max_seconds"] >= 0
+    assert snapshot["counters"] == {"credly_http_bytes": 2048, "credly_http_requests": 1}
+
+
+def test_cleared_spans_keep_stage_totals(recorded):
+    stages, prometheus = recorded.stages(), recorded.prometheus()
+
+    recorded.clear_spans()
+    with recorded.span("write"):
+        pass
+
+    assert [span.name for span in recorded.spans] == ["write"]
+    assert recorded.stages()["render"] == stages["render"]
+    assert recorded.stages()["write"]["calls"] == 2  # noqa: PLR2004
+    assert recorded.prometheus() != prometheus
+    assert 'readme_credly_badges_stage_calls_total{stage="render"} 2\n' in recorded.prometheus()
+
+
+def test_log_is_structured_json(recorded, caplog):
+    with caplog.at_level(logging.INFO):
+        recorded.log()
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "metrics"
+    assert record["counters"]["credly_http_requests"] == 1
+
+
+def test_prometheus_text_format(recorded):
+    text = recorded.prometheus()
+
+    assert "# TYPE readme_credly_badges_stage_seconds_total counter\n" in text
+    assert 'readme_credly_badges_stage_calls_total{stage="render"} 2\n' in text
+    assert "readme_credly_badges_credly_http_bytes_total 2048\n" in text
+
+
+def test_otlp_trace(recorded):
+    [resource] = recorded.otlp()["resourceSpans"]
+    spans = resource["scopeSpans"][0]["spans"]
+
+    assert [span["name"] for span in spans] == ["render", "render", "write"]
+    assert {span["traceId"] for span in spans} == {recorded.trace_id}
+    assert len({span["spanId"] for span in spans}) == len(spans)
+    assert int(spans[0]["endTimeUnixNano"]) >= int(spans[0]["startTimeUnixNano"])
+    assert spans[0]["attributes"] == [{"key": "target", "value": {"stringValue": "user/repo@main:README.md"}}]
+
+
+def test_export_writes_every_destination(recorded, tmp_path):
+    summary = tmp_path / "summary.md"
+    summary.write_text("# Job\n")
+
+    recorded.export(
+        prometheus_file=str(tmp_path / "metrics" / "credly.prom"),
+        otlp_file=str(tmp_path / "trace.json"),
+        job_summary_file=str(summary),
+    )
+
+    assert (tmp_path / "metrics" / "credly.prom").read_text() == recorded.prometheus()
+    assert json.loads((tmp_path / "trace.json").read_text()) == recorded.otlp()
+    assert summary.read_text().startswith("# Job\n### Credly badges timings\n")
+    assert "| render | 2 |" in summary.read_text()
+    assert "| credly_http_bytes | 2048 |" in summary.read_text()
+
+
+def test_export_metrics_uses_settings(tmp_path):
+    summary = tmp_path / "summary.md"
+    with (
+        patch.multiple(metrics_module, METRICS_JOB_SUMMARY=False, GITHUB_STEP_SUMMARY=str(summary)),
+        patch.object(metrics, "export") as mock_export,
+    ):
+        metrics_module.export_metrics()
+
+    mock_export.assert_called_once_with("", "", "")
+    with (
+        patch.multiple(metrics_module, METRICS_JOB_SUMMARY=True, GITHUB_STEP_SUMMARY=str(summary)),
+        patch.object(metrics, "export") as mock_export,
+    ):
+        metrics_module.export_metrics()
+        metrics_module.export_metrics(job_summary=False)
+
+    assert [call.args for call in mock_export.call_args_list] == [("", "", str(summary)), ("", "", "")]
+
+
+def test_pipeline_stages_are_timed():
+    metrics.reset()
+    credly = MagicMock()
+    credly.fetch_badges.return_value = [Badge(name="Badge", image_url="img.png", url="http://url")]
+    github_repo = MagicMock(readme_filename="README.md", target="user/repo@main:README.md")
+    github_repo.get_file.return_value = "<!-- START CREDLY BADGES -->\n<!-- END CREDLY BADGES -->"
+
+    main_module.update_readme(credly=credly, github_repo=github_repo)
+
+    assert list(metrics.stages()) == ["readme_fetch", "render", "write"]
+    assert metrics.spans[-1].attributes == {"target": "user/repo@main:README.md", "files": "README.md"}
+
+
+def test_job_summary_without_counters():
+    registry = Metrics()
+    with registry.span("credly_fetch"):
+        pass
+
+    assert "Counter" not in registry.job_summary()
@@ -0,0 +1,49 @@
+"""Test cases for the badge model."""
+
+import sys
+from datetime import datetime, timezone
+
+from readme_credly_badges.models import Badge, parse_date
+
+RECORD = {
+    "id": " 123 ",
+    "issued_at": "2024-01-02T03:04:05.000+00:00",
+    "accepted_at": "not a date",
+    "badge_template": {"name": " Python Pro ", "image_url": " https://example.com/image.png "},
+}
+
+
+def test_from_record_parses_dates_once():
+    badge = Badge.from_record(RECORD)
+
+    assert badge == Badge(
+        name="Python Pro",
+        url="https://www.credly.com/badges/123",
+        image_url="https://example.com/image.png",
+        id="123",
+        issued_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    )
+
+
+def test_from_record_rejects_incomplete_records():
+    assert Badge.from_record({"id": "1", "badge_template": None}) is None
+
+
+def test_dict_round_trip():
+    badge = Badge.from_record(RECORD)
+
+    assert Badge.from_dict(badge.to_dict()) == badge
+    assert Badge.from_dict({"name": "n", "url": "u", "image_url": "i"}) == Badge(name="n", url="u", image_url="i")
+
+
+def test_badges_are_hashable_and_slotted():
+    badge = Badge(name="n", url="u", image_url="i")
+
+    assert len({badge, Badge(name="n", url="u", image_url="i")}) == 1
+    assert hasattr(badge, "__dict__") == (sys.version_info < (3, 10))
+
+
+def test_parse_date_is_tolerant():
+    assert parse_date(None) is None
+    assert parse_date("") is None
+    assert parse_date("yesterday") is None
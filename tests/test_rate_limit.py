@@ -0,0 +1,143 @@
+"Test cases for the GitHub rate limit scheduler in readme_credly_badges/rate_limit.py"
+
+import logging
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from github import GithubException, RateLimitExceededException
+
+from readme_credly_badges.rate_limit import RateLimitScheduler, rate_limit_error
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    """A clock that only moves forward when slept on."""
+
+    def __init__(self):
+        self.now = NOW
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_scheduler(clock, remaining=5000, reset=NOW + 600, **kwargs):
+    gh = MagicMock()
+    gh.rate_limiting = (remaining, 5000)
+    gh.rate_limiting_resettime = reset
+    return RateLimitScheduler(gh, sleep=clock.sleep, clock=clock, **kwargs)
+
+
+def test_wait_proceeds_with_quota_left(clock):
+    make_scheduler(clock).wait()
+
+    assert clock.sleeps == []
+
+
+def test_wait_pauses_until_primary_quota_resets(clock, caplog):
+    scheduler = make_scheduler(clock, remaining=50, reset=NOW + 300, min_remaining=100)
+
+    with caplog.at_level(logging.INFO):
+        scheduler.wait()
+
+    assert clock.now == NOW + 301
+    assert "50/5000 requests left" in caplog.text
+    assert "Resuming GitHub updates." in caplog.text
+
+
+def test_writes_are_spaced_across_callers(clock):
+    scheduler = make_scheduler(clock, write_interval=2.0)
+
+    for _ in range(3):
+        scheduler.before_write()
+
+    assert clock.sleeps == [2.0, 2.0]
+
+
+def test_writes_are_spaced_across_threads():
+    sleeps = []
+    scheduler = RateLimitScheduler(MagicMock(), write_interval=1.0, sleep=sleeps.append, clock=lambda: NOW)
+
+    threads = [threading.Thread(target=scheduler.before_write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(sleeps) == [1.0, 2.0, 3.0]
+
+
+def test_pause_keeps_the_longest_delay(clock):
+    scheduler = make_scheduler(clock)
+
+    scheduler.pause(30, "first")
+    scheduler.pause(10, "shorter")
+    scheduler.wait()
+
+    assert clock.now == NOW + 30
+
+
+def test_handle_error_honours_retry_after(clock):
+    scheduler = make_scheduler(clock)
+    error = RateLimitExceededException(403, {"message": "secondary rate limit"}, {"retry-after": "42"})
+
+    assert scheduler.handle_error(error)
+    scheduler.wait()
+
+    assert clock.now == NOW + 42
+
+
+def test_handle_error_waits_for_exhausted_primary_quota(clock):
+    scheduler = make_scheduler(clock, remaining=0, reset=NOW + 120, min_remaining=0)
+    error = RateLimitExceededException(403, {"message": "API rate limit exceeded"}, {})
+
+    assert scheduler.handle_error(error)
+
+    assert scheduler._resume_at == NOW + 121
+
+
+def test_handle_error_falls_back_to_secondary_pause(clock):
+    scheduler = make_scheduler(clock, secondary_pause=15)
+    error = RateLimitExceededException(429, {"message": "secondary rate limit"}, None)
+
+    assert scheduler.handle_error(error)
+
+    assert scheduler._resume_at == NOW + 15
+
+
+def test_handle_error_ignores_other_errors(clock):
+    scheduler = make_scheduler(clock)
+
+    assert not scheduler.handle_error(GithubException(404, {"message": "Not Found"}, {}))
+    assert scheduler._resume_at == 0
+
+
+def test_rate_limit_error_follows_causes():
+    rate_limited = RateLimitExceededException(403, {"message": "secondary rate limit"}, {})
+    try:
+        try:
+            raise rate_limited
+        except GithubException as e:
+            raise RuntimeError("Authentication failed.") from e
+    except RuntimeError as e:
+        assert rate_limit_error(e) is rate_limited
+
+
+def test_log_budget(clock, caplog):
+    scheduler = make_scheduler(clock, remaining=4321, reset=0)
+
+    with caplog.at_level(logging.INFO):
+        scheduler.log_budget()
+
+    assert "GitHub API budget: 4321/5000 requests left, resets at 00:00:00 UTC." in caplog.text
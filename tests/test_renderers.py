@@ -0,0 +1,103 @@
+"Test cases for the badge renderers in readme_credly_badges/renderers.py"
+
+import base64
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from readme_credly_badges.fingerprint import badge_fingerprint
+from readme_credly_badges.models import Badge
+from readme_credly_badges.renderers import BlockOptions, file_format, image_session, load_image, render
+
+BADGES = [
+    Badge(name=f"Badge <{i}>", image_url=f"https://images.credly.com/images/{i}.png", url=f"http://url{i}")
+    for i in range(5)
+]
+
+
+def test_render_markdown_resizes_images():
+    output = render(BADGES[:2], BlockOptions(size="110x110"))
+
+    assert output == (
+        "[![Badge <0>](https://images.credly.com/size/110x110/images/0.png)](http://url0)\n"
+        "[![Badge <1>](https://images.credly.com/size/110x110/images/1.png)](http://url1)"
+    )
+
+
+def test_render_html_grid():
+    output = render(BADGES, BlockOptions(size="110x120", format="html", columns=2))
+
+    rows = output.removeprefix('<p align="center">\n').removesuffix("\n</p>").split("\n<br>\n")
+    assert [row.count("<img ") for row in rows] == [2, 2, 1]
+    assert 'alt="Badge &lt;0&gt;"' in rows[0]
+    assert 'width="110" height="120"' in rows[0]
+    assert render([], BlockOptions(format="html")) == ""
+
+
+def test_render_json():
+    data = json.loads(render(BADGES[:1], BlockOptions(size="110x110", format="json")))
+
+    assert data == [
+        {"name": "Badge <0>", "url": "http://url0", "image_url": "https://images.credly.com/size/110x110/images/0.png"}
+    ]
+
+
+def test_render_svg_embeds_images():
+    load = MagicMock(return_value=b"png")
+
+    output = render(BADGES, BlockOptions(size="100x50", format="svg", columns=3), images=load)
+
+    assert load.call_count == len(BADGES)
+    assert 'width="300" height="100"' in output
+    assert output.count(f"data:image/png;base64,{base64.b64encode(b'png').decode()}") == len(BADGES)
+    assert '<image x="100" y="50"' in output
+    assert "<title>Badge &lt;4&gt;</title>" in output
+
+
+def test_render_svg_downloads_images_by_default():
+    with patch("readme_credly_badges.renderers.image_session") as mock_session:
+        mock_session.return_value.get.return_value = MagicMock(content=b"png")
+        output = render(BADGES[:1], BlockOptions(size="150x150", format="svg"))
+
+    assert base64.b64encode(b"png").decode() in output
+    mock_session.return_value.get.assert_called_once_with(
+        "https://images.credly.com/size/150x150/images/0.png", timeout=60
+    )
+
+
+def test_load_image():
+    session = MagicMock()
+    session.get.return_value = MagicMock(content=b"png")
+
+    assert load_image("https://images.credly.com/images/0.png", session) == b"png"
+    session.get.return_value.raise_for_status.assert_called_once()
+
+
+def test_load_image_errors_are_connection_errors():
+    session = MagicMock()
+    session.get.return_value.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+
+    with pytest.raises(ConnectionError, match=r"0\.png"):
+        load_image("https://images.credly.com/images/0.png", session)
+
+
+def test_image_session_is_shared():
+    assert image_session() is image_session()
+    assert isinstance(image_session().get_adapter("https://images.credly.com").max_retries.total, int)
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"), [("README.md", None), ("badges.json", "json"), ("assets/Badges.SVG", "svg")]
+)
+def test_file_format(path, expected):
+    assert file_format(path) == expected
+
+
+def test_fingerprint_depends_on_layout():
+    markdown = BlockOptions(size="110x110")
+
+    assert markdown.fingerprint(BADGES) == badge_fingerprint(BADGES, "110x110")
+    assert BlockOptions(size="110x110", format="html").fingerprint(BADGES) != markdown.fingerprint(BADGES)
+    assert BlockOptions(format="html", columns=2).fingerprint(BADGES) != BlockOptions(format="html").fingerprint(BADGES)
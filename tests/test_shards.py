@@ -0,0 +1,82 @@
+"Test cases for sharded batch runs in readme_credly_badges/shards.py"
+
+import json
+import logging
+
+import pytest
+
+from readme_credly_badges.batch import BatchJob
+from readme_credly_badges.shards import main, merge_reports, select_shard, shard_of
+
+JOBS = [BatchJob(credly_username=f"user{i}", github_repo=f"user{i}/repo") for i in range(6)]
+
+
+def report(index, count, updated=0, failed=0):
+    jobs = [{"credly_username": f"user{index}", "status": "failed" if failed else "updated"}]
+    return {
+        "total": updated + failed,
+        "updated": updated,
+        "unchanged": 0,
+        "failed": failed,
+        "skipped": 0,
+        "jobs": jobs,
+        "shard": {"index": index, "count": count},
+    }
+
+
+def test_shard_of_is_stable_and_case_insensitive():
+    # Fixed values: a change would move repositories to other runners between releases
+    assert [shard_of(job.github_repo, 3) for job in JOBS] == [1, 2, 1, 0, 2, 2]
+    assert shard_of("Alice/Alice", 4) == shard_of("alice/alice", 4)
+
+
+def test_select_shard_partitions_jobs():
+    shards = [select_shard(JOBS, index, 3) for index in range(3)]
+
+    assert sorted((job for shard in shards for job in shard), key=JOBS.index) == JOBS
+    assert shards[1] == [JOBS[0], JOBS[2]]
+
+
+@pytest.mark.parametrize(("index", "count"), [(0, 0), (3, 3), (-1, 2)])
+def test_select_shard_rejects_invalid_shards(index, count):
+    with pytest.raises(ValueError):
+        select_shard(JOBS, index, count)
+
+
+def test_merge_reports_sums_counts_and_warns_about_missing_shards(caplog):
+    with caplog.at_level(logging.WARNING):
+        merged = merge_reports([report(0, 3, updated=2), report(2, 3, failed=1)])
+
+    assert (merged["total"], merged["updated"], merged["failed"], merged["skipped"]) == (3, 2, 1, 0)
+    assert [job["credly_username"] for job in merged["jobs"]] == ["user0", "user2"]
+    assert "shard" not in merged
+    assert "Reports of shards 1 of 3 are missing." in caplog.text
+
+
+def test_merge_reports_rejects_different_shard_counts():
+    with pytest.raises(ValueError):
+        merge_reports([report(0, 2), report(1, 3)])
+
+
+def test_merge_reports_of_unsharded_runs(caplog):
+    reports = [{k: v for k, v in report(index, 2, updated=1).items() if k != "shard"} for index in range(2)]
+
+    with caplog.at_level(logging.WARNING):
+        assert merge_reports(reports)["updated"] == 2  # noqa: PLR2004
+
+    assert not caplog.text
+
+
+def test_main_merges_report_files(tmp_path, capsys):
+    paths = []
+    for index in range(2):
+        paths.append(tmp_path / f"report-{index}.json")
+        paths[-1].write_text(json.dumps(report(index, 2, updated=1)))
+    output = tmp_path / "report.json"
+
+    assert main([*map(str, paths), "--output", str(output)]) == 0
+    assert json.loads(output.read_text())["updated"] == 2  # noqa: PLR2004
+
+    paths[1].write_text(json.dumps(report(1, 2, failed=1)))
+    assert main(list(map(str, paths))) == 1
+    assert json.loads(capsys.readouterr().out)["failed"] == 1
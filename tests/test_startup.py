@@ -0,0 +1,54 @@
+"Startup benchmark: PyGithub must not be imported until a run actually talks to GitHub"
+
+import subprocess
+import sys
+
+IDLE_RUN = """
+import sys
+from readme_credly_badges.adapter import GithubRepo
+repo = GithubRepo("commit", "https://api.github.com", "token", "user/repo", "main", "README.md")
+repo.target_for("README.md")
+print("github" in sys.modules)
+"""
+
+
+def import_times(code):
+    """Cumulative import time in microseconds of every module imported by ``code``, from ``-X importtime``."""
+    command = [sys.executable, "-X", "importtime", "-c", code]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)  # noqa: S603
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return result.stdout, times
+
+
+def test_entrypoint_import_does_not_load_pygithub():
+    _output, times = import_times("import readme_credly_badges.entrypoint")
+
+    assert "readme_credly_badges.entrypoint" in times
+    assert not any(name == "github" or name.startswith("github.") for name in times)
+
+
+def test_async_engine_import_does_not_load_pygithub():
+    _output, times = import_times("import readme_credly_badges.aio")
+
+    assert "readme_credly_badges.aio" in times
+    assert not any(name == "github" or name.startswith("github.") for name in times)
+
+
+def test_deferred_pygithub_import_saves_startup_time():
+    _output, lazy = import_times("import readme_credly_badges.entrypoint")
+    _output, eager = import_times("import github, readme_credly_badges.entrypoint")
+
+    # Every module PyGithub pulls in is import work the lazy entrypoint no longer does
+    assert set(lazy) < set(eager)
+    assert sum(lazy.values()) < sum(eager.values())
+
+
+def test_repository_that_is_never_read_does_not_load_pygithub():
+    output, _times = import_times(IDLE_RUN)
+
+    assert output.strip() == "False"
@@ -0,0 +1,61 @@
+"Test cases for the incremental Credly payload parser in readme_credly_badges/streaming.py"
+
+import json
+
+import pytest
+
+from readme_credly_badges.streaming import BadgeStream, slim_record
+
+
+def record(i: int) -> dict:
+    return {
+        "id": f"id-{i}",
+        "issued_at": "2024-01-01T00:00:00.000+00:00",
+        "badge_template": {
+            "name": f"Badge é{i}",
+            "image_url": f"https://images.credly.com/images/{i}.png",
+            "description": "x" * 2000,
+            "skills": [{"name": f"skill {j}", "vanity_slug": "y" * 50} for j in range(30)],
+        },
+        "issuer": {"entities": [{"entity": {"name": "Issuer", "description": "z" * 3000}}]},
+    }
+
+
+def chunked(payload: bytes, size: int):
+    return (payload[i : i + size] for i in range(0, len(payload), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_stream_yields_slim_records(chunk_size):
+    payload = json.dumps(
+        {"metadata": {"total_count": 12, "total_pages": 1}, "data": [record(1), record(2)], "count": 12}, indent=1
+    ).encode("utf-8")
+
+    stream = BadgeStream(chunked(payload, chunk_size))
+    records = list(stream)
+
+    assert records == [slim_record(record(1)), slim_record(record(2))]
+    assert records[0] == {
+        "id": "id-1",
+        "issued_at": "2024-01-01T00:00:00.000+00:00",
+        "badge_template": {"name": "Badge é1", "image_url": "https://images.credly.com/images/1.png"},
+    }
+    assert stream.fields == {"metadata": {"total_count": 12, "total_pages": 1}, "count": 12}
+
+
+@pytest.mark.parametrize("payload", [b"{}", b'{"data": []}', b'{"data": null}', b' { "metadata" : {} } '])
+def test_stream_without_records(payload):
+    assert list(BadgeStream([payload])) == []
+
+
+def test_slim_record_ignores_unexpected_shapes():
+    assert slim_record("badge") == {}
+    assert slim_record({"id": "1", "badge_template": None}) == {"id": "1"}
+
+
+@pytest.mark.parametrize(
+    "payload", [b"[]", b'{"data": [{"id": 1}', b'{"data": [{"id": 1} {"id": 2}]}', b'{"data": [{"id']
+)
+def test_stream_rejects_invalid_payloads(payload):
+    with pytest.raises(ValueError):
+        list(BadgeStream(chunked(payload, 4)))
@@ -1,38 +1,66 @@
 """Test cases for utilities module."""
 
+from datetime import datetime
+
 import pytest
 
-from readme_credly_badges.utils import sort_by_field
+from readme_credly_badges.models import Badge
+from readme_credly_badges.utils import parse_sort_fields, sort_badges, write_atomic
+
+
+def badge(name: str, issued_at: str = "", updated_at: str = "") -> Badge:
+    return Badge(
+        name=name,
+        url=f"http://{name}",
+        image_url=f"{name}.png",
+        issued_at=datetime.fromisoformat(issued_at) if issued_at else None,
+        updated_at=datetime.fromisoformat(updated_at) if updated_at else None,
+    )
 
 
 def test_sort_success():
     data = [
-        {"issued_at": "2023-01-01T08:00:00.000+05:30"},
-        {"issued_at": "2022-09-25T05:30:00.000+05:30"},
-        {"issued_at": "2021-06-10T05:30:00.000+05:30"},
+        badge("b", "2022-09-25T05:30:00.000+05:30"),
+        badge("a", "2023-01-01T08:00:00.000+05:30"),
+        badge("c", "2021-06-10T05:30:00.000+05:30"),
     ]
-    sorted_data = sort_by_field(data)
-    assert sorted_data[0]["issued_at"] == "2023-01-01T08:00:00.000+05:30"
-    assert sorted_data[-1]["issued_at"] == "2021-06-10T05:30:00.000+05:30"
+
+    assert [b.name for b in sort_badges(data)] == ["a", "b", "c"]
+
+
+def test_sort_puts_missing_dates_last():
+    data = [badge("undated"), badge("old", "2021-01-01T00:00:00+00:00"), badge("new", "2023-01-01T00:00:00")]
+
+    assert [b.name for b in sort_badges(data)] == ["new", "old", "undated"]
 
 
-def test_sort_missing_key_returns_original():
+def test_sort_by_several_fields():
     data = [
-        {"issued_at": "2023-01-01T08:00:00.000+05:30"},
-        {"wrong_key": "2022-09-25T05:30:00.000+05:30"},
+        badge("Zeta", "2023-01-01T00:00:00+00:00"),
+        badge("alpha", "2023-01-01T00:00:00+00:00"),
+        badge("Beta", "2024-01-01T00:00:00+00:00"),
     ]
-    result = sort_by_field(data)
-    assert result == data  # unchanged due to KeyError caught inside func
 
+    assert [b.name for b in sort_badges(data, "issued,name")] == ["Beta", "alpha", "Zeta"]
+    assert [b.name for b in sort_badges(data, "name")] == ["alpha", "Beta", "Zeta"]
 
-def test_sort_empty_list_returns_empty():
-    data: list = []
-    result = sort_by_field(data)
-    assert result == []
 
+def test_sort_empty_list_returns_empty():
+    assert sort_badges([]) == []
 
-def test_sort_invalid_field_raises_valueerror():
-    data = [{"issued_at": "2023-01-01T08:00:00.000+05:30"}]
 
+@pytest.mark.parametrize("sort_by", ["invalid_field", "issued,", ""])
+def test_sort_invalid_field_raises_valueerror(sort_by):
     with pytest.raises(ValueError):
-        sort_by_field(data, field="invalid_field")
+        parse_sort_fields(sort_by)
+
+
+def test_write_atomic_replaces_files_in_one_step(tmp_path):
+    path = tmp_path / "nested" / "file.json"
+
+    write_atomic(path, "{}")
+    write_atomic(path, b"\x89PNG")
+
+    assert path.read_bytes() == b"\x89PNG"
+    # Nothing is left behind next to it
+    assert [child.name for child in path.parent.iterdir()] == ["file.json"]
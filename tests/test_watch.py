@@ -0,0 +1,187 @@
+"Test cases for watch mode in readme_credly_badges/watch.py"
+
+import json
+import threading
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from readme_credly_badges import metrics as metrics_module
+from readme_credly_badges import watch
+from readme_credly_badges.batch import BatchJob
+from readme_credly_badges.metrics import metrics
+from readme_credly_badges.watch import Watcher, serve_status
+
+JOBS = [BatchJob(credly_username="alice", github_repo="alice/alice"), BatchJob(credly_username="bob", github_repo="b/b")]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def mock_pipeline():
+    with (
+        patch("readme_credly_badges.batch.Github") as MockGithub,
+        patch("readme_credly_badges.batch.Credly") as MockCredly,
+        patch("readme_credly_badges.batch.GithubRepo") as MockGithubRepo,
+        patch("readme_credly_badges.batch.update_readme") as mock_update,
+    ):
+        MockGithub.return_value.rate_limiting = (5000, 5000)
+        MockGithub.return_value.rate_limiting_resettime = 0
+        yield MockCredly, MockGithubRepo, mock_update
+
+
+def make_watcher(tmp_path, jobs=JOBS, **kwargs):
+    clock = FakeClock()
+    watcher = Watcher(
+        jobs, "token", cache_dir=str(tmp_path), min_interval=60, max_interval=300, backoff=2, clock=clock, **kwargs
+    )
+    return watcher, clock
+
+
+def test_poll_adapts_interval_to_profile_activity(tmp_path, mock_pipeline):
+    _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    watcher, clock = make_watcher(tmp_path, jobs=JOBS[:1])
+    [state] = watcher.states
+    intervals = []
+    for outcome in [False, False, RuntimeError("Credly is down"), False, True]:
+        mock_update.side_effect = [outcome]
+        watcher.poll()
+        intervals.append(state.interval)
+        clock.now = state.next_check
+
+    assert intervals == [120, 240, 300, 300, 60]
+    assert (state.checks, state.updates, state.failures) == (5, 1, 1)
+    assert state.last_status == "updated"
+
+
+def test_poll_only_checks_due_profiles_with_warm_clients(tmp_path, mock_pipeline):
+    MockCredly, MockGithubRepo, mock_update = mock_pipeline
+    mock_update.return_value = True
+    watcher, clock = make_watcher(tmp_path)
+
+    assert len(watcher.poll()) == 2  # noqa: PLR2004
+    assert watcher.poll() == []
+    assert watcher.seconds_until_next() == 60  # noqa: PLR2004
+    watcher.states[1].next_check = clock.now + 120
+    clock.now += 60
+    [result] = watcher.poll()
+
+    assert result.job == JOBS[0]
+    assert MockCredly.call_count == MockGithubRepo.call_count == 2  # noqa: PLR2004
+    assert mock_update.call_args.kwargs["credly"] is watcher.states[0].clients[0]
+    assert mock_update.call_args.kwargs["fingerprints"] is watcher.fingerprints
+    assert watcher.rounds == 3  # noqa: PLR2004
+    watcher.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"min_interval": 0}, {"min_interval": 600}, {"backoff": 0.5}, {"concurrency": 0}], ids=str
+)
+def test_watcher_rejects_invalid_settings(kwargs):
+    settings = {"min_interval": 60, "max_interval": 300, "backoff": 2, **kwargs}
+    with pytest.raises(ValueError):
+        Watcher(JOBS, "token", cache_dir="unused", **settings)
+
+
+@pytest.mark.usefixtures("mock_pipeline")
+def test_health_goes_stale_without_rounds(tmp_path):
+    watcher, clock = make_watcher(tmp_path, jobs=[])
+
+    assert watcher.healthy()
+    assert watcher.seconds_until_next() == 300  # noqa: PLR2004
+    clock.now += 601
+    assert not watcher.healthy()
+    watcher.poll()
+    assert watcher.healthy()
+
+
+def get(url):
+    try:
+        with urlopen(url, timeout=5) as response:  # noqa: S310
+            return response.status, response.read().decode("utf-8")
+    except HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+def test_status_endpoints(tmp_path, mock_pipeline):
+    _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    mock_update.return_value = False
+    watcher, clock = make_watcher(tmp_path, jobs=JOBS[:1])
+    watcher.poll()
+    server = serve_status(watcher, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        assert get(f"{url}/healthz") == (200, '{"status": "ok"}')
+        status, body = get(f"{url}/status")
+        assert status == 200  # noqa: PLR2004
+        [profile] = json.loads(body)["profiles"]
+        assert profile["credly_username"] == "alice"
+        assert profile["last_status"] == "unchanged"
+        assert profile["next_check_in"] == 120  # noqa: PLR2004
+        status, body = get(f"{url}/metrics")
+        assert status == 200  # noqa: PLR2004
+        assert "readme_credly_badges_" in body
+        assert get(f"{url}/missing")[0] == 404  # noqa: PLR2004
+        clock.now += 601
+        assert get(f"{url}/healthz") == (503, '{"status": "stale"}')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_metrics_are_exported_each_round_and_summarized_on_close(tmp_path, mock_pipeline):
+    _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+
+    def update_readme(**_kwargs):
+        with metrics.span("credly_fetch"):
+            return False
+
+    mock_update.side_effect = update_readme
+    summary = tmp_path / "summary.md"
+    prometheus = tmp_path / "credly.prom"
+    watcher, clock = make_watcher(tmp_path)
+    metrics.reset()
+    with (
+        patch.multiple(metrics_module, METRICS_JOB_SUMMARY=True, GITHUB_STEP_SUMMARY=str(summary)),
+        patch.multiple(metrics_module, METRICS_PROMETHEUS_FILE=str(prometheus)),
+        patch.multiple(watch, METRICS_JOB_SUMMARY=True, GITHUB_STEP_SUMMARY=str(summary)),
+    ):
+        for _ in range(3):
+            watcher.poll()
+            clock.now += 300
+            # Each round's spans are dropped once exported, the totals keep growing
+            assert metrics.spans == []
+        assert 'stage="credly_fetch"} 6\n' in prometheus.read_text()
+        assert not summary.exists()
+
+        watcher.close()
+
+    assert summary.read_text().count("### Credly badges timings") == 1
+    assert "| credly_fetch | 6 |" in summary.read_text()
+
+
+def test_main_runs_until_stopped(tmp_path, mock_pipeline):
+    _MockCredly, _MockGithubRepo, mock_update = mock_pipeline
+    stop = threading.Event()
+    mock_update.side_effect = lambda **_kwargs: stop.set() or True
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text('[{"credly_username": "alice", "github_repo": "alice/alice"}]')
+
+    with patch.multiple(watch, GITHUB_TOKEN="token"):
+        assert watch.main([str(manifest), "--port", "0", "--min-interval", "1", "--max-interval", "2"], stop=stop) == 0
+        assert watch.main([str(manifest), "--port", "-1"], stop=stop) == 0
+
+    mock_update.assert_called_once()
+
+
+def test_main_requires_token(tmp_path):
+    with patch.object(watch, "GITHUB_TOKEN", None), pytest.raises(ValueError):
+        watch.main([str(tmp_path / "jobs.json")])